@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from bench_suite import generate
+from db_helper import DBHelper, DEFAULT_PROFILE, TaskQuery
+
+# 任务结果集内存基准：比较原来的14列结果元组（连接 boards / task_property 取名称）与 TaskRecord 的每条任务内存占用
+#   python bench_memory.py --rows 1000000
+#   python bench_memory.py --db task_manager.db
+
+# 原来的查询：名称由连接取得，每行都是新的字符串对象
+TUPLE_SELECT = '''
+    SELECT t.id, t.name, b.name as board_name, t.year, t.month, t.status,
+           t.status_time, t.expected_time, t.board_id, t.task_dir, t.property_id,
+           p.name as property_name, t.link_mode, t.link_url
+    FROM tasks t
+    JOIN boards b ON t.board_id = b.id
+    JOIN task_property p ON t.property_id = p.id
+    ORDER BY t.id
+'''
+
+
+def measure(load: Callable[[], List]) -> Dict[str, float]:
+    """返回结果集常驻内存（字节/条）、读取峰值内存和耗时"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = load()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(rows)
+    del rows
+    return {"rows": count, "bytes_per_task": round(current / max(count, 1), 1),
+            "total_mb": round(current / 2 ** 20, 1), "peak_mb": round(peak / 2 ** 20, 1),
+            "seconds": round(elapsed, 2)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="任务结果集内存基准")
+    parser.add_argument("--db", help="使用已有数据库（默认生成临时数据库）")
+    parser.add_argument("--rows", type=int, default=1000000, help="生成的任务数")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = args.db or os.path.join(tmp, "bench_memory.db")
+        # 结果集远大于查询结果缓存的容量，关闭缓存避免干扰
+        db = DBHelper(db_name, DEFAULT_PROFILE._replace(result_cache_entries=0))
+        try:
+            if not args.db:
+                generate(db, args.rows)
+            result = {
+                "tuples": measure(lambda: db.conn.execute(TUPLE_SELECT).fetchall()),
+                "task_records": measure(lambda: db.find_tasks(TaskQuery(order="id"))),
+            }
+        finally:
+            db.close()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
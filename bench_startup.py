@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+# 启动基准测试：多次冷启动 main.py，统计首次绘制 / 初始数据显示的耗时，超出预算时退出码为1
+#   python bench_startup.py --runs 5 --budget-ms 1500
+#   python bench_startup.py --offscreen      # 无显示器的环境（CI）
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+DEFAULT_BUDGET_MS = 1500  # 首次绘制（first_paint）的预算
+RUN_TIMEOUT_S = 60
+
+
+def run_once(db_name: str, offscreen: bool) -> Dict[str, float]:
+    """启动一次程序，返回各阶段耗时（毫秒）"""
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, "startup.json")
+        subprocess.run([sys.executable, MAIN_SCRIPT, "--db", db_name, "--startup-report", report],
+                       env=env, check=True, timeout=RUN_TIMEOUT_S)
+        with open(report, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """各阶段的中位数/最小值/最大值"""
+    summary = {}
+    for stage in runs[0]:
+        values = [run[stage] for run in runs if stage in run]
+        summary[stage] = {"median": round(statistics.median(values), 1),
+                          "min": round(min(values), 1), "max": round(max(values), 1)}
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="任务状态管理器启动基准测试")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="首次绘制耗时中位数的上限")
+    parser.add_argument("--db", help="使用已有数据库（默认每次使用新的空数据库）")
+    parser.add_argument("--offscreen", action="store_true", help="不显示窗口（QT_QPA_PLATFORM=offscreen）")
+    args = parser.parse_args(argv)
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            db_name = args.db or os.path.join(tmp, f"startup_{i}.db")
+            runs.append(run_once(db_name, args.offscreen))
+
+    summary = summarize(runs)
+    first_paint = summary["first_paint"]["median"]
+    result = {"runs": args.runs, "budget_ms": args.budget_ms, "stages": summary,
+              "within_budget": first_paint <= args.budget_ms}
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if not result["within_budget"]:
+        print(f"首次绘制耗时 {first_paint}ms 超出预算 {args.budget_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,535 @@
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from db_helper import DBHelper, DEFAULT_PROFILE, TaskQuery, TASK_STATUSES
+from startup_timer import StartupTimer
+
+# 性能基准测试：按固定种子生成 1k / 100k / 1M 条任务的数据库，逐个计时 DBHelper 的查询/批量写入方法
+# 以及界面上的 load_time_tree / load_tasks_by_month / show_search_results（Qt offscreen），结果输出为JSON
+#   python bench_suite.py --sizes 1k,100k --output before.json
+#   python bench_suite.py --sizes 1k,100k --compare before.json --max-regression 20
+#   python bench_suite.py --sizes 1m --data-dir bench_data --only "find_tasks|statistics"
+
+SIZES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+DEFAULT_SEED = 20240601
+GENERATE_BATCH = 10000
+
+# 生成数据的取值范围
+YEARS = (2021, 2022, 2023, 2024, 2025)
+CUSTOM_PROPERTIES = 12
+STATUS_WEIGHTS = (25, 25, 50)  # 与 TASK_STATUSES 对应
+NAME_WORDS = ("接口", "文档", "测试", "部署", "重构", "报表", "数据", "迁移", "前端", "后端",
+              "性能", "缓存", "登录", "支付", "订单", "搜索", "导出", "导入", "权限", "日志")
+SEARCH_KEYWORD = "数据迁移"   # 3个字及以上走全文索引
+SHORT_KEYWORD = "测试"        # 不足3个字走LIKE
+
+# 不需要计时的方法（事务/连接管理、缓存统计）
+NOT_BENCHMARKED = {"transaction", "close", "cache_stats"}
+
+
+# ------------------------------
+# 数据生成
+# ------------------------------
+def board_count(rows: int) -> int:
+    """板块数随数据量增长：1k→10，100k→20，1M→200"""
+    return min(200, max(10, rows // 5000))
+
+
+def task_rows(rows: int, board_ids: Sequence[int], property_ids: Sequence[int], seed: int) -> Iterator[Dict]:
+    """逐条生成 add_tasks 的参数：板块/属性/年月/状态/模式随机分布，同一种子结果相同"""
+    rng = random.Random(seed)
+    # 默认属性（编程项目/应用/未知）占一半，其余分给自定义属性
+    property_weights = [len(property_ids)] * 3 + [1] * (len(property_ids) - 3)
+    for i in range(rows):
+        year, month = rng.choice(YEARS), rng.randint(1, 12)
+        day = rng.randint(1, 28)
+        status = rng.choices(TASK_STATUSES, STATUS_WEIGHTS)[0]
+        expected_time = None
+        if status == "待启用" and rng.random() < 0.4:
+            expected_time = (date(year, month, day) + timedelta(days=rng.randint(-30, 90))).isoformat()
+        link_mode = rng.randint(0, 1)
+        yield {
+            "board_id": rng.choice(board_ids),
+            "name": "".join(rng.sample(NAME_WORDS, 3)) + f"-{i}",
+            "status": status,
+            "property_id": rng.choices(property_ids, property_weights)[0],
+            "year": year, "month": month,
+            "status_time": f"{year}-{month:02d}-{day:02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+            "expected_time": expected_time,
+            "link_mode": link_mode,
+            "task_dir": None if link_mode else f"D:/projects/{i}",
+            "link_url": f"https://example.com/tasks/{i}" if link_mode else None,
+        }
+
+
+def generate(db: DBHelper, rows: int, seed: int = DEFAULT_SEED) -> None:
+    """向空数据库写入板块、自定义属性和 rows 条任务"""
+    for i in range(board_count(rows)):
+        db.add_board(f"板块{i:03d}")
+    for i in range(CUSTOM_PROPERTIES):
+        db.add_custom_property(f"属性{i:02d}")
+    board_ids = sorted(board_id for board_id, _ in db.get_all_boards())
+    property_ids = sorted(prop_id for prop_id, _, _ in db.get_all_properties())
+    batch = []
+    for task in task_rows(rows, board_ids, property_ids, seed):
+        batch.append(task)
+        if len(batch) == GENERATE_BATCH:
+            db.add_tasks(batch)
+            batch = []
+    db.add_tasks(batch)
+
+
+def prepare_database(data_dir: str, rows: int, seed: int) -> float:
+    """生成（或复用 data_dir 中已有的）数据库，返回生成耗时（秒，复用时为0）"""
+    path = dataset_path(data_dir, rows, seed)
+    if os.path.exists(path):
+        return 0.0
+    start = time.perf_counter()
+    partial = path + ".partial"  # 生成完成后才改名，中断时不会留下不完整的数据库
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(partial + suffix):
+            os.remove(partial + suffix)
+    db = DBHelper(partial)
+    try:
+        generate(db, rows, seed)
+        db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # 数据全部写回主文件后才能只改名主文件
+    finally:
+        db.close()
+    os.replace(partial, path)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(partial + suffix):
+            os.remove(partial + suffix)
+    return time.perf_counter() - start
+
+
+def dataset_path(data_dir: str, rows: int, seed: int) -> str:
+    return os.path.join(data_dir, f"bench_{rows}_{seed}.db")
+
+
+# ------------------------------
+# 计时
+# ------------------------------
+class Scenario(NamedTuple):
+    """一个计时场景；run 的参数为第几次执行（从0开始，预热也计入），可据此变换参数以避开缓存"""
+    name: str                      # 方法名，同一方法的不同参数写作 方法名:说明
+    run: Callable[[int], object]
+    rows: int = 0                  # 每次执行写入的行数，非0时按中位数耗时另计每秒行数
+
+
+def result_size(result) -> Optional[int]:
+    if isinstance(result, bool):
+        return None
+    if isinstance(result, int):
+        return result
+    if hasattr(result, "__len__"):
+        return len(result)
+    return None
+
+
+def time_scenario(scenario: Scenario, repeat: int, warmup: int) -> Dict[str, float]:
+    """执行 warmup 次预热和 repeat 次计时，返回耗时（毫秒）统计和结果条数"""
+    for i in range(warmup):
+        scenario.run(i)
+    times, result = [], None
+    for i in range(warmup, warmup + repeat):
+        start = time.perf_counter()
+        result = scenario.run(i)
+        times.append((time.perf_counter() - start) * 1000)
+    summary = {"median_ms": round(statistics.median(times), 3), "min_ms": round(min(times), 3),
+               "mean_ms": round(statistics.mean(times), 3), "max_ms": round(max(times), 3)}
+    rows = result_size(result)
+    if rows is not None:
+        summary["rows"] = rows
+    if scenario.rows and summary["median_ms"]:
+        summary["rows_per_sec"] = round(scenario.rows / summary["median_ms"] * 1000)
+    return summary
+
+
+def run_scenarios(scenarios: Sequence[Scenario], repeat: int, warmup: int,
+                  only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for scenario in scenarios:
+        if only and not re.search(only, scenario.name):
+            continue
+        results[scenario.name] = time_scenario(scenario, repeat, warmup)
+        print(f"  {scenario.name:55s} {results[scenario.name]['median_ms']:10.2f} ms", file=sys.stderr)
+    return results
+
+
+# ------------------------------
+# DBHelper 场景
+# ------------------------------
+class Fixture(NamedTuple):
+    """从数据库中选出的查询参数"""
+    board_ids: List[int]
+    busiest_board: int
+    year_months: List[tuple]      # 最大板块有任务的 (年, 月)，按时间倒序
+    custom_property: int
+    max_task_id: int
+    task_ids: List[int]           # 随机抽取的任务ID（单条读写用）
+
+
+def load_fixture(db: DBHelper, seed: int) -> Fixture:
+    board_ids = [board_id for board_id, _ in db.get_all_boards()]
+    by_board = db.task_statistics(group_by=("board",))
+    busiest = max(by_board, key=lambda row: row.total).group[0]
+    year_months = [(year, month) for year, month, _ in db.get_board_year_months(busiest)]
+    custom_property = max(prop_id for prop_id, _, _ in db.get_all_properties())
+    max_task_id = db.conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+    rng = random.Random(seed)
+    return Fixture(board_ids, busiest, year_months, custom_property, max_task_id,
+                   [rng.randint(1, max_task_id) for _ in range(1000)])
+
+
+def read_scenarios(db: DBHelper, fx: Fixture) -> List[Scenario]:
+    """只读方法；按板块/月份查询的场景每次换一个板块/月份"""
+    year, month = fx.year_months[len(fx.year_months) // 2]
+    task_id = fx.task_ids[0]
+    first_name_page = db.get_all_tasks_order_by_name_page()
+
+    def board(i: int) -> int:
+        return fx.board_ids[i % len(fx.board_ids)]
+
+    def task_by_full_scan(task_id: int):
+        # 对照：按主键查询之前 jump_to_dir 的做法——取出全部任务后逐个查找
+        return next((task for task in db.get_tasks_by_time_status() if task.id == task_id), None)
+
+    def search_without_fts(keyword: str):
+        # 对照：同一关键词走不支持FTS5时的 LIKE 回退路径
+        db.fts_enabled = False
+        try:
+            return db.search_tasks_by_name(keyword)
+        finally:
+            db.fts_enabled = True
+
+    def year_month(i: int) -> tuple:
+        return fx.year_months[i % len(fx.year_months)]
+
+    return [
+        Scenario("get_all_boards", lambda i: db.get_all_boards()),
+        Scenario("get_all_properties", lambda i: db.get_all_properties()),
+        Scenario("get_board_id_by_name", lambda i: db.get_board_id_by_name(f"板块{i % len(fx.board_ids):03d}")),
+        Scenario("get_property_id_by_name", lambda i: db.get_property_id_by_name("未知")),
+        Scenario("get_property_name_by_id", lambda i: db.get_property_name_by_id(fx.custom_property)),
+        Scenario("get_task", lambda i: db.get_task(fx.task_ids[i % len(fx.task_ids)])),
+        Scenario("get_task:full_scan", lambda i: task_by_full_scan(fx.task_ids[i % len(fx.task_ids)])),
+        Scenario("get_task_link_url", lambda i: db.get_task_link_url(fx.task_ids[i % len(fx.task_ids)])),
+        Scenario("get_task_status_history", lambda i: db.get_task_status_history(task_id)),
+        Scenario("get_board_year_months", lambda i: db.get_board_year_months(board(i))),
+        Scenario("get_tasks_by_board", lambda i: db.get_tasks_by_board(board(i))),
+        Scenario("get_tasks_by_board_month",
+                 lambda i: db.get_tasks_by_board_month(fx.busiest_board, *year_month(i))),
+        Scenario("get_tasks_by_property", lambda i: db.get_tasks_by_property(fx.custom_property)),
+        Scenario("get_tasks_by_date_and_property",
+                 lambda i: db.get_tasks_by_date_and_property(year, month, fx.custom_property)),
+        Scenario("get_tasks_by_link_mode", lambda i: db.get_tasks_by_link_mode(1)),
+        Scenario("get_tasks_by_time_status:month", lambda i: db.get_tasks_by_time_status(year, month)),
+        Scenario("get_tasks_by_time_status:month+status",
+                 lambda i: db.get_tasks_by_time_status(year, month, "已完成")),
+        Scenario("get_all_tasks_order_by_name", lambda i: db.get_all_tasks_order_by_name()),
+        Scenario("search_tasks_by_name:fts", lambda i: db.search_tasks_by_name(SEARCH_KEYWORD)),
+        Scenario("search_tasks_by_name:fts_off", lambda i: search_without_fts(SEARCH_KEYWORD)),
+        Scenario("search_tasks_by_name:like", lambda i: db.search_tasks_by_name(SHORT_KEYWORD, limit=1000)),
+        Scenario("find_tasks:date_range",
+                 lambda i: db.find_tasks(TaskQuery(year_month_from=(year, 1), year_month_to=(year, 3)))),
+        Scenario("find_tasks:board+status",
+                 lambda i: db.find_tasks(TaskQuery(board_id=board(i), statuses=("待启用", "初开启")))),
+        Scenario("find_tasks:name+property",
+                 lambda i: db.find_tasks(TaskQuery(name=SEARCH_KEYWORD, property_ids=(1, 2)))),
+        Scenario("find_tasks:expected_range",
+                 lambda i: db.find_tasks(TaskQuery(expected_from=f"{year}-01-01", expected_to=f"{year}-06-30"))),
+        Scenario("find_tasks:status_time_range",
+                 lambda i: db.find_tasks(TaskQuery(status_time_from=f"{year}-{month:02d}-01",
+                                                   status_time_to=f"{year}-{month:02d}-28"))),
+        Scenario("iter_tasks", lambda i: sum(1 for _ in db.iter_tasks(TaskQuery(year=year)))),
+        Scenario("count_tasks:covered", lambda i: db.count_tasks(TaskQuery(board_id=board(i), year=year))),
+        Scenario("count_tasks:name", lambda i: db.count_tasks(TaskQuery(name=SEARCH_KEYWORD))),
+        Scenario("count_all_tasks", lambda i: db.count_all_tasks()),
+        Scenario("count_tasks_by_property", lambda i: db.count_tasks_by_property(fx.custom_property)),
+        Scenario("count_tasks_by_link_mode", lambda i: db.count_tasks_by_link_mode(0)),
+        Scenario("count_tasks_by_time_status", lambda i: db.count_tasks_by_time_status(year, None, "初开启")),
+        Scenario("count_tasks_by_name", lambda i: db.count_tasks_by_name(SEARCH_KEYWORD)),
+        Scenario("get_all_tasks_order_by_name_page:first", lambda i: db.get_all_tasks_order_by_name_page()),
+        Scenario("get_all_tasks_order_by_name_page:next",
+                 lambda i: db.get_all_tasks_order_by_name_page(first_name_page[-1])),
+        Scenario("get_tasks_by_property_page", lambda i: db.get_tasks_by_property_page(fx.custom_property)),
+        Scenario("get_tasks_by_link_mode_page", lambda i: db.get_tasks_by_link_mode_page(1)),
+        Scenario("get_tasks_by_time_status_page", lambda i: db.get_tasks_by_time_status_page(year, month)),
+        Scenario("search_tasks_by_name_page", lambda i: db.search_tasks_by_name_page(SEARCH_KEYWORD)),
+        Scenario("task_statistics:total", lambda i: db.task_statistics()),
+        Scenario("task_statistics:board+status", lambda i: db.task_statistics(group_by=("board", "status"))),
+        Scenario("task_statistics:board+month+property+status",
+                 lambda i: db.task_statistics(group_by=("board", "month", "property", "status"))),
+        Scenario("task_statistics:name_filter",
+                 lambda i: db.task_statistics(TaskQuery(name=SEARCH_KEYWORD), ("property",))),
+        Scenario("lead_time_statistics:board", lambda i: db.lead_time_statistics(TaskQuery(board_id=board(i)))),
+        Scenario("lead_time_statistics:all", lambda i: db.lead_time_statistics(group_by=("property",))),
+        Scenario("status_duration_statistics:board_month",
+                 lambda i: db.status_duration_statistics(
+                     TaskQuery(board_id=fx.busiest_board, year=year, month=month), ("property",))),
+        Scenario("status_duration_statistics:all", lambda i: db.status_duration_statistics()),
+    ]
+
+
+def write_scenarios(db: DBHelper, fx: Fixture, seed: int) -> List[Scenario]:
+    """写入方法，在数据库副本上执行并正常提交；批量操作每次换一批任务"""
+    bulk = 10000
+    per_row = 1000  # 逐条写入的对照场景较慢，只写这么多条
+    new_tasks = list(task_rows(bulk, fx.board_ids, [1, 2, 3, fx.custom_property], seed + 1))
+    # add_task 不接受 status_time
+    single_tasks = [{key: value for key, value in task.items() if key != "status_time"}
+                    for task in new_tasks[:per_row]]
+
+    def id_slice(i: int, size: int) -> range:
+        # 各次执行互不重叠，删除场景不会删到已删除的任务
+        start = 1 + (i * size) % max(fx.max_task_id - size, 1)
+        return range(start, start + size)
+
+    def task_id(i: int) -> int:
+        return fx.task_ids[i % len(fx.task_ids)]
+
+    # 对照：批量方法之前的做法——逐条调用、每条各自提交；以及同样逐条调用但放在一个事务中
+    def add_each() -> int:
+        for task in single_tasks:
+            db.add_task(**task)
+        return len(single_tasks)
+
+    def add_each_in_transaction() -> int:
+        with db.transaction():
+            return add_each()
+
+    def update_status_each(i: int) -> int:
+        for each_id in id_slice(i, per_row):
+            db.update_task_status(each_id, TASK_STATUSES[i % 3])
+        return per_row
+
+    return [
+        Scenario("add_task", lambda i: db.add_task(fx.busiest_board, f"基准任务{i}", "待启用")),
+        Scenario(f"add_tasks:{bulk}", lambda i: db.add_tasks(new_tasks), bulk),
+        Scenario(f"add_task:{per_row}_commits", lambda i: add_each(), per_row),
+        Scenario(f"add_task:{per_row}_in_transaction", lambda i: add_each_in_transaction(), per_row),
+        Scenario("update_task_status", lambda i: db.update_task_status(task_id(i), TASK_STATUSES[i % 3])),
+        Scenario("update_task_name", lambda i: db.update_task_name(task_id(i), f"改名{i}")),
+        Scenario("update_task_dir", lambda i: db.update_task_dir(task_id(i), f"D:/bench/{i}")),
+        Scenario("update_task_link_mode", lambda i: db.update_task_link_mode(task_id(i), i % 2)),
+        Scenario("update_task_link_url", lambda i: db.update_task_link_url(task_id(i), f"https://example.com/{i}")),
+        Scenario("update_task_property", lambda i: db.update_task_property(task_id(i), 1 + i % 3)),
+        Scenario(f"update_tasks_status:{bulk}",
+                 lambda i: db.update_tasks_status(id_slice(i, bulk), TASK_STATUSES[i % 3]), bulk),
+        Scenario(f"update_task_status:{per_row}_commits", update_status_each, per_row),
+        Scenario(f"update_tasks_property:{bulk}",
+                 lambda i: db.update_tasks_property(id_slice(i, bulk), 1 + i % 3), bulk),
+        Scenario(f"update_tasks_link_mode:{bulk}",
+                 lambda i: db.update_tasks_link_mode(id_slice(i, bulk), i % 2), bulk),
+        Scenario("add_board", lambda i: db.add_board(f"基准板块{i}")),
+        Scenario("update_board_name", lambda i: db.update_board_name(fx.board_ids[-1], f"改名板块{i}")),
+        Scenario("add_custom_property", lambda i: db.add_custom_property(f"基准属性{i}")),
+        Scenario("delete_property", lambda i: db.delete_property(db.get_property_id_by_name(f"基准属性{i}"))),
+        Scenario("delete_task", lambda i: db.delete_task(fx.max_task_id - i)),
+        Scenario(f"delete_tasks:{bulk}", lambda i: db.delete_tasks(id_slice(i + 50, bulk)), bulk),
+        Scenario("delete_board", lambda i: db.delete_board(db.get_board_id_by_name(f"基准板块{i}"))),
+    ]
+
+
+def uncovered_methods(names: Sequence[str]) -> List[str]:
+    """DBHelper 中没有对应场景的公开方法（新增方法后提醒补充场景）"""
+    covered = {name.split(":")[0] for name in names}
+    public = {name for name in dir(DBHelper) if not name.startswith("_") and callable(getattr(DBHelper, name))}
+    return sorted(public - covered - NOT_BENCHMARKED)
+
+
+# ------------------------------
+# 界面场景（需要 PyQt5，使用 offscreen 平台，不显示窗口）
+# ------------------------------
+def run_gui_scenarios(db_name: str, fx: Fixture, repeat: int, warmup: int,
+                      only: Optional[str]) -> Dict[str, Dict[str, float]]:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication
+    import main
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    window = main.TaskManager(db_name, StartupTimer())
+    window.show()
+
+    def wait_for(condition: Callable[[], bool], timeout_s: float = 600) -> None:
+        deadline = time.perf_counter() + timeout_s
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("等待界面更新超时")
+            app.processEvents(QEventLoop.AllEvents | QEventLoop.WaitForMoreEvents, 50)
+
+    def wait_idle() -> None:
+        # 查询结果回调与忙碌状态在同一次事件处理中完成，之后再处理一轮绘制
+        wait_for(lambda: not window.db.is_busy())
+        app.processEvents()
+
+    wait_for(lambda: window.startup_timer.get("boards_loaded") is not None)
+    # 界面连接开着查询结果缓存：每次执行换一个板块/月份，计时的是未命中缓存的完整路径
+    search_results = DBHelper(db_name, DEFAULT_PROFILE._replace(result_cache_entries=0))
+    try:
+        results = search_results.find_tasks(TaskQuery(board_id=fx.busiest_board))
+    finally:
+        search_results.close()
+
+    def load_time_tree(i: int) -> int:
+        window.current_board_id = fx.board_ids[i % len(fx.board_ids)]
+        window.load_time_tree()
+        wait_idle()
+        return window.task_tree.topLevelItemCount()
+
+    def load_tasks_by_month(i: int) -> int:
+        window.current_board_id = fx.busiest_board
+        window.load_tasks_by_month(*fx.year_months[i % len(fx.year_months)])
+        wait_idle()
+        return window.task_model.rowCount()
+
+    def show_search_results(i: int) -> int:
+        window.show_search_results(results)
+        app.processEvents()
+        return len(results)
+
+    try:
+        return run_scenarios([
+            Scenario("gui:load_time_tree", load_time_tree),
+            Scenario("gui:load_tasks_by_month", load_tasks_by_month),
+            Scenario("gui:show_search_results", show_search_results),
+        ], repeat, warmup, only)
+    finally:
+        window.close()
+        app.processEvents()
+
+
+# ------------------------------
+# 运行与比较
+# ------------------------------
+def bench_size(rows: int, args, data_dir: str) -> Dict:
+    print(f"[{rows} 条任务]", file=sys.stderr)
+    generate_seconds = prepare_database(data_dir, rows, args.seed)
+    profile = DEFAULT_PROFILE if args.result_cache else DEFAULT_PROFILE._replace(result_cache_entries=0)
+    result = {"generate_seconds": round(generate_seconds, 2), "scenarios": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        # 在副本上运行：写入场景会修改数据，生成的数据库可供下次复用
+        work = os.path.join(tmp, "work.db")
+        shutil.copyfile(dataset_path(data_dir, rows, args.seed), work)
+        db = DBHelper(work, profile)
+        try:
+            fx = load_fixture(db, args.seed)
+            result["scenarios"].update(run_scenarios(read_scenarios(db, fx), args.repeat, args.warmup, args.only))
+            if not args.no_gui:
+                try:
+                    result["scenarios"].update(run_gui_scenarios(work, fx, args.repeat, args.warmup, args.only))
+                except ImportError as e:
+                    result["gui_skipped"] = f"无法导入界面模块：{e}"
+                    print(f"  跳过界面场景：{e}", file=sys.stderr)
+            if not args.no_write:
+                result["scenarios"].update(
+                    run_scenarios(write_scenarios(db, fx, args.seed), args.repeat, args.warmup, args.only))
+        finally:
+            db.close()
+    return result
+
+
+def compare(baseline: Dict, current: Dict, max_regression: Optional[float]) -> bool:
+    """打印与基线的中位数对比；返回是否有场景变慢超过 max_regression（百分比）"""
+    regressed = False
+    min_ms = 1.0  # 低于此耗时的场景波动大，不判定为变慢
+    print(f"{'场景':62s} {'基线ms':>10s} {'本次ms':>10s} {'变化':>8s}", file=sys.stderr)
+    for size, result in current["sizes"].items():
+        old_scenarios = baseline.get("sizes", {}).get(size, {}).get("scenarios", {})
+        for name, summary in result["scenarios"].items():
+            old = old_scenarios.get(name)
+            if old is None:
+                continue
+            before, after = old["median_ms"], summary["median_ms"]
+            change = (after - before) / before * 100 if before else 0.0
+            flag = ""
+            if max_regression is not None and change > max_regression and after >= min_ms:
+                flag = "  ← 变慢"
+                regressed = True
+            print(f"{size + ' ' + name:62s} {before:10.2f} {after:10.2f} {change:+7.1f}%{flag}", file=sys.stderr)
+    return regressed
+
+
+def scaling(report: Dict) -> Dict[str, float]:
+    """各场景在最大数据量与最小数据量下的耗时中位数之比：接近1为常数时间，接近数据量之比为线性"""
+    sizes = sorted(report["sizes"], key=int)
+    if len(sizes) < 2:
+        return {}
+    smallest, largest = (report["sizes"][size]["scenarios"] for size in (sizes[0], sizes[-1]))
+    return {name: round(largest[name]["median_ms"] / smallest[name]["median_ms"], 2)
+            for name in largest if name in smallest and smallest[name]["median_ms"]}
+
+
+def parse_sizes(text: str) -> List[int]:
+    sizes = []
+    for item in text.split(","):
+        item = item.strip().lower()
+        sizes.append(SIZES[item] if item in SIZES else int(item))
+    return sizes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="任务状态管理器性能基准测试")
+    parser.add_argument("--sizes", default="1k,100k", help="任务数，逗号分隔：1k / 100k / 1m 或具体数字")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="数据生成的随机种子")
+    parser.add_argument("--data-dir", help="生成的数据库保存在此目录并在下次复用（默认用完即删）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个场景计时的次数（取中位数）")
+    parser.add_argument("--warmup", type=int, default=1, help="每个场景计时前的预热次数")
+    parser.add_argument("--only", metavar="正则", help="只运行名称匹配的场景")
+    parser.add_argument("--result-cache", action="store_true", help="开启 DBHelper 的查询结果缓存（默认关闭）")
+    parser.add_argument("--no-gui", action="store_true", help="跳过界面场景")
+    parser.add_argument("--no-write", action="store_true", help="跳过写入场景")
+    parser.add_argument("--output", help="结果JSON文件（默认输出到标准输出）")
+    parser.add_argument("--compare", metavar="JSON", help="与之前的结果对比中位数")
+    parser.add_argument("--max-regression", type=float, metavar="百分比",
+                        help="与 --compare 一起使用：有场景变慢超过此百分比时退出码为1")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(), "seed": args.seed,
+            "repeat": args.repeat, "warmup": args.warmup, "result_cache": args.result_cache,
+        },
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        for rows in parse_sizes(args.sizes):
+            report["sizes"][str(rows)] = bench_size(rows, args, data_dir)
+    names = {name for result in report["sizes"].values() for name in result["scenarios"]}
+    if not args.only:
+        report["meta"]["uncovered_methods"] = uncovered_methods(sorted(names))
+    report["scaling"] = scaling(report)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            if compare(json.load(f), report, args.max_regression):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
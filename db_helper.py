@@ -1,14 +1,186 @@
+import functools
+import inspect
 import sqlite3
-from datetime import datetime
-from typing import List, Tuple, Optional
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Sequence, Tuple, Optional, NamedTuple
+from query_trace import SlowStatement, Tracer, format_plan
+from result_cache import CacheScope, ChangedKey, ResultCache, changed_keys
+
+
+class ConnectionProfile(NamedTuple):
+    """数据库连接参数（打开连接时以 PRAGMA 形式生效）"""
+    journal_mode: str = "WAL"         # WAL：读写互不阻塞，多个读连接可与写连接并发
+    synchronous: str = "NORMAL"       # WAL 下 NORMAL 即可保证一致性，提交无需每次 fsync
+    foreign_keys: bool = True         # 启用外键，使 ON DELETE CASCADE / SET DEFAULT 生效
+    cache_size_kb: int = 16 * 1024    # 页缓存大小（KiB）
+    mmap_size: int = 256 * 1024 * 1024  # 内存映射读取的字节数，0 表示关闭
+    busy_timeout_ms: int = 5000       # 遇到锁时的等待时间
+    cached_statements: int = 256      # 每个连接缓存的预编译语句数（组合查询按SQL文本复用）
+    result_cache_entries: int = 128   # 查询结果缓存的最大条目数，0 表示关闭
+    result_cache_rows: int = 50000    # 查询结果缓存的最大总行数
+
+
+DEFAULT_PROFILE = ConnectionProfile()
+
+# 任务状态取值（与 tasks.status 的 CHECK 约束一致）
+TASK_STATUSES = ("待启用", "初开启", "已完成")
+# 状态变化记录中的状态编码（TASK_STATUSES 的下标）
+STATUS_CODES = {status: code for code, status in enumerate(TASK_STATUSES)}
+
+
+def connect(db_name: str, profile: ConnectionProfile = DEFAULT_PROFILE) -> sqlite3.Connection:
+    """按连接参数打开数据库连接（主连接、后台线程连接共用）"""
+    conn = sqlite3.connect(db_name, timeout=profile.busy_timeout_ms / 1000,
+                           cached_statements=profile.cached_statements)
+    # PRAGMA 不支持参数绑定，以下取值均来自 ConnectionProfile
+    conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {profile.synchronous}")
+    conn.execute(f"PRAGMA foreign_keys = {'ON' if profile.foreign_keys else 'OFF'}")
+    conn.execute(f"PRAGMA cache_size = {-int(profile.cache_size_kb)}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)}")
+    return conn
+
+
+class TaskRecord:
+    """单个任务记录，所有任务查询方法都返回它（由行工厂直接构造，视为只读）
+    使用 __slots__ 不带实例字典；板块名/属性名不逐行保存，经 _names 引用查询时的板块/属性快照，
+    状态引用 TASK_STATUSES 中的常量字符串，大结果集中不重复保存相同的字符串
+    """
+    __slots__ = ("id", "name", "year", "month", "status", "status_time", "expected_time",
+                 "board_id", "task_dir", "property_id", "link_mode", "link_url", "_names")
+
+    # 对外的字段顺序（导出列、JSON 键、迭代顺序）
+    _fields = ("id", "name", "board_name", "year", "month", "status", "status_time", "expected_time",
+               "board_id", "task_dir", "property_id", "property_name", "link_mode", "link_url")
+
+    @property
+    def board_name(self) -> Optional[str]:
+        return self._names.board_names.get(self.board_id)
+
+    @property
+    def property_name(self) -> Optional[str]:
+        return self._names.property_names.get(self.property_id)
+
+    @classmethod
+    def row_factory(cls, names: "Dimensions") -> Callable[[sqlite3.Cursor, Tuple], "TaskRecord"]:
+        """sqlite3 行工厂：把 TASK_SELECT 的结果行构造为记录，names 为本次查询使用的板块/属性快照"""
+        new = object.__new__
+        statuses = {status: status for status in TASK_STATUSES}
+
+        def make(cursor: sqlite3.Cursor, row: Tuple) -> "TaskRecord":
+            record = new(cls)
+            (record.id, record.name, record.year, record.month, status, record.status_time,
+             record.expected_time, record.board_id, record.task_dir, record.property_id,
+             record.link_mode, record.link_url) = row
+            record.status = statuses.get(status, status)
+            record._names = names
+            return record
+        return make
+
+    def __iter__(self) -> Iterator:
+        return iter((self.id, self.name, self.board_name, self.year, self.month, self.status,
+                     self.status_time, self.expected_time, self.board_id, self.task_dir,
+                     self.property_id, self.property_name, self.link_mode, self.link_url))
+
+    def _asdict(self) -> Dict:
+        return dict(zip(self._fields, self))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TaskRecord):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return "TaskRecord({})".format(", ".join(f"{field}={value!r}" for field, value in self._asdict().items()))
+
+
+class TaskQuery(NamedTuple):
+    """组合查询条件：各条件之间为 AND 关系，取默认值（None/空元组）的条件不参与筛选"""
+    board_id: Optional[int] = None
+    year: Optional[int] = None
+    month: Optional[int] = None
+    year_month_from: Optional[Tuple[int, int]] = None  # (年, 月)，含当月
+    year_month_to: Optional[Tuple[int, int]] = None    # (年, 月)，含当月
+    statuses: Tuple[str, ...] = ()       # 任一状态
+    property_ids: Tuple[int, ...] = ()   # 任一属性
+    link_mode: Optional[int] = None      # 0=目录模式，1=链接模式
+    name: Optional[str] = None           # 名称子串
+    status_time_from: Optional[str] = None  # 状态时间起始日期 'YYYY-MM-DD'（含当天）
+    status_time_to: Optional[str] = None    # 状态时间结束日期 'YYYY-MM-DD'（含当天）
+    expected_from: Optional[str] = None  # 预计启用时间起始日期 'YYYY-MM-DD'（含）
+    expected_to: Optional[str] = None    # 预计启用时间结束日期 'YYYY-MM-DD'（含）
+    order: str = "status_time"           # status_time：状态时间倒序；name：名称升序；relevance：名称相关度；id：创建顺序
+
+
+class TaskStats(NamedTuple):
+    """分组统计结果的一行"""
+    group: Tuple               # 各分组维度的取值（板块/属性为ID，月份为 (年, 月)）
+    labels: Tuple[str, ...]    # 各分组维度的显示文本
+    total: int
+    completed: int             # 已完成
+    overdue: int               # 未完成且预计启用时间早于今天
+
+    @property
+    def completion_rate(self) -> float:
+        return self.completed / self.total if self.total else 0.0
+
+
+class LeadTimeStats(NamedTuple):
+    """完成周期统计的一行：从新建到完成的时长（秒）"""
+    group: Tuple
+    labels: Tuple[str, ...]
+    completed: int        # 完成次数（重新打开后再次完成的任务计多次）
+    avg_seconds: float
+    max_seconds: int
+
+
+class StatusDurationStats(NamedTuple):
+    """状态停留时长统计的一行（秒）：每次进入该状态到离开（或至今）的时长"""
+    group: Tuple
+    labels: Tuple[str, ...]
+    status: str
+    intervals: int        # 进入该状态的次数
+    ongoing: int          # 其中至今仍处于该状态的次数
+    avg_seconds: float
+    total_seconds: int
+
+
+class Dimensions(NamedTuple):
+    """板块/属性表的内存快照（version 每次重新加载时递增）"""
+    version: int
+    boards: List[Tuple[int, str]]                 # (id, name)，按创建时间倒序
+    board_names: Dict[int, str]                   # id -> 名称
+    board_ids: Dict[str, int]                     # 名称 -> id
+    properties: List[Tuple[int, str, int]]        # (id, name, is_default)，默认属性在前、按名称升序
+    property_names: Dict[int, str]                # id -> 名称
+    property_ids: Dict[str, int]                  # 名称 -> id
 
 
 class DBHelper:
-    def __init__(self, db_name: str = "task_manager.db"):
-        self.conn = sqlite3.connect(db_name)
+    def __init__(self, db_name: str = "task_manager.db", profile: ConnectionProfile = DEFAULT_PROFILE,
+                 tracer: Optional[Tracer] = None):
+        self.db_name = db_name
+        self.profile = profile
+        self.conn = connect(db_name, profile)
         self.cursor = self.conn.cursor()
+        self._transaction_depth = 0  # transaction() 嵌套层数，>0 时修改方法不单独提交
+        self._dimensions: Optional[Dimensions] = None  # 板块/属性缓存，None 表示需要重新加载
+        self._dimensions_version = 0
+        self._data_version: Optional[int] = None  # 上次检查时的 PRAGMA data_version
+        self._results = ResultCache(profile.result_cache_entries, profile.result_cache_rows)
         self._create_tables()
+        self._migrate_schema()  # 按版本号升级旧数据库结构
+        self.fts_enabled = self._init_fts()  # 任务名称全文索引（不支持FTS5时回退LIKE）
         self._init_default_properties()  # 初始化默认属性
+        self.tracer = tracer
+        if tracer is not None:
+            self._install_tracer()  # 建表和迁移不计入
 
     def _create_tables(self) -> None:
         # 1. 新增：任务属性表（存储系统预设属性）
@@ -52,6 +224,221 @@ class DBHelper:
         ''')
         self.conn.commit()
 
+    # ------------------------------
+    # 任务计数表：按 板块×年月×属性×状态×模式 汇总的任务数，由触发器随 tasks 的增删改同步
+    # 统计和计数查询的条件只涉及这几个维度时直接汇总计数表，不扫描 tasks
+    # ------------------------------
+    TASK_COUNTS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS task_counts (
+            board_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            property_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            link_mode INTEGER NOT NULL,
+            task_count INTEGER NOT NULL,  -- 可能为0（任务已删除或改为其他取值）
+            PRIMARY KEY (board_id, year, month, property_id, status, link_mode)
+        ) WITHOUT ROWID
+    '''
+    COUNT_TRIGGERS = {
+        "task_counts_ai": '''
+            CREATE TRIGGER IF NOT EXISTS task_counts_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO task_counts (board_id, year, month, property_id, status, link_mode, task_count)
+                VALUES (new.board_id, new.year, new.month, new.property_id, new.status, IFNULL(new.link_mode, 0), 1)
+                ON CONFLICT (board_id, year, month, property_id, status, link_mode)
+                DO UPDATE SET task_count = task_count + 1;
+            END
+        ''',
+        "task_counts_ad": '''
+            CREATE TRIGGER IF NOT EXISTS task_counts_ad AFTER DELETE ON tasks BEGIN
+                UPDATE task_counts SET task_count = task_count - 1
+                WHERE board_id = old.board_id AND year = old.year AND month = old.month
+                  AND property_id = old.property_id AND status = old.status
+                  AND link_mode = IFNULL(old.link_mode, 0);
+            END
+        ''',
+        # 外键的 ON DELETE CASCADE / SET DEFAULT 同样会触发以上触发器
+        "task_counts_au": '''
+            CREATE TRIGGER IF NOT EXISTS task_counts_au
+            AFTER UPDATE OF board_id, year, month, property_id, status, link_mode ON tasks BEGIN
+                UPDATE task_counts SET task_count = task_count - 1
+                WHERE board_id = old.board_id AND year = old.year AND month = old.month
+                  AND property_id = old.property_id AND status = old.status
+                  AND link_mode = IFNULL(old.link_mode, 0);
+                INSERT INTO task_counts (board_id, year, month, property_id, status, link_mode, task_count)
+                VALUES (new.board_id, new.year, new.month, new.property_id, new.status, IFNULL(new.link_mode, 0), 1)
+                ON CONFLICT (board_id, year, month, property_id, status, link_mode)
+                DO UPDATE SET task_count = task_count + 1;
+            END
+        ''',
+    }
+    # 把 id 大于 {after_id} 的任务汇总计入计数表（建表时补齐已有数据、批量新建时一次性写入）
+    TASK_COUNTS_FROM_TASKS = '''
+        INSERT INTO task_counts (board_id, year, month, property_id, status, link_mode, task_count)
+        SELECT board_id, year, month, property_id, status, IFNULL(link_mode, 0), COUNT(*)
+        FROM tasks WHERE id > {after_id}
+        GROUP BY board_id, year, month, property_id, status, IFNULL(link_mode, 0)
+        ON CONFLICT (board_id, year, month, property_id, status, link_mode)
+        DO UPDATE SET task_count = task_count + excluded.task_count
+    '''
+
+    # ------------------------------
+    # 状态变化记录：只追加，任务新建和每次状态改变各记一条，与 tasks 的修改由触发器在同一事务中写入
+    # 状态为 STATUS_CODES 编码，时间为 status_time 的 Unix 时间戳（秒）；同一任务按 (event_time, rowid) 排序即发生顺序
+    # ------------------------------
+    STATUS_EVENTS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS task_status_events (
+            task_id INTEGER NOT NULL,
+            status INTEGER NOT NULL,
+            event_time INTEGER NOT NULL
+        )
+    '''
+    _STATUS_CODE = "CASE {0}" + "".join(f" WHEN '{status}' THEN {code}" for status, code in STATUS_CODES.items()) + " END"
+    # status_time 无法解析时为 NULL，违反 event_time 的 NOT NULL 约束：新建/修改任务时即报错，不会记下错误的时间
+    _EPOCH = "CAST(strftime('%s', {0}) AS INTEGER)"
+    # 仅用于迁移时补记已有任务：旧数据可能带有无法解析的状态时间（如早先导入的不规范时间），这些任务取迁移时的时间
+    _LEGACY_EPOCH = f"IFNULL({_EPOCH}, CAST(strftime('%s', 'now') AS INTEGER))"
+    STATUS_EVENT_TRIGGERS = {
+        "task_status_events_ai": f'''
+            CREATE TRIGGER IF NOT EXISTS task_status_events_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO task_status_events (task_id, status, event_time)
+                VALUES (new.id, {_STATUS_CODE.format("new.status")}, {_EPOCH.format("new.status_time")});
+            END
+        ''',
+        # 只记录状态真正改变的修改
+        "task_status_events_au": f'''
+            CREATE TRIGGER IF NOT EXISTS task_status_events_au
+            AFTER UPDATE OF status ON tasks WHEN new.status IS NOT old.status BEGIN
+                INSERT INTO task_status_events (task_id, status, event_time)
+                VALUES (new.id, {_STATUS_CODE.format("new.status")}, {_EPOCH.format("new.status_time")});
+            END
+        ''',
+        # 任务删除时一并删除其记录（含板块删除级联删除的任务）
+        "task_status_events_ad": '''
+            CREATE TRIGGER IF NOT EXISTS task_status_events_ad AFTER DELETE ON tasks BEGIN
+                DELETE FROM task_status_events WHERE task_id = old.id;
+            END
+        ''',
+    }
+    # 为 id 大于 {after_id} 的任务各记一条当前状态（建表时补齐已有任务、批量新建时一次性写入），时间取 {epoch}
+    STATUS_EVENTS_FROM_TASKS = f'''
+        INSERT INTO task_status_events (task_id, status, event_time)
+        SELECT id, {_STATUS_CODE.format("status")}, {{epoch}}
+        FROM tasks WHERE id > {{after_id}} ORDER BY id
+    '''
+
+    # ------------------------------
+    # 数据库结构迁移（以 PRAGMA user_version 记录版本）
+    # ------------------------------
+    SCHEMA_MIGRATIONS = [
+        # 版本1：tasks 表复合索引，与各查询方法的 WHERE/ORDER BY 一一对应
+        [
+            # get_tasks_by_board：board_id 过滤 + year/month/status_time 倒序
+            "CREATE INDEX IF NOT EXISTS idx_tasks_board_ym_time ON tasks (board_id, year, month, status_time)",
+            # get_tasks_by_time_status：年/月/状态过滤 + status_time 排序
+            "CREATE INDEX IF NOT EXISTS idx_tasks_ym_status_time ON tasks (year, month, status, status_time)",
+            # get_tasks_by_time_status（不限状态）/ get_tasks_by_date_and_property
+            "CREATE INDEX IF NOT EXISTS idx_tasks_ym_time ON tasks (year, month, status_time)",
+            # get_tasks_by_time_status（无过滤条件）
+            "CREATE INDEX IF NOT EXISTS idx_tasks_status_time ON tasks (status_time)",
+            # get_tasks_by_property / delete_property 统计
+            "CREATE INDEX IF NOT EXISTS idx_tasks_property_time ON tasks (property_id, status_time)",
+            # get_tasks_by_link_mode
+            "CREATE INDEX IF NOT EXISTS idx_tasks_link_mode_time ON tasks (link_mode, status_time)",
+            # get_all_tasks_order_by_name / search_tasks_by_name
+            "CREATE INDEX IF NOT EXISTS idx_tasks_name ON tasks (name)",
+        ],
+        # 版本2：预计启用时间的区间查询（status_time 区间复用 idx_tasks_status_time）
+        [
+            "CREATE INDEX IF NOT EXISTS idx_tasks_expected_time ON tasks (expected_time)",
+        ],
+        # 版本3：任务计数表及同步触发器，补齐已有任务的计数；
+        # 未完成任务按预计启用时间的部分索引（含统计维度列），逾期统计只读索引
+        [
+            TASK_COUNTS_TABLE, *COUNT_TRIGGERS.values(), TASK_COUNTS_FROM_TASKS.format(after_id=0),
+            "CREATE INDEX IF NOT EXISTS idx_tasks_open_expected ON tasks "
+            "(expected_time, board_id, year, month, property_id, status, link_mode) WHERE status != '已完成'",
+        ],
+        # 版本4：状态变化记录及同步触发器，已有任务以当前状态和状态时间各记一条
+        [
+            STATUS_EVENTS_TABLE, *STATUS_EVENT_TRIGGERS.values(), STATUS_EVENTS_FROM_TASKS.format(
+                after_id=0, epoch=_LEGACY_EPOCH.format("status_time")),
+            # 单个任务的记录：第一条/下一条记录的时间只读索引
+            "CREATE INDEX IF NOT EXISTS idx_status_events_task ON task_status_events (task_id, event_time, status)",
+            # 某段时间内进入某状态的记录
+            "CREATE INDEX IF NOT EXISTS idx_status_events_status_time ON task_status_events (status, event_time, task_id)",
+        ],
+    ]
+
+    def _migrate_schema(self) -> None:
+        """依次执行尚未应用的迁移步骤，每一步连同版本号在单独事务中完成，失败时该步整体回滚
+        sqlite3 只在 INSERT/UPDATE/DELETE 前自动开启事务，建表/建索引/建触发器会各自立即提交，
+        因此每一步显式 BEGIN
+        """
+        self.cursor.execute("PRAGMA user_version")
+        version = self.cursor.fetchone()[0]
+        for target_version, statements in enumerate(self.SCHEMA_MIGRATIONS[version:], start=version + 1):
+            self.cursor.execute("BEGIN")
+            try:
+                for statement in statements:
+                    self.cursor.execute(statement)
+                # PRAGMA 不支持参数绑定，版本号为内部整数
+                self.cursor.execute(f"PRAGMA user_version = {target_version}")
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+
+    # ------------------------------
+    # 任务名称全文索引（FTS5 + trigram分词，支持中文子串检索）
+    # ------------------------------
+    FTS_TRIGGERS = {
+        "tasks_fts_ai": '''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        ''',
+        "tasks_fts_ad": '''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END
+        ''',
+        "tasks_fts_au": '''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF name ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO tasks_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        ''',
+    }
+    FTS_MIN_QUERY_LEN = 3  # trigram分词最短可检索长度，更短的关键词走LIKE
+
+    def _init_fts(self) -> bool:
+        """创建全文索引及同步触发器，返回是否可用"""
+        self.cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'tasks_fts' OR name IN ({})".format(
+                ", ".join("?" * len(self.FTS_TRIGGERS))),
+            tuple(self.FTS_TRIGGERS))
+        existing = {row[0] for row in self.cursor.fetchall()}
+        try:
+            self.cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+                USING fts5(name, content='tasks', content_rowid='id', tokenize='trigram')
+            ''')
+            for trigger_sql in self.FTS_TRIGGERS.values():
+                self.cursor.execute(trigger_sql)
+            # 索引或触发器缺失过（新建 / 曾被不支持FTS5的环境打开过）时重建索引
+            if len(existing) < len(self.FTS_TRIGGERS) + 1:
+                self.cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+            self.conn.commit()
+            return True
+        except sqlite3.OperationalError:
+            # 当前SQLite不支持FTS5或trigram：移除触发器，避免写入tasks时报错
+            self.conn.rollback()
+            for trigger_name in self.FTS_TRIGGERS:
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            self.conn.commit()
+            return False
+
     def _init_default_properties(self) -> None:
         """初始化默认属性：编程项目（1）、应用（2）、未知（3）"""
         self.cursor.execute("SELECT COUNT(*) FROM task_property")
@@ -66,22 +453,164 @@ class DBHelper:
             ''', default_props)
             self.conn.commit()
 
+    # ------------------------------
+    # 事务
+    # ------------------------------
+    @contextmanager
+    def transaction(self) -> Iterator["DBHelper"]:
+        """事务上下文：块内的所有修改一次提交，出现异常时整体回滚
+        嵌套使用时内层并入最外层事务，由最外层统一提交/回滚
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+                # 缓存可能已读入未提交的修改
+                self._invalidate_dimensions()
+                self._results.clear()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.commit()
+
+    def _commit(self) -> None:
+        """修改方法的提交：处于 transaction() 中时交给外层事务提交"""
+        if self._transaction_depth == 0:
+            self.conn.commit()
+
+    ID_CHUNK_SIZE = 500  # 单条语句 IN (...) 的最大参数个数（低于SQLite变量数上限）
+
+    def _execute_for_ids(self, sql: str, params: Tuple, task_ids: Iterable[int]) -> int:
+        """以 WHERE id IN (...) 的集合语句执行批量修改，在同一事务中按块执行
+        sql 中以 {ids} 占位 IN 列表，返回受影响总条数
+        """
+        task_ids = list(task_ids)
+        affected = 0
+        with self.transaction():
+            for start in range(0, len(task_ids), self.ID_CHUNK_SIZE):
+                chunk = task_ids[start:start + self.ID_CHUNK_SIZE]
+                self.cursor.execute(sql.format(ids=", ".join("?" * len(chunk))), params + tuple(chunk))
+                affected += self.cursor.rowcount
+        return affected
+
+    # ------------------------------
+    # 板块/属性缓存：两张表很小且很少修改，整表缓存在内存中，名称查找与任务查询都不再访问这两张表
+    # 本连接的修改方法直接作废缓存；其他连接（后台检索线程、命令行）提交的修改通过 PRAGMA data_version 发现
+    # ------------------------------
+    def _invalidate_dimensions(self) -> None:
+        self._dimensions = None
+
+    def _check_other_connections(self) -> None:
+        """其他连接提交过修改时作废全部缓存（板块/属性快照、查询结果）"""
+        self.cursor.execute("PRAGMA data_version")
+        data_version = self.cursor.fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._invalidate_dimensions()
+            self._results.clear()
+
+    def _load_dimensions(self) -> Dimensions:
+        self.cursor.execute("SELECT id, name FROM boards ORDER BY create_time DESC")
+        boards = self.cursor.fetchall()
+        self.cursor.execute("SELECT id, name, is_default FROM task_property ORDER BY is_default DESC, name ASC")
+        properties = self.cursor.fetchall()
+        self._dimensions_version += 1
+        self._dimensions = Dimensions(
+            self._dimensions_version,
+            boards, dict(boards), {name: board_id for board_id, name in boards},
+            properties, {prop_id: name for prop_id, name, _ in properties},
+            {name: prop_id for prop_id, name, _ in properties})
+        return self._dimensions
+
+    def _get_dimensions(self, check_other_connections: bool = True) -> Dimensions:
+        """返回板块/属性快照
+        check_other_connections：先检查其他连接是否提交过修改（一次 PRAGMA）；
+        单个名称的查找传 False，未命中时再重新加载
+        """
+        if check_other_connections:
+            self._check_other_connections()
+        return self._dimensions or self._load_dimensions()
+
+    def _lookup_dimension(self, field: str, key):
+        """在缓存的某个映射中查找，未命中时重新加载一次（可能是其他连接新建的）"""
+        value = getattr(self._get_dimensions(False), field).get(key)
+        if value is None:
+            value = getattr(self._get_dimensions(), field).get(key)
+        return value
+
+    def _task_cursor(self) -> sqlite3.Cursor:
+        """结果行直接构造为 TaskRecord 的游标，记录引用当前的板块/属性快照"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = TaskRecord.row_factory(self._get_dimensions())
+        return cursor
+
+    def _fetch_tasks(self, sql: str, params) -> List[TaskRecord]:
+        cursor = self._task_cursor()
+        try:
+            return cursor.execute(sql, params).fetchall()
+        finally:
+            cursor.close()
+
+    # ------------------------------
+    # 查询结果缓存：按规范化后的查询条件缓存结果，LRU淘汰
+    # 修改方法按涉及的板块/年月/属性作废可能受影响的结果，其他连接提交修改时整体清空
+    # ------------------------------
+    def _cached(self, key: Hashable, scope: CacheScope, compute: Callable):
+        self._check_other_connections()
+        value = self._results.get(key)
+        if value is None:
+            value = compute()
+            self._results.put(key, value, len(value) if isinstance(value, list) else 1, scope)
+        # 返回副本：调用方修改列表不影响缓存
+        return list(value) if isinstance(value, list) else value
+
+    def _task_keys(self, task_ids: Iterable[int]) -> List[ChangedKey]:
+        """修改前取出任务所在的板块/年月/属性，没有缓存结果时不查询"""
+        if not self._results:
+            return []
+        task_ids = list(task_ids)
+        keys = []
+        for start in range(0, len(task_ids), self.ID_CHUNK_SIZE):
+            chunk = task_ids[start:start + self.ID_CHUNK_SIZE]
+            self.cursor.execute(
+                "SELECT DISTINCT board_id, year, month, property_id FROM tasks WHERE id IN ({})".format(
+                    ", ".join("?" * len(chunk))), chunk)
+            keys.extend(changed_keys(self.cursor.fetchall()))
+        return keys
+
+    def _invalidate_results(self, keys: Iterable[ChangedKey]) -> None:
+        self._results.invalidate(keys)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """查询结果缓存的命中/未命中/淘汰/作废次数及当前占用，供调整缓存容量参考"""
+        return self._results.stats()
+
     # ------------------------------
     # 新增：任务模式相关方法
     # ------------------------------
-    def update_task_link_mode(self, task_id: int, link_mode: int) -> None:
-        """更新任务模式"""
+    def update_task_link_mode(self, task_id: int, link_mode: int) -> Optional[TaskRecord]:
+        """更新任务模式，返回更新后的任务记录"""
+        keys = self._task_keys([task_id])
         self.cursor.execute('''
             UPDATE tasks SET link_mode = ? WHERE id = ?
         ''', (link_mode, task_id))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_results(keys)
+        return self.get_task(task_id)
 
-    def update_task_link_url(self, task_id: int, link_url: str) -> None:
-        """更新任务链接"""
+    def update_task_link_url(self, task_id: int, link_url: str) -> Optional[TaskRecord]:
+        """更新任务链接，返回更新后的任务记录"""
+        keys = self._task_keys([task_id])
         self.cursor.execute('''
             UPDATE tasks SET link_url = ? WHERE id = ?
         ''', (link_url, task_id))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_results(keys)
+        return self.get_task(task_id)
 
     def get_task_link_url(self, task_id: int) -> Optional[str]:
         """获取任务链接"""
@@ -89,19 +618,14 @@ class DBHelper:
         result = self.cursor.fetchone()
         return result[0] if result else None
 
-    def get_tasks_by_link_mode(self, link_mode: int) -> List[Tuple]:
+    def get_task(self, task_id: int) -> Optional[TaskRecord]:
+        """按主键查询单个任务"""
+        rows = self._fetch_tasks(self.TASK_SELECT + " WHERE t.id = ?", (task_id,))
+        return rows[0] if rows else None
+
+    def get_tasks_by_link_mode(self, link_mode: int) -> List[TaskRecord]:
         """按模式查询任务"""
-        self.cursor.execute('''
-            SELECT t.id, t.name, b.name as board_name, t.year, t.month, t.status, 
-                   t.status_time, t.expected_time, t.board_id, t.task_dir, t.property_id,
-                   p.name as property_name, t.link_mode, t.link_url
-            FROM tasks t
-            JOIN boards b ON t.board_id = b.id
-            JOIN task_property p ON t.property_id = p.id
-            WHERE t.link_mode = ?
-            ORDER BY t.status_time DESC
-        ''', (link_mode,))
-        return self.cursor.fetchall()
+        return self.find_tasks(TaskQuery(link_mode=link_mode))
 
     # ------------------------------
     # 新增：任务属性相关方法
@@ -112,7 +636,8 @@ class DBHelper:
             self.cursor.execute('''
                 INSERT INTO task_property (name, is_default) VALUES (?, 0)
             ''', (prop_name.strip(),))
-            self.conn.commit()
+            self._commit()
+            self._invalidate_dimensions()
             return True
         except sqlite3.IntegrityError:
             return False  # 属性名已存在
@@ -123,9 +648,9 @@ class DBHelper:
         """
         # 1. 检查是否为默认属性（不可删除）
         self.cursor.execute("SELECT is_default FROM task_property WHERE id = ?", (prop_id,))
-        is_default = self.cursor.fetchone()[0]
-        if is_default == 1:
-            return (0, False)  # 默认属性，删除失败
+        result = self.cursor.fetchone()
+        if result is None or result[0] == 1:
+            return (0, False)  # 属性不存在或为默认属性，删除失败
 
         # 2. 统计关联该属性的任务数量
         self.cursor.execute("SELECT COUNT(*) FROM tasks WHERE property_id = ?", (prop_id,))
@@ -133,19 +658,22 @@ class DBHelper:
 
         # 3. 删除属性（触发外键ON DELETE SET DEFAULT，任务property_id改为3=未知）
         self.cursor.execute("DELETE FROM task_property WHERE id = ?", (prop_id,))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_dimensions()
+        self._invalidate_results([ChangedKey(property_id=prop_id), ChangedKey(property_id=3)])
         return (task_count, True)
 
     def get_all_properties(self) -> List[Tuple[int, str, int]]:
         """获取所有预设属性：(id, name, is_default)"""
-        self.cursor.execute("SELECT id, name, is_default FROM task_property ORDER BY is_default DESC, name ASC")
-        return self.cursor.fetchall()
+        return list(self._get_dimensions().properties)
+
+    def get_property_id_by_name(self, prop_name: str) -> Optional[int]:
+        """通过属性名获取属性ID（不存在时返回None）"""
+        return self._lookup_dimension("property_ids", prop_name)
 
     def get_property_name_by_id(self, prop_id: int) -> str:
         """通过属性ID获取属性名"""
-        self.cursor.execute("SELECT name FROM task_property WHERE id = ?", (prop_id,))
-        result = self.cursor.fetchone()
-        return result[0] if result else "未知"
+        return self._lookup_dimension("property_names", prop_id) or "未知"
 
     # ------------------------------
     # 任务操作（新增property_id参数和模式参数）
@@ -160,7 +688,8 @@ class DBHelper:
                  link_mode: int = 0,    # 新增：任务模式（默认0=目录模式）
                  link_url: Optional[str] = None,  # 新增：链接地址
                  year: Optional[int] = None,
-                 month: Optional[int] = None) -> None:
+                 month: Optional[int] = None) -> int:
+        """新建任务，返回新任务ID"""
         now = datetime.now()
         year = year or now.year
         month = month or now.month
@@ -169,45 +698,79 @@ class DBHelper:
             (board_id, year, month, name, status, status_time, expected_time, task_dir, property_id, link_mode, link_url)
             VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?)
         ''', (board_id, year, month, name, status, expected_time, task_dir, property_id, link_mode, link_url))
-        self.conn.commit()
+        task_id = self.cursor.lastrowid
+        self._commit()
+        self._invalidate_results([ChangedKey(board_id, (year, month), property_id)])
+        return task_id
+
+    BULK_TRIGGER_THRESHOLD = 1000  # 批量新建达到此条数时，全文索引、任务计数和状态记录改为插入后一次性写入
 
-    def update_task_property(self, task_id: int, new_prop_id: int) -> None:
-        """修改任务属性"""
+    def _insert_triggers(self) -> List[Tuple[str, str, str]]:
+        """新建任务时逐行同步的触发器：(触发器名, 建触发器语句, 按ID区间一次性写入的语句，参数为起始ID)"""
+        triggers = [
+            ("task_counts_ai", self.COUNT_TRIGGERS["task_counts_ai"], self.TASK_COUNTS_FROM_TASKS.format(after_id="?")),
+            ("task_status_events_ai", self.STATUS_EVENT_TRIGGERS["task_status_events_ai"],
+             self.STATUS_EVENTS_FROM_TASKS.format(after_id="?", epoch=self._EPOCH.format("status_time"))),
+        ]
+        if self.fts_enabled:
+            triggers.append(("tasks_fts_ai", self.FTS_TRIGGERS["tasks_fts_ai"],
+                             "INSERT INTO tasks_fts (rowid, name) SELECT id, name FROM tasks WHERE id > ?"))
+        return triggers
+
+    def add_tasks(self, tasks: Iterable[Dict]) -> int:
+        """批量新建任务（单事务 executemany），返回插入条数
+        每个元素为 add_task 的关键字参数字典，必须包含 board_id、name、status
+        可选 status_time（导入历史数据时保留原状态时间，缺省为当前时间）
+        """
+        now = datetime.now()
+        rows = [
+            (task["board_id"], task.get("year") or now.year, task.get("month") or now.month,
+             task["name"], task["status"], task.get("status_time"), task.get("expected_time"),
+             task.get("task_dir"), task.get("property_id", 3), task.get("link_mode", 0), task.get("link_url"))
+            for task in tasks
+        ]
+        with self.transaction():
+            bulk_triggers = self._insert_triggers() if len(rows) >= self.BULK_TRIGGER_THRESHOLD else []
+            if bulk_triggers:
+                # 暂停逐行同步的触发器，插入后按ID区间一次性写入
+                # 显式开启事务：DDL 不会自动开启事务，需与插入一起提交/回滚
+                if not self.conn.in_transaction:
+                    self.cursor.execute("BEGIN")
+                for trigger_name, _, _ in bulk_triggers:
+                    self.cursor.execute(f"DROP TRIGGER {trigger_name}")
+                self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM tasks")
+                last_id = self.cursor.fetchone()[0]
+            self.cursor.executemany('''
+                INSERT INTO tasks 
+                (board_id, year, month, name, status, status_time, expected_time, task_dir, property_id, link_mode, link_url)
+                VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?)
+            ''', rows)
+            for _, trigger_sql, backfill_sql in bulk_triggers:
+                self.cursor.execute(backfill_sql, (last_id,))
+                self.cursor.execute(trigger_sql)
+        self._invalidate_results({ChangedKey(row[0], (row[1], row[2]), row[8]) for row in rows})
+        return len(rows)
+
+    def update_task_property(self, task_id: int, new_prop_id: int) -> Optional[TaskRecord]:
+        """修改任务属性，返回更新后的任务记录"""
+        keys = self._task_keys([task_id])
         self.cursor.execute('''
             UPDATE tasks SET property_id = ? WHERE id = ?
         ''', (new_prop_id, task_id))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_results(keys + [key._replace(property_id=new_prop_id) for key in keys])
+        return self.get_task(task_id)
 
     # ------------------------------
     # 新增：属性查询相关方法
     # ------------------------------
-    def get_tasks_by_property(self, prop_id: int) -> List[Tuple]:
+    def get_tasks_by_property(self, prop_id: int) -> List[TaskRecord]:
         """查询所有具有某一属性的任务"""
-        self.cursor.execute('''
-            SELECT t.id, t.name, b.name as board_name, t.year, t.month, t.status, 
-                   t.status_time, t.expected_time, t.board_id, t.task_dir, t.property_id,
-                   p.name as property_name, t.link_mode, t.link_url
-            FROM tasks t
-            JOIN boards b ON t.board_id = b.id
-            JOIN task_property p ON t.property_id = p.id
-            WHERE t.property_id = ?
-            ORDER BY t.status_time DESC
-        ''', (prop_id,))
-        return self.cursor.fetchall()
-
-    def get_tasks_by_date_and_property(self, year: int, month: int, prop_id: int) -> List[Tuple]:
+        return self.find_tasks(TaskQuery(property_ids=(prop_id,)))
+
+    def get_tasks_by_date_and_property(self, year: int, month: int, prop_id: int) -> List[TaskRecord]:
         """查询指定日期（年/月）+ 属性的任务"""
-        self.cursor.execute('''
-            SELECT t.id, t.name, b.name as board_name, t.year, t.month, t.status, 
-                   t.status_time, t.expected_time, t.board_id, t.task_dir, t.property_id,
-                   p.name as property_name, t.link_mode, t.link_url
-            FROM tasks t
-            JOIN boards b ON t.board_id = b.id
-            JOIN task_property p ON t.property_id = p.id
-            WHERE t.year = ? AND t.month = ? AND t.property_id = ?
-            ORDER BY t.status_time DESC
-        ''', (year, month, prop_id))
-        return self.cursor.fetchall()
+        return self.find_tasks(TaskQuery(year=year, month=month, property_ids=(prop_id,)))
 
     # ------------------------------
     # 原有方法（不变，仅适配新字段）
@@ -215,18 +778,24 @@ class DBHelper:
     def add_board(self, name: str) -> bool:
         try:
             self.cursor.execute("INSERT INTO boards (name) VALUES (?)", (name,))
-            self.conn.commit()
+            self._commit()
+            self._invalidate_dimensions()
             return True
         except sqlite3.IntegrityError:
             return False
 
+    def get_board_id_by_name(self, name: str) -> Optional[int]:
+        """通过板块名获取板块ID（不存在时返回None）"""
+        return self._lookup_dimension("board_ids", name)
+
     def get_all_boards(self) -> List[Tuple[int, str]]:
-        self.cursor.execute("SELECT id, name FROM boards ORDER BY create_time DESC")
-        return self.cursor.fetchall()
+        return list(self._get_dimensions().boards)
 
     def delete_board(self, board_id: int) -> None:
         self.cursor.execute("DELETE FROM boards WHERE id = ?", (board_id,))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_dimensions()
+        self._invalidate_results([ChangedKey(board_id=board_id)])
 
     def update_board_name(self, board_id: int, new_name: str) -> bool:
         try:
@@ -234,98 +803,655 @@ class DBHelper:
             if self.cursor.fetchone():
                 return False
             self.cursor.execute("UPDATE boards SET name = ? WHERE id = ?", (new_name, board_id))
-            self.conn.commit()
+            self._commit()
+            self._invalidate_dimensions()
+            self._invalidate_results([ChangedKey(board_id=board_id)])  # 结果中含板块名
             return True
         except sqlite3.Error:
             return False
 
-    def update_task_name(self, task_id: int, new_name: str) -> None:
+    def update_task_name(self, task_id: int, new_name: str) -> Optional[TaskRecord]:
+        """重命名任务，返回更新后的任务记录"""
+        keys = self._task_keys([task_id])
         self.cursor.execute("UPDATE tasks SET name = ? WHERE id = ?", (new_name, task_id))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_results(keys)
+        return self.get_task(task_id)
 
-    def update_task_dir(self, task_id: int, new_dir: str) -> None:
+    def update_task_dir(self, task_id: int, new_dir: str) -> Optional[TaskRecord]:
+        """更新任务目录，返回更新后的任务记录"""
+        keys = self._task_keys([task_id])
         self.cursor.execute('''
             UPDATE tasks 
             SET task_dir = ? 
             WHERE id = ?
         ''', (new_dir, task_id))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_results(keys)
+        return self.get_task(task_id)
 
-    def get_tasks_by_board(self, board_id: int) -> List[Tuple]:
-        self.cursor.execute('''
-            SELECT t.id, t.year, t.month, t.name, t.status, t.status_time, t.expected_time, 
-                   t.task_dir, t.property_id, p.name as property_name, t.link_mode, t.link_url
-            FROM tasks t
-            JOIN task_property p ON t.property_id = p.id
-            WHERE t.board_id = ? 
-            ORDER BY t.year DESC, month DESC, status_time DESC
-        ''', (board_id,))
-        return self.cursor.fetchall()
+    def get_tasks_by_board(self, board_id: int) -> List[TaskRecord]:
+        return self._cached(("board", board_id), CacheScope(board_id), lambda: self._fetch_tasks(
+            self.TASK_SELECT + " WHERE t.board_id = ? ORDER BY t.year DESC, t.month DESC, t.status_time DESC",
+            (board_id,)))
+
+    def get_tasks_by_board_month(self, board_id: int, year: int, month: int) -> List[TaskRecord]:
+        """查询板块指定年/月的任务"""
+        return self._cached(("board_month", board_id, year, month), CacheScope(board_id, (year, month), (year, month)),
+                            lambda: self._fetch_tasks(
+                                self.TASK_SELECT + " WHERE t.board_id = ? AND t.year = ? AND t.month = ?"
+                                " ORDER BY t.status_time DESC", (board_id, year, month)))
+
+    def get_board_year_months(self, board_id: int) -> List[Tuple[int, int, int]]:
+        """查询板块下有任务的年月及任务数：(year, month, task_count)，按年月倒序"""
+        def compute() -> List[Tuple[int, int, int]]:
+            self.cursor.execute('''
+                SELECT year, month, SUM(task_count) FROM task_counts
+                WHERE board_id = ?
+                GROUP BY year, month
+                HAVING SUM(task_count) > 0
+                ORDER BY year DESC, month DESC
+            ''', (board_id,))
+            return self.cursor.fetchall()
+        return self._cached(("year_months", board_id), CacheScope(board_id), compute)
 
     def get_tasks_by_time_status(self,
                                  year: Optional[int] = None,
                                  month: Optional[int] = None,
-                                 status: Optional[str] = None) -> List[Tuple]:
-        query = '''
-            SELECT t.id, t.name, b.name as board_name, t.year, t.month, t.status, 
-                   t.status_time, t.expected_time, t.board_id, t.task_dir, t.property_id,
-                   p.name as property_name, t.link_mode, t.link_url
-            FROM tasks t
-            JOIN boards b ON t.board_id = b.id
-            JOIN task_property p ON t.property_id = p.id
-            WHERE 1=1
-        '''
-        params = []
-        if year:
-            query += " AND t.year = ?"
-            params.append(year)
-        if month:
-            query += " AND t.month = ?"
-            params.append(month)
-        if status:
-            query += " AND t.status = ?"
-            params.append(status)
-        query += " ORDER BY t.status_time DESC"
-
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
-
-    def get_all_tasks_order_by_name(self) -> List[Tuple]:
-        self.cursor.execute('''
-            SELECT t.id, t.name, b.name as board_name, t.year, t.month, t.status, 
-                   t.status_time, t.expected_time, t.board_id, t.task_dir, t.property_id,
-                   p.name as property_name, t.link_mode, t.link_url
-            FROM tasks t
-            JOIN boards b ON t.board_id = b.id
-            JOIN task_property p ON t.property_id = p.id
-            ORDER BY t.name ASC
-        ''')
-        return self.cursor.fetchall()
+                                 status: Optional[str] = None) -> List[TaskRecord]:
+        return self.find_tasks(self._time_status_query(year, month, status))
+
+    def get_all_tasks_order_by_name(self) -> List[TaskRecord]:
+        return self.find_tasks(TaskQuery(order="name"))
+
+    def search_tasks_by_name(self, task_name: str, limit: Optional[int] = None) -> List[TaskRecord]:
+        """按名称子串检索：可用时走全文索引并按bm25相关度排序，否则回退LIKE
+        limit：只取前若干条（边输入边检索时用于首屏结果）
+        """
+        return self.find_tasks(TaskQuery(name=task_name, order="relevance"), limit=limit)
+
+    # ------------------------------
+    # 组合查询：TaskQuery 的各条件编译为一条参数化SQL
+    # 分页采用键集分页：以上一页最后一行的排序键定位下一页，翻页深度不影响耗时
+    # ------------------------------
+    PAGE_SIZE = 200
+
+    # 列顺序与 TaskRecord.row_factory 一致；板块名/属性名由记录按ID从快照中取得，不连接 boards / task_property
+    TASK_SELECT = '''
+        SELECT t.id, t.name, t.year, t.month, t.status, t.status_time, t.expected_time,
+               t.board_id, t.task_dir, t.property_id, t.link_mode, t.link_url
+        FROM tasks t
+    '''
+
+    # 排序方式 -> (ORDER BY 子句, 翻页条件, 从记录取排序键)；id 作为并列时的唯一排序键
+    PAGE_ORDERS = {
+        "status_time": ("t.status_time DESC, t.id DESC", "(t.status_time, t.id) < (?, ?)",
+                        lambda task: (task.status_time, task.id)),
+        "name": ("t.name ASC, t.id ASC", "(t.name, t.id) > (?, ?)",
+                 lambda task: (task.name, task.id)),
+        # 按主键顺序直接扫描表，不经过二级索引回表，适合导出全部数据
+        "id": ("t.id ASC", "t.id > ?", lambda task: (task.id,)),
+    }
+
+    def _fts_phrase(self, task_name: str) -> Optional[str]:
+        """可走全文索引时返回 MATCH 用的短语（整体作为短语匹配，转义双引号），否则返回None"""
+        if self.fts_enabled and len(task_name) >= self.FTS_MIN_QUERY_LEN:
+            return '"{}"'.format(task_name.replace('"', '""'))
+        return None
+
+    def _name_where(self, task_name: str) -> Tuple[str, list]:
+        phrase = self._fts_phrase(task_name)
+        if phrase is not None:
+            return "t.id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)", [phrase]
+        return "t.name LIKE ?", [f'%{task_name}%']
+
+    @staticmethod
+    def _in_condition(column: str, values: Tuple) -> Tuple[str, list]:
+        # 单个值用等值条件，多个值用 IN 列表，两者都能使用索引
+        if len(values) == 1:
+            return f"{column} = ?", [values[0]]
+        return f"{column} IN ({','.join('?' * len(values))})", list(values)
+
+    def _compile_where(self, query: TaskQuery, name_condition: bool = True) -> Tuple[str, list]:
+        """把查询条件编译为 WHERE 子句和参数
+        只有条件的组合方式会改变SQL文本，取值一律走参数绑定，同一形状的查询可复用预编译语句
+        """
+        conditions, params = [], []
+
+        def add(condition: str, values: list) -> None:
+            conditions.append(condition)
+            params.extend(values)
+
+        if query.board_id is not None:
+            add("t.board_id = ?", [query.board_id])
+        if query.year:
+            add("t.year = ?", [query.year])
+        if query.month:
+            add("t.month = ?", [query.month])
+        if query.year_month_from is not None and query.year_month_from == query.year_month_to:
+            # 单个月份用等值条件，与按月查询走同一批索引
+            add("t.year = ? AND t.month = ?", list(query.year_month_from))
+        else:
+            if query.year_month_from is not None:
+                add("(t.year, t.month) >= (?, ?)", list(query.year_month_from))
+            if query.year_month_to is not None:
+                add("(t.year, t.month) <= (?, ?)", list(query.year_month_to))
+        if query.statuses:
+            add(*self._in_condition("t.status", tuple(query.statuses)))
+        if query.property_ids:
+            add(*self._in_condition("t.property_id", tuple(query.property_ids)))
+        if query.link_mode is not None:
+            add("t.link_mode = ?", [query.link_mode])
+        if query.status_time_from:
+            add("t.status_time >= ?", [query.status_time_from])
+        if query.status_time_to:
+            # status_time 带时分秒，结束日期当天的记录都应包含在内
+            add("t.status_time < date(?, '+1 day')", [query.status_time_to])
+        if query.expected_from:
+            add("t.expected_time >= ?", [query.expected_from])
+        if query.expected_to:
+            add("t.expected_time <= ?", [query.expected_to])
+        if query.name and name_condition:
+            add(*self._name_where(query.name))
+        return " AND ".join(conditions) or "1=1", params
+
+    def _compile_select(self, query: TaskQuery, after: Optional[TaskRecord] = None,
+                        limit: Optional[int] = None) -> Tuple[str, list]:
+        """把查询条件编译为完整的 SELECT 语句和参数"""
+        # SQLite 中 LIMIT -1 表示不限制
+        limit = -1 if limit is None else limit
+        order = query.order
+        if order == "relevance":
+            phrase = self._fts_phrase(query.name) if query.name else None
+            if phrase is None:
+                order = "name"  # 无法计算相关度时按名称排序
+            else:
+                if after is not None:
+                    raise ValueError("按相关度排序的查询不支持翻页")
+                where, params = self._compile_where(query, name_condition=False)
+                return (self.TASK_SELECT + " JOIN tasks_fts ON tasks_fts.rowid = t.id"
+                        " WHERE tasks_fts MATCH ? AND " + where +
+                        " ORDER BY bm25(tasks_fts), t.name ASC LIMIT ?",
+                        [phrase] + params + [limit])
+
+        order_by, seek_condition, sort_key = self.PAGE_ORDERS[order]
+        where, params = self._compile_where(query)
+        if after is not None:
+            where += " AND " + seek_condition
+            params.extend(sort_key(after))
+        return self.TASK_SELECT + f" WHERE {where} ORDER BY {order_by} LIMIT ?", params + [limit]
+
+    def find_tasks(self, query: TaskQuery, after: Optional[TaskRecord] = None,
+                   limit: Optional[int] = None) -> List[TaskRecord]:
+        """按组合条件查询任务
+        after：上一页的最后一条记录，None 表示第一页；limit：None 表示不限制条数
+        按相关度排序（order="relevance"）时不支持 after 翻页
+        """
+        query = self._normalize_query(query)
+        # 缓存键只取翻页位置（排序键），不取整条记录
+        after_key = None if after is None else self.PAGE_ORDERS.get(query.order, self.PAGE_ORDERS["name"])[2](after)
+        return self._cached(("find", query, self._name_mode(query), after_key, limit), self._query_scope(query),
+                            lambda: self._fetch_tasks(*self._compile_select(query, after, limit)))
+
+    @staticmethod
+    def _normalize_query(query: TaskQuery) -> TaskQuery:
+        """等价的查询条件规范为同一形式（缓存键）：多选条件去重排序，0/空字符串视为不限"""
+        return query._replace(year=query.year or None, month=query.month or None, name=query.name or None,
+                              statuses=tuple(sorted(set(query.statuses))),
+                              property_ids=tuple(sorted(set(query.property_ids))))
+
+    def _name_mode(self, query: TaskQuery) -> Optional[bool]:
+        """名称条件是否走全文索引（缓存键的一部分）：fts_enabled 可在运行中切换，两种方式的结果和相关度排序不同"""
+        return None if query.name is None else self._fts_phrase(query.name) is not None
+
+    @staticmethod
+    def _query_scope(query: TaskQuery) -> CacheScope:
+        """查询结果覆盖的板块/年月/属性范围"""
+        ym_from, ym_to = query.year_month_from, query.year_month_to
+        if query.year:
+            year_from, year_to = (query.year, query.month or 1), (query.year, query.month or 12)
+            ym_from = max(ym_from, year_from) if ym_from else year_from
+            ym_to = min(ym_to, year_to) if ym_to else year_to
+        return CacheScope(query.board_id, ym_from, ym_to, query.property_ids)
+
+    STREAM_BATCH = 1000
+
+    def iter_tasks(self, query: TaskQuery = TaskQuery(), batch_size: int = STREAM_BATCH) -> Iterator[TaskRecord]:
+        """逐批读取组合查询的结果（导出等大结果集用），内存占用与结果总数无关
+        使用独立游标，迭代期间不影响 self.cursor 上的其他查询
+        """
+        cursor = self._task_cursor()
+        try:
+            cursor.execute(*self._compile_select(query))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def count_tasks(self, query: TaskQuery) -> int:
+        """按组合条件统计任务数（不受排序方式影响）"""
+        query = self._normalize_query(query)._replace(order="status_time")
+
+        def compute() -> int:
+            where, params = self._compile_where(query)
+            if self._counts_cover(query):
+                self.cursor.execute("SELECT IFNULL(SUM(t.task_count), 0) FROM task_counts t WHERE " + where, params)
+            else:
+                self.cursor.execute("SELECT COUNT(*) FROM tasks t WHERE " + where, params)
+            return self.cursor.fetchone()[0]
+        return self._cached(("count", query, self._name_mode(query)), self._query_scope(query), compute)
+
+    @staticmethod
+    def _counts_cover(query: TaskQuery) -> bool:
+        """查询条件是否只涉及计数表的维度（板块/年月/属性/状态/模式）"""
+        return not (query.name or query.status_time_from or query.status_time_to
+                    or query.expected_from or query.expected_to)
+
+    # ------------------------------
+    # 分组统计：GROUP BY 在 SQL 中完成，不读取任务行
+    # ------------------------------
+    # 统计维度 -> 分组列（task_counts 与 tasks 同名列，均以 t 为别名）
+    STAT_GROUPS = {
+        "board": ("t.board_id",),
+        "year": ("t.year",),
+        "month": ("t.year", "t.month"),
+        "property": ("t.property_id",),
+        "status": ("t.status",),
+        "link_mode": ("IFNULL(t.link_mode, 0)",),
+    }
+
+    def task_statistics(self, query: TaskQuery = TaskQuery(), group_by: Sequence[str] = ()) -> List[TaskStats]:
+        """按维度分组统计任务数、已完成数和逾期数，按分组取值升序
+        group_by：STAT_GROUPS 中的维度（可组合，如 ("board", "status")）；为空时返回一行总计
+        条件只涉及板块/年月/属性/状态/模式时，总数和已完成数取自计数表
+        """
+        group_by = self._check_group_by(group_by)
+        query = self._normalize_query(query)._replace(order="status_time")
+        # 逾期与当天日期有关，日期作为缓存键的一部分
+        return self._cached(("stats", query, self._name_mode(query), group_by, date.today()),
+                            self._query_scope(query), lambda: self._task_statistics(query, group_by))
+
+    def _check_group_by(self, group_by: Sequence[str]) -> Tuple[str, ...]:
+        group_by = tuple(group_by)
+        unknown = [dimension for dimension in group_by if dimension not in self.STAT_GROUPS]
+        if unknown:
+            raise ValueError(f"不支持的统计维度：{'、'.join(unknown)}")
+        return group_by
+
+    def _group_clauses(self, group_by: Tuple[str, ...], *extra: str) -> Tuple[List[str], str, str, str]:
+        """分组列及 SELECT 前缀、GROUP BY、ORDER BY 子句；extra 为维度之外追加的分组列"""
+        columns = [column for dimension in group_by for column in self.STAT_GROUPS[dimension]]
+        all_columns = columns + list(extra)
+        select = "".join(column + ", " for column in all_columns)
+        group = " GROUP BY " + ", ".join(all_columns) if all_columns else ""
+        order = " ORDER BY " + ", ".join(all_columns) if all_columns else ""
+        return columns, select, group, order
+
+    def _task_statistics(self, query: TaskQuery, group_by: Tuple[str, ...]) -> List[TaskStats]:
+        columns, select, group, order = self._group_clauses(group_by)
+        where, params = self._compile_where(query)
+
+        if self._counts_cover(query):
+            having = " HAVING SUM(t.task_count) > 0" if columns else ""
+            self.cursor.execute(
+                f"SELECT {select}IFNULL(SUM(t.task_count), 0),"
+                f" IFNULL(SUM(CASE WHEN t.status = '已完成' THEN t.task_count END), 0)"
+                f" FROM task_counts t WHERE {where}{group}{having}{order}", params)
+        else:
+            self.cursor.execute(
+                f"SELECT {select}COUNT(*), IFNULL(SUM(t.status = '已完成'), 0)"
+                f" FROM tasks t WHERE {where}{group}{order}", params)
+        totals = self.cursor.fetchall()
+
+        # 逾期：未完成且预计启用时间早于今天（按本地日期），由部分索引 idx_tasks_open_expected 覆盖
+        self.cursor.execute(
+            f"SELECT {select}COUNT(*) FROM tasks t WHERE {where}"
+            f" AND t.status != '已完成' AND t.expected_time < date('now', 'localtime'){group}", params)
+        overdue = {row[:-1]: row[-1] for row in self.cursor.fetchall()}
+
+        labeler = self._stat_labeler(group_by)
+        stats = []
+        for row in totals:
+            values = row[:len(columns)]
+            group_values, labels = labeler(values)
+            stats.append(TaskStats(group_values, labels, row[-2], row[-1], overdue.get(values, 0)))
+        return stats
 
-    def search_tasks_by_name(self, task_name: str) -> List[Tuple]:
+    def _stat_labeler(self, group_by: Tuple[str, ...]) -> Callable[[Tuple], Tuple[Tuple, Tuple[str, ...]]]:
+        """把一行分组列的取值转为 (各维度取值, 各维度显示文本)；月份占两列，合并为 (年, 月)"""
+        dimensions = self._get_dimensions()
+
+        def label(values: Tuple) -> Tuple[Tuple, Tuple[str, ...]]:
+            group_values, labels = [], []
+            position = 0
+            for dimension in group_by:
+                if dimension == "month":
+                    value = (values[position], values[position + 1])
+                    text = f"{value[0]}-{value[1]:02d}"
+                    position += 2
+                else:
+                    value = values[position]
+                    position += 1
+                    if dimension == "board":
+                        text = dimensions.board_names.get(value, str(value))
+                    elif dimension == "property":
+                        text = dimensions.property_names.get(value, str(value))
+                    elif dimension == "link_mode":
+                        text = "链接模式" if value == 1 else "目录模式"
+                    else:
+                        text = str(value)
+                group_values.append(value)
+                labels.append(text)
+            return tuple(group_values), tuple(labels)
+        return label
+
+    # ------------------------------
+    # 周期统计：由状态变化记录计算完成周期和各状态停留时长，在 SQL 中汇总，不读取记录明细
+    # since/until 为 'YYYY-MM-DD'（含当天），与 status_time 一样按UTC时间比较
+    # ------------------------------
+    @staticmethod
+    def _period_where(column: str, since: Optional[str], until: Optional[str]) -> Tuple[str, list]:
+        conditions, params = [], []
+        if since:
+            conditions.append(f" AND {column} >= CAST(strftime('%s', ?) AS INTEGER)")
+            params.append(since)
+        if until:
+            conditions.append(f" AND {column} < CAST(strftime('%s', ?, '+1 day') AS INTEGER)")
+            params.append(until)
+        return "".join(conditions), params
+
+    @staticmethod
+    def _events_join(period: str) -> str:
+        """任务与状态记录的连接：有统计区间时从区间内的记录出发，否则从符合条件的任务出发逐个查记录
+        用 CROSS JOIN 固定连接顺序、INDEXED BY 固定按任务查记录的索引：没有 ANALYZE 统计信息时，
+        优化器常从全部记录出发（按板块/月份筛选时慢数十倍），或对每个任务扫描按状态的索引
+        """
+        if period:
+            return "task_status_events e CROSS JOIN tasks t ON t.id = e.task_id"
+        return "tasks t CROSS JOIN task_status_events e INDEXED BY idx_status_events_task ON e.task_id = t.id"
+
+    def lead_time_statistics(self, query: TaskQuery = TaskQuery(), group_by: Sequence[str] = ("board",),
+                             since: Optional[str] = None, until: Optional[str] = None) -> List[LeadTimeStats]:
+        """统计 since~until 期间完成的任务从新建（第一条记录）到完成的时长，按 STAT_GROUPS 中的维度分组
+        第一条记录就是已完成的不计入：这样的记录来自迁移时补记的现有任务或导入的已完成任务，
+        记录时间是补记/导入的时间，并不是完成的时间
+        """
+        group_by = self._check_group_by(group_by)
+        columns, select, group, order = self._group_clauses(group_by)
+        period, period_params = self._period_where("e.event_time", since, until)
+        where, params = self._compile_where(self._normalize_query(query))
+        # 内层结构同 status_duration_statistics
+        self.cursor.execute(f'''
+            SELECT {select}COUNT(*), AVG(t.lead_time), MAX(t.lead_time)
+            FROM (
+                SELECT t.board_id, t.year, t.month, t.property_id, t.status, t.link_mode, e.event_time - (
+                           SELECT MIN(f.event_time) FROM task_status_events f WHERE f.task_id = e.task_id
+                       ) AS lead_time
+                FROM {self._events_join(period)}
+                WHERE {where} AND e.status = ?{period} AND EXISTS (
+                    SELECT 1 FROM task_status_events f
+                    WHERE f.task_id = e.task_id AND (f.event_time, f.rowid) < (e.event_time, e.rowid)
+                )
+                LIMIT -1
+            ) t{group}{order}
+        ''', [*params, STATUS_CODES["已完成"], *period_params])
+        rows = self.cursor.fetchall()
+        labeler = self._stat_labeler(group_by)  # 可能重新加载板块/属性，先取完结果
+        stats = []
+        for row in rows:
+            if not row[-3]:
+                continue  # 不分组且没有记录时 COUNT 仍返回一行
+            group_values, labels = labeler(row[:len(columns)])
+            stats.append(LeadTimeStats(group_values, labels, row[-3], row[-2], row[-1]))
+        return stats
+
+    def status_duration_statistics(self, query: TaskQuery = TaskQuery(), group_by: Sequence[str] = ("board",),
+                                   since: Optional[str] = None, until: Optional[str] = None,
+                                   statuses: Sequence[str] = ("待启用", "初开启")) -> List[StatusDurationStats]:
+        """统计 since~until 期间进入各状态后停留的时长，按 STAT_GROUPS 中的维度和状态分组
+        停留时长为进入该状态到该任务下一条记录的时间；仍处于该状态的计到当前时间
+        """
+        group_by = self._check_group_by(group_by)
+        columns, select, group, order = self._group_clauses(group_by, "t.event_status")
+        period, period_params = self._period_where("e.event_time", since, until)
+        where, params = self._compile_where(self._normalize_query(query))
+        codes = [STATUS_CODES[status] for status in statuses]
+        # 内层每条记录一行，别名为 t 以沿用 STAT_GROUPS 的分组列；
+        # LIMIT -1 使内层不被展开到外层聚合中，下一条记录的时间只查一次
+        self.cursor.execute(f'''
+            SELECT {select}COUNT(*), COUNT(t.next_time),
+                   SUM(IFNULL(t.next_time, CAST(strftime('%s', 'now') AS INTEGER)) - t.event_time)
+            FROM (
+                SELECT t.board_id, t.year, t.month, t.property_id, t.status, t.link_mode,
+                       e.status AS event_status, e.event_time, (
+                           SELECT MIN(n.event_time) FROM task_status_events n
+                           WHERE n.task_id = e.task_id AND (n.event_time, n.rowid) > (e.event_time, e.rowid)
+                       ) AS next_time
+                FROM {self._events_join(period)}
+                WHERE {where} AND e.status IN ({", ".join("?" * len(codes))}){period}
+                LIMIT -1
+            ) t{group}{order}
+        ''', [*params, *codes, *period_params])
+        rows = self.cursor.fetchall()
+        labeler = self._stat_labeler(group_by)
+        stats = []
+        for row in rows:
+            group_values, labels = labeler(row[:len(columns)])
+            intervals, finished, total = row[-3:]
+            stats.append(StatusDurationStats(group_values, labels, TASK_STATUSES[row[len(columns)]],
+                                             intervals, intervals - finished, total / intervals, total))
+        return stats
+
+    def get_task_status_history(self, task_id: int) -> List[Tuple[str, str]]:
+        """任务的状态变化记录：(状态, UTC时间 'YYYY-MM-DD HH:MM:SS')，按发生顺序"""
         self.cursor.execute('''
-            SELECT t.id, t.name, b.name as board_name, t.year, t.month, t.status, 
-                   t.status_time, t.expected_time, t.board_id, t.task_dir, t.property_id,
-                   p.name as property_name, t.link_mode, t.link_url
-            FROM tasks t
-            JOIN boards b ON t.board_id = b.id
-            JOIN task_property p ON t.property_id = p.id
-            WHERE t.name LIKE ?
-            ORDER BY t.name ASC
-        ''', (f'%{task_name}%',))
-        return self.cursor.fetchall()
-
-    def update_task_status(self, task_id: int, new_status: str) -> None:
+            SELECT status, datetime(event_time, 'unixepoch') FROM task_status_events
+            WHERE task_id = ? ORDER BY event_time, rowid
+        ''', (task_id,))
+        return [(TASK_STATUSES[status], event_time) for status, event_time in self.cursor.fetchall()]
+
+    @staticmethod
+    def _time_status_query(year: Optional[int], month: Optional[int], status: Optional[str]) -> TaskQuery:
+        return TaskQuery(year=year or None, month=month or None, statuses=(status,) if status else ())
+
+    def get_all_tasks_order_by_name_page(self, after: Optional[TaskRecord] = None,
+                                         limit: int = PAGE_SIZE) -> List[TaskRecord]:
+        return self.find_tasks(TaskQuery(order="name"), after, limit)
+
+    def count_all_tasks(self) -> int:
+        return self.count_tasks(TaskQuery())
+
+    def get_tasks_by_property_page(self, prop_id: int, after: Optional[TaskRecord] = None,
+                                   limit: int = PAGE_SIZE) -> List[TaskRecord]:
+        return self.find_tasks(TaskQuery(property_ids=(prop_id,)), after, limit)
+
+    def count_tasks_by_property(self, prop_id: int) -> int:
+        return self.count_tasks(TaskQuery(property_ids=(prop_id,)))
+
+    def get_tasks_by_link_mode_page(self, link_mode: int, after: Optional[TaskRecord] = None,
+                                    limit: int = PAGE_SIZE) -> List[TaskRecord]:
+        return self.find_tasks(TaskQuery(link_mode=link_mode), after, limit)
+
+    def count_tasks_by_link_mode(self, link_mode: int) -> int:
+        return self.count_tasks(TaskQuery(link_mode=link_mode))
+
+    def get_tasks_by_time_status_page(self,
+                                      year: Optional[int] = None,
+                                      month: Optional[int] = None,
+                                      status: Optional[str] = None,
+                                      after: Optional[TaskRecord] = None,
+                                      limit: int = PAGE_SIZE) -> List[TaskRecord]:
+        return self.find_tasks(self._time_status_query(year, month, status), after, limit)
+
+    def count_tasks_by_time_status(self,
+                                   year: Optional[int] = None,
+                                   month: Optional[int] = None,
+                                   status: Optional[str] = None) -> int:
+        return self.count_tasks(self._time_status_query(year, month, status))
+
+    def search_tasks_by_name_page(self, task_name: str, after: Optional[TaskRecord] = None,
+                                  limit: int = PAGE_SIZE) -> List[TaskRecord]:
+        """按名称检索的分页版本（按名称排序，不按相关度）"""
+        return self.find_tasks(TaskQuery(name=task_name, order="name"), after, limit)
+
+    def count_tasks_by_name(self, task_name: str) -> int:
+        return self.count_tasks(TaskQuery(name=task_name))
+
+    def update_task_status(self, task_id: int, new_status: str) -> Optional[TaskRecord]:
+        """修改任务状态，返回更新后的任务记录"""
+        keys = self._task_keys([task_id])
         self.cursor.execute('''
             UPDATE tasks 
             SET status = ?, status_time = CURRENT_TIMESTAMP 
             WHERE id = ?
         ''', (new_status, task_id))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_results(keys)
+        return self.get_task(task_id)
+
+    def update_tasks_status(self, task_ids: Iterable[int], new_status: str) -> int:
+        """批量修改任务状态（单事务），返回受影响条数"""
+        task_ids = list(task_ids)
+        keys = self._task_keys(task_ids)
+        affected = self._execute_for_ids('''
+            UPDATE tasks 
+            SET status = ?, status_time = CURRENT_TIMESTAMP 
+            WHERE id IN ({ids})
+        ''', (new_status,), task_ids)
+        self._invalidate_results(keys)
+        return affected
+
+    def update_tasks_property(self, task_ids: Iterable[int], new_prop_id: int) -> int:
+        """批量修改任务属性（单事务），返回受影响条数"""
+        task_ids = list(task_ids)
+        keys = self._task_keys(task_ids)
+        affected = self._execute_for_ids("UPDATE tasks SET property_id = ? WHERE id IN ({ids})",
+                                         (new_prop_id,), task_ids)
+        self._invalidate_results(keys + [key._replace(property_id=new_prop_id) for key in keys])
+        return affected
+
+    def update_tasks_link_mode(self, task_ids: Iterable[int], link_mode: int) -> int:
+        """批量修改任务模式（单事务），返回受影响条数"""
+        task_ids = list(task_ids)
+        keys = self._task_keys(task_ids)
+        affected = self._execute_for_ids("UPDATE tasks SET link_mode = ? WHERE id IN ({ids})",
+                                         (link_mode,), task_ids)
+        self._invalidate_results(keys)
+        return affected
 
     def delete_task(self, task_id: int) -> None:
+        keys = self._task_keys([task_id])
         self.cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        self.conn.commit()
+        self._commit()
+        self._invalidate_results(keys)
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        """批量删除任务（单事务），返回删除条数"""
+        task_ids = list(task_ids)
+        keys = self._task_keys(task_ids)
+        affected = self._execute_for_ids("DELETE FROM tasks WHERE id IN ({ids})", (), task_ids)
+        self._invalidate_results(keys)
+        return affected
+
+    # ------------------------------
+    # 性能追踪（传入 tracer 时开启）：公开方法的耗时计入直方图；
+    # 经 set_trace_callback 记录方法执行的每条语句，方法返回后为超过阈值的语句取得查询计划
+    # ------------------------------
+    UNTRACED_METHODS = ("transaction", "close")
+    TRACE_STATEMENT_LIMIT = 1000  # 单次调用最多记录的语句数（executemany 每行算一条）
+    TRACE_SQL_CHARS = 4000        # 慢语句文本保留的字符数（批量操作的 IN 列表可能很长）
+    EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+    def _install_tracer(self) -> None:
+        self._trace_depth = 0  # 正在执行的被追踪方法层数，只在最外层方法返回时处理语句
+        self._statements: List[Tuple[float, str]] = []  # (开始时间, 语句)
+        self.conn.set_trace_callback(self._on_statement)
+        for name in dir(type(self)):
+            if name.startswith("_") or name in self.UNTRACED_METHODS or not inspect.isfunction(getattr(type(self), name)):
+                continue
+            method = getattr(self, name)
+            traced = self._traced_generator if inspect.isgeneratorfunction(method) else self._traced
+            setattr(self, name, functools.wraps(method)(traced(name, method)))
+
+    def _on_statement(self, sql: str) -> None:
+        if not self._trace_depth:
+            return
+        if len(self._statements) < self.TRACE_STATEMENT_LIMIT:
+            self._statements.append((time.perf_counter(), sql))
+        elif len(self._statements) == self.TRACE_STATEMENT_LIMIT:
+            # 之后的语句不再记录，只标记前一条语句的结束
+            self._statements.append((time.perf_counter(), "-- 未记录的语句"))
+
+    def _traced(self, name: str, method: Callable) -> Callable:
+        def call(*args, **kwargs):
+            self._trace_depth += 1
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._end_traced_step(name, start)
+        return call
+
+    def _traced_generator(self, name: str, method: Callable) -> Callable:
+        """生成器方法按各次取值的耗时之和计入（不含调用方处理每一项的时间）"""
+        def call(*args, **kwargs):
+            iterator = method(*args, **kwargs)
+            elapsed = 0.0
+            try:
+                while True:
+                    self._trace_depth += 1
+                    start = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += self._end_traced_step(name, start, record=False)
+                    yield item
+            finally:
+                iterator.close()
+                self.tracer.record_call(name, elapsed)
+        return call
+
+    def _end_traced_step(self, name: str, start: float, record: bool = True) -> float:
+        """结束一次被追踪的执行，返回耗时（毫秒）；record 为 False 时不计入直方图（由调用方累计）"""
+        end = time.perf_counter()
+        elapsed = (end - start) * 1000
+        self._trace_depth -= 1
+        if record:
+            self.tracer.record_call(name, elapsed)
+        if not self._trace_depth:
+            statements, self._statements = self._statements, []
+            self._record_slow_statements(name, statements, end)
+        return elapsed
+
+    def _record_slow_statements(self, method: str, statements: List[Tuple[float, str]], end: float) -> None:
+        # 语句耗时取到下一条语句开始（最后一条取到方法返回）；触发器内的语句以 "--" 开头，计入触发它的语句
+        finishes = [start for start, _ in statements[1:]] + [end]
+        now = datetime.now().isoformat(sep=" ", timespec="seconds")
+        for (start, sql), finish in zip(statements, finishes):
+            elapsed = (finish - start) * 1000
+            if elapsed >= self.tracer.slow_ms and not sql.startswith("--"):
+                text = sql.strip()
+                if len(text) > self.TRACE_SQL_CHARS:
+                    text = text[:self.TRACE_SQL_CHARS] + " …"
+                self.tracer.record_slow(SlowStatement(now, method, round(elapsed, 3), text, self._query_plan(sql)))
+
+    def _query_plan(self, sql: str) -> Tuple[str, ...]:
+        text = sql.strip()
+        if text.split(None, 1)[0].upper() not in self.EXPLAINABLE:
+            return ()
+        self.conn.set_trace_callback(None)  # 查询计划语句本身不记录
+        try:
+            # 新游标：不影响 self.cursor 上尚未读取的结果
+            return format_plan(self.conn.execute("EXPLAIN QUERY PLAN " + text).fetchall())
+        except sqlite3.Error as e:
+            return (f"无法取得查询计划：{e}",)
+        finally:
+            self.conn.set_trace_callback(self._on_statement)
 
     def close(self) -> None:
         self.conn.close()
\ No newline at end of file
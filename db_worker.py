@@ -0,0 +1,119 @@
+import queue
+import time
+from typing import Callable, Dict, Optional, Tuple
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from db_helper import DBHelper, ConnectionProfile, DEFAULT_PROFILE
+from query_trace import Tracer
+
+
+class _DBThread(QThread):
+    """独占数据库连接的工作线程：按提交顺序逐个执行请求，读写天然串行"""
+
+    # (请求ID, 结果, 异常)
+    request_done = pyqtSignal(int, object, object)
+
+    def __init__(self, db_name: str, profile: ConnectionProfile, tracer: Optional[Tracer] = None, parent=None):
+        super().__init__(parent)
+        self._db_name = db_name
+        self._profile = profile
+        self._tracer = tracer
+        self._requests = queue.Queue()
+
+    def submit(self, request_id: int, method: str, args: tuple, kwargs: dict) -> None:
+        self._requests.put((request_id, method, args, kwargs))
+
+    def stop(self) -> None:
+        """执行完已提交的请求后结束线程"""
+        self._requests.put(None)
+        self.wait()
+
+    def run(self) -> None:
+        # 连接必须在本线程内创建和使用
+        db, init_error = None, None
+        try:
+            db = DBHelper(self._db_name, self._profile, self._tracer)
+        except Exception as e:
+            init_error = e
+
+        try:
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    break
+                request_id, method, args, kwargs = request
+                if init_error is not None:
+                    self.request_done.emit(request_id, None, init_error)
+                    continue
+                try:
+                    result = getattr(db, method)(*args, **kwargs)
+                except Exception as e:
+                    self.request_done.emit(request_id, None, e)
+                else:
+                    self.request_done.emit(request_id, result, None)
+        finally:
+            if db is not None:
+                db.close()
+
+
+class AsyncDB(QObject):
+    """异步数据访问层：GUI线程提交DBHelper方法调用，结果通过回调回到GUI线程
+
+    用法：db.call("get_all_boards", on_result=self.fill_boards)
+    """
+
+    busy_changed = pyqtSignal(bool)  # 是否有未完成的请求
+    error_occurred = pyqtSignal(str, object)  # (方法名, 异常)，未指定on_error时发出
+
+    def __init__(self, db_name: str = "task_manager.db", profile: ConnectionProfile = DEFAULT_PROFILE,
+                 parent=None, tracer: Optional[Tracer] = None):
+        super().__init__(parent)
+        self.db_name = db_name
+        self.profile = profile
+        # 开启性能追踪时，DBHelper 记录各方法耗时，这里另记从提交到结果返回GUI线程的耗时（含排队）
+        self.tracer = tracer
+        self._next_id = 0
+        self._busy = False
+        # 请求ID -> (方法名, on_result, on_error, 提交时间)
+        self._pending: Dict[int, Tuple[str, Optional[Callable], Optional[Callable], float]] = {}
+        self._thread = _DBThread(db_name, profile, tracer, self)
+        self._thread.request_done.connect(self._on_request_done)
+        self._thread.start()
+
+    def call(self, method: str, *args,
+             on_result: Optional[Callable] = None,
+             on_error: Optional[Callable] = None,
+             **kwargs) -> int:
+        """提交一次DBHelper方法调用，返回请求ID"""
+        if not callable(getattr(DBHelper, method, None)):
+            raise AttributeError(f"DBHelper 没有方法 {method}")
+        self._next_id += 1
+        self._pending[self._next_id] = (method, on_result, on_error, time.perf_counter())
+        self._set_busy(True)
+        self._thread.submit(self._next_id, method, args, kwargs)
+        return self._next_id
+
+    def is_busy(self) -> bool:
+        return self._busy
+
+    def close(self) -> None:
+        """等待已提交的请求执行完毕并关闭连接"""
+        self._thread.stop()
+
+    def _set_busy(self, busy: bool) -> None:
+        if busy != self._busy:
+            self._busy = busy
+            self.busy_changed.emit(busy)
+
+    def _on_request_done(self, request_id: int, result, error) -> None:
+        method, on_result, on_error, submitted = self._pending.pop(request_id)
+        if self.tracer is not None:
+            self.tracer.record_span(f"AsyncDB.{method}", (time.perf_counter() - submitted) * 1000)
+        # 先更新忙碌状态：回调中可能弹出模态对话框
+        self._set_busy(bool(self._pending))
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                self.error_occurred.emit(method, error)
+        elif on_result:
+            on_result(result)
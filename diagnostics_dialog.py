@@ -0,0 +1,127 @@
+from typing import Dict, List
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView, QPlainTextEdit, QSplitter,
+                             QFileDialog, QMessageBox)
+from PyQt5.QtCore import Qt
+from db_worker import AsyncDB
+from query_trace import Tracer
+
+TIMING_HEADERS = ["次数", "平均ms", "P50ms", "P95ms", "最大ms", "合计ms"]
+SLOW_HEADERS = ["时间", "方法", "耗时ms", "语句"]
+
+
+class DiagnosticsDialog(QDialog):
+    """诊断面板（以 --trace 启动时可用）：数据库方法与界面操作的耗时分布、慢语句及其查询计划、查询结果缓存命中率"""
+
+    def __init__(self, tracer: Tracer, db: AsyncDB, parent=None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.db = db
+        self._slow_statements: List[Dict] = []
+        self._cache_stats: Dict[str, float] = {}
+        self.setWindowTitle("性能诊断")
+        self.resize(1100, 700)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        self.tabs = QTabWidget()
+        self.method_table = self._timing_table("DBHelper 方法")
+        self.span_table = self._timing_table("界面操作")
+        self.tabs.addTab(self.method_table, "数据库方法")
+        self.tabs.addTab(self.span_table, "界面操作")
+
+        # 慢语句：上方列表，下方为选中语句的全文和查询计划
+        splitter = QSplitter(Qt.Vertical)
+        self.slow_table = QTableWidget(0, len(SLOW_HEADERS))
+        self.slow_table.setHorizontalHeaderLabels(SLOW_HEADERS)
+        self._setup_table(self.slow_table)
+        self.slow_table.horizontalHeader().setSectionResizeMode(len(SLOW_HEADERS) - 1, QHeaderView.Stretch)
+        self.slow_table.currentCellChanged.connect(self._show_statement)
+        self.statement_view = QPlainTextEdit()
+        self.statement_view.setReadOnly(True)
+        splitter.addWidget(self.slow_table)
+        splitter.addWidget(self.statement_view)
+        self.tabs.addTab(splitter, "慢语句")
+        layout.addWidget(self.tabs)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        for text, slot in (("刷新", self.refresh), ("清空", self.clear), ("导出JSON", self.export)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+    def _timing_table(self, name_header: str) -> QTableWidget:
+        table = QTableWidget(0, len(TIMING_HEADERS) + 1)
+        table.setHorizontalHeaderLabels([name_header] + TIMING_HEADERS)
+        self._setup_table(table)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        return table
+
+    @staticmethod
+    def _setup_table(table: QTableWidget) -> None:
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.verticalHeader().setVisible(False)
+
+    def refresh(self) -> None:
+        snapshot = self.tracer.snapshot()
+        self._fill_timings(self.method_table, snapshot["methods"])
+        self._fill_timings(self.span_table, snapshot["spans"])
+        self._slow_statements = list(reversed(snapshot["slow_statements"]))  # 最近的在前
+        self.slow_table.setRowCount(len(self._slow_statements))
+        for row, statement in enumerate(self._slow_statements):
+            values = [statement["time"], statement["method"], statement["elapsed_ms"],
+                      " ".join(statement["sql"].split())]
+            for column, value in enumerate(values):
+                cell = QTableWidgetItem()
+                cell.setData(Qt.DisplayRole, value)
+                self.slow_table.setItem(row, column, cell)
+        self.statement_view.clear()
+        self.summary_label.setText(f"自 {snapshot['started']} 起；慢语句阈值 {snapshot['slow_ms']}ms")
+        # 缓存统计由数据库线程取得，返回后补在摘要后面
+        self.db.call("cache_stats", on_result=self._show_cache_stats)
+
+    def _fill_timings(self, table: QTableWidget, timings: Dict[str, Dict]) -> None:
+        table.setSortingEnabled(False)
+        table.setRowCount(len(timings))
+        for row, (name, timing) in enumerate(timings.items()):
+            values = [name, timing["count"], timing["mean_ms"], timing["p50_ms"], timing["p95_ms"],
+                      timing["max_ms"], timing["total_ms"]]
+            for column, value in enumerate(values):
+                cell = QTableWidgetItem()
+                cell.setData(Qt.DisplayRole, value)  # 数值列按数值排序
+                if column:
+                    cell.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, column, cell)
+        table.setSortingEnabled(True)
+
+    def _show_statement(self, row: int, *_) -> None:
+        if not 0 <= row < len(self._slow_statements):
+            return
+        statement = self._slow_statements[row]
+        plan = "\n".join(statement["plan"]) or "（无查询计划）"
+        self.statement_view.setPlainText(f"{statement['sql']}\n\n查询计划：\n{plan}")
+
+    def _show_cache_stats(self, stats: Dict[str, float]) -> None:
+        self._cache_stats = stats
+        text = "，".join(f"{name} {value}" for name, value in stats.items())
+        self.summary_label.setText(f"{self.summary_label.text()}；查询结果缓存：{text}")
+
+    def clear(self) -> None:
+        self.tracer.reset()
+        self.refresh()
+
+    def export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(self, "导出诊断数据", "trace.json", "JSON 文件 (*.json)")
+        if not path:
+            return
+        try:
+            self.tracer.dump(path, {"result_cache": self._cache_stats})
+        except OSError as e:
+            QMessageBox.warning(self, "导出失败", str(e))
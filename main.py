@@ -1,22 +1,44 @@
+import time
+STARTUP_ORIGIN = time.perf_counter()  # 启动计时起点：在导入 PyQt5 之前取得
+import argparse
+import json
 import sys
 import os
 import webbrowser
 from datetime import datetime
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QListWidget, QPushButton, QLabel, QTableWidget, QTableWidgetItem,
                              QComboBox, QInputDialog, QMessageBox, QTreeWidget, QTreeWidgetItem,
                              QDateEdit, QMenu, QAction, QListWidgetItem, QDialog, QFormLayout,
-                             QFileDialog, QLineEdit, QSpacerItem, QSizePolicy)
-from PyQt5.QtCore import Qt, QDate, QSize, QRect, QPoint, QTimer
+                             QFileDialog, QLineEdit, QSpacerItem, QSizePolicy, QTableView,
+                             QAbstractItemView)
+from PyQt5.QtCore import Qt, QDate, QSize, QRect, QPoint, QTimer, pyqtSignal
 from PyQt5.QtGui import QPalette, QColor, QFont, QBrush, QPainter, QLinearGradient
-from db_helper import DBHelper
+from db_helper import TaskQuery, TaskRecord, TaskStats
+from db_worker import AsyncDB
+from diagnostics_dialog import DiagnosticsDialog
+from query_trace import SLOW_STATEMENT_MS, Tracer
+from search_worker import NameSearchWorker
+from startup_timer import StartupTimer
+from stats_dialog import StatsDialog
+from task_model import (TaskTableModel, TaskButtonDelegate, BUTTON_COLUMNS, OPERATIONS,
+                        COL_SET, COL_JUMP, COL_OPERATION, COL_PROP_ID, COL_TASK_ID)
 
 
 class GradientBackgroundWidget(QWidget):
     """带渐变背景的自定义部件"""
 
+    first_painted = pyqtSignal()  # 第一次绘制时发出（用于统计首次绘制耗时）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._painted = False
+
     def paintEvent(self, event):
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
         painter = QPainter(self)
         gradient = QLinearGradient(QPoint(0, 0), QPoint(0, self.height()))
         gradient.setColorAt(0, QColor(240, 248, 255))  # 浅蓝
@@ -26,15 +48,36 @@ class GradientBackgroundWidget(QWidget):
 
 
 class TaskManager(QMainWindow):
-    def __init__(self):
+    startup_finished = pyqtSignal()  # 窗口已绘制且初始数据（板块列表）已显示
+
+    def __init__(self, db_name: str = "task_manager.db", startup_timer: Optional[StartupTimer] = None,
+                 tracer: Optional[Tracer] = None):
         super().__init__()
-        self.db = DBHelper()
+        self.startup_timer = startup_timer or StartupTimer()
+        self.tracer = tracer  # 性能追踪（None 表示未开启）
+        # 所有数据库访问都在后台线程执行，结果通过回调回到GUI线程
+        self.db = AsyncDB(db_name, tracer=tracer)
+        self.db.busy_changed.connect(self.on_db_busy_changed)
+        self.db.error_occurred.connect(self.on_db_error)
+        self._latest_task_query = None  # 最新一次任务列表查询的请求ID
         self.current_board_id = None
         self.current_board_name = ""
-        self.init_ui()
+        # 属性管理面板、查询面板及其控件在第一次打开时才创建
+        self.property_panel = None
+        self.search_panel = None
+        self.date_field_combo = None
+        self.date_from_edit = None
+        self.date_to_edit = None
+        self.stats_dialog = None
+        self.diagnostics_dialog = None
+        self.prop_table = None
+        self.prop_combo = None
+        self.name_search_worker = None
+        self.name_search_timer = None
+        # 先设置样式表再创建控件：控件创建时直接套用样式，避免整体重新套用一遍
         self.set_style()
-        # 初始化属性相关下拉框数据
-        self.load_property_combo_data()
+        self.init_ui()
+        self.startup_timer.mark("window")
 
     def init_ui(self):
         self.setWindowTitle("任务状态管理器")
@@ -91,6 +134,7 @@ class TaskManager(QMainWindow):
 
         # 主布局（不变）
         main_widget = GradientBackgroundWidget()
+        main_widget.first_painted.connect(self.on_first_paint)
         main_layout = QHBoxLayout(main_widget)
         main_layout.setContentsMargins(15, 15, 15, 15)
         main_layout.setSpacing(15)
@@ -104,7 +148,11 @@ class TaskManager(QMainWindow):
         main_layout.addWidget(right_panel, 3)
 
         self.setCentralWidget(main_widget)
-        self.load_boards()
+
+        # 状态栏：数据库忙碌提示
+        self.busy_label = QLabel("正在访问数据库…")
+        self.busy_label.setVisible(False)
+        self.statusBar().addPermanentWidget(self.busy_label)
 
     def _create_left_panel(self) -> QWidget:
         """左侧板块面板（不变）"""
@@ -141,6 +189,111 @@ class TaskManager(QMainWindow):
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(12)
 
+        # 面板开关：属性管理、查询区域在第一次打开时才创建，缩短启动时间
+        toggle_layout = QHBoxLayout()
+        toggle_layout.setSpacing(15)
+        self.property_panel_btn = QPushButton("属性管理")
+        self.property_panel_btn.setObjectName("actionButton")
+        self.property_panel_btn.setCheckable(True)
+        self.property_panel_btn.toggled.connect(self.toggle_property_panel)
+        self.search_panel_btn = QPushButton("查询")
+        self.search_panel_btn.setObjectName("actionButton")
+        self.search_panel_btn.setCheckable(True)
+        self.search_panel_btn.toggled.connect(self.toggle_search_panel)
+        stats_btn = QPushButton("统计")
+        stats_btn.setObjectName("actionButton")
+        stats_btn.clicked.connect(self.show_stats_dialog)
+        toggle_layout.addWidget(self.property_panel_btn)
+        toggle_layout.addWidget(self.search_panel_btn)
+        toggle_layout.addWidget(stats_btn)
+        if self.tracer is not None:
+            diagnostics_btn = QPushButton("诊断")
+            diagnostics_btn.setObjectName("actionButton")
+            diagnostics_btn.clicked.connect(self.show_diagnostics_dialog)
+            toggle_layout.addWidget(diagnostics_btn)
+        toggle_layout.addStretch()
+        layout.addLayout(toggle_layout)
+
+        # 懒创建面板的插入位置（属性管理在上，查询区域在下）
+        self.lazy_panel_layout = QVBoxLayout()
+        self.lazy_panel_layout.setSpacing(12)
+        layout.addLayout(self.lazy_panel_layout)
+
+        # ------------------------------
+        # 4. 时间目录树（原有）
+        # ------------------------------
+        self.task_tree = QTreeWidget()
+        self.task_tree.setObjectName("taskTree")
+        self.task_tree.setHeaderLabel("时间目录")
+        self.task_tree.itemClicked.connect(self.on_tree_item_click)
+        layout.addWidget(self.task_tree)
+
+        # ------------------------------
+        # 5. 任务表格（含任务属性列，原有）
+        # ------------------------------
+        # 模型/视图结构：按钮列由代理绘制，行按批次懒加载，渲染开销只与可见行数相关
+        self.task_model = TaskTableModel(self)
+        self.task_table = QTableView()
+        self.task_table.setObjectName("taskTable")
+        self.task_table.setModel(self.task_model)
+        self.task_button_delegate = TaskButtonDelegate(self.task_table)
+        self.task_button_delegate.clicked.connect(self.on_task_button_clicked)
+        for column in BUTTON_COLUMNS:
+            self.task_table.setItemDelegateForColumn(column, self.task_button_delegate)
+        self.task_table.setMouseTracking(True)  # 按钮悬停效果
+        self.task_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # 整行多选（Ctrl/Shift），右键可对选中任务批量操作
+        self.task_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.task_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        # 行高/列宽设置
+        self.task_table.verticalHeader().setDefaultSectionSize(70)
+        self.task_table.verticalHeader().setMinimumSectionSize(50)
+        self.task_table.horizontalHeader().setSectionResizeMode(0, 1)
+        self.task_table.horizontalHeader().setSectionResizeMode(1, 1)
+        self.task_table.horizontalHeader().setSectionResizeMode(2, 1)
+        self.task_table.horizontalHeader().setSectionResizeMode(3, 1)
+        self.task_table.horizontalHeader().setSectionResizeMode(4, 1)
+        self.task_table.horizontalHeader().setSectionResizeMode(5, 1)
+        self.task_table.horizontalHeader().setSectionResizeMode(6, 1)
+        self.task_table.horizontalHeader().setSectionResizeMode(7, 0)
+        self.task_table.horizontalHeader().setSectionResizeMode(8, 0)
+        self.task_table.horizontalHeader().setSectionResizeMode(9, 0)
+        # 具体列宽
+        self.task_table.setColumnWidth(0, 100)
+        self.task_table.setColumnWidth(1, 100)
+        self.task_table.setColumnWidth(2, 120)  # 任务属性列
+        self.task_table.setColumnWidth(3, 120)
+        self.task_table.setColumnWidth(4, 200)
+        self.task_table.setColumnWidth(5, 200)
+        self.task_table.setColumnWidth(6, 200)
+        self.task_table.setColumnWidth(7, 150)
+        self.task_table.setColumnWidth(8, 150)
+        self.task_table.setColumnWidth(9, 150)  # 操作按钮列
+        self.task_table.hideColumn(COL_PROP_ID)  # 隐藏属性ID列
+        self.task_table.hideColumn(COL_TASK_ID)  # 隐藏任务ID列
+        self.task_table.setAlternatingRowColors(True)
+        # 任务表格右键菜单（新增更改属性）
+        self.task_table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.task_table.customContextMenuRequested.connect(self.show_task_context_menu)
+        layout.addWidget(self.task_table)
+
+        # ------------------------------
+        # 6. 新建任务按钮（原有）
+        # ------------------------------
+        add_task_btn = QPushButton("+ 新建任务")
+        add_task_btn.setObjectName("addButton")
+        add_task_btn.clicked.connect(self.add_task)
+        layout.addWidget(add_task_btn)
+
+        return panel
+
+    def _create_property_panel(self) -> QWidget:
+        """属性管理面板（第一次打开时创建）"""
+        panel = QWidget()
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(12)
+
         # ------------------------------
         # 1. 属性管理区域（显示预设属性+删除按钮）
         # ------------------------------
@@ -189,6 +342,14 @@ class TaskManager(QMainWindow):
         custom_prop_layout.addStretch()
         layout.addLayout(custom_prop_layout)
 
+        return panel
+
+    def _create_search_panel(self) -> QWidget:
+        """查询面板（第一次打开时创建）"""
+        panel = QWidget()
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(0, 0, 0, 0)
+
         # ------------------------------
         # 3. 查询区域（新增：日期+全属性查询按钮）
         # ------------------------------
@@ -198,17 +359,19 @@ class TaskManager(QMainWindow):
         combo_search_layout = QHBoxLayout()
         combo_search_layout.setSpacing(15)
 
-        # 年份/月份筛选（原有）
-        self.year_combo = QComboBox()
-        self.year_combo.setObjectName("searchCombo")
-        current_year = datetime.now().year
-        self.year_combo.addItems([str(current_year - 1), str(current_year), str(current_year + 1)])
-        self.year_combo.setCurrentText(str(current_year))
-
-        self.month_combo = QComboBox()
-        self.month_combo.setObjectName("searchCombo")
-        self.month_combo.addItems([str(i) for i in range(1, 13)])
-        self.month_combo.setCurrentText(str(datetime.now().month))
+        # 日期区间筛选：起止日期 + 筛选的时间字段（按所属年月筛选时取起止日期的年月）
+        self.date_field_combo = QComboBox()
+        self.date_field_combo.setObjectName("searchCombo")
+        for text, field in (("所属年月", "month"), ("状态时间", "status_time"), ("预计启用时间", "expected_time")):
+            self.date_field_combo.addItem(text, field)
+
+        month_start, month_end = self._current_month_range()
+        self.date_from_edit = QDateEdit(month_start)
+        self.date_to_edit = QDateEdit(month_end)
+        for date_edit in (self.date_from_edit, self.date_to_edit):
+            date_edit.setObjectName("searchCombo")
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+            date_edit.setCalendarPopup(True)
 
         # 属性筛选下拉框（原有）
         self.prop_combo = QComboBox()
@@ -229,15 +392,22 @@ class TaskManager(QMainWindow):
         self.all_prop_date_search_btn.setObjectName("searchButton")
         self.all_prop_date_search_btn.clicked.connect(self.search_tasks_by_date_all_property)
 
-        combo_search_layout.addWidget(QLabel("年份："))
-        combo_search_layout.addWidget(self.year_combo)
-        combo_search_layout.addWidget(QLabel("月份："))
-        combo_search_layout.addWidget(self.month_combo)
+        # 组合条件查询：日期 + 已选属性 + 已填名称关键词
+        self.filter_search_btn = QPushButton("组合条件查询")
+        self.filter_search_btn.setObjectName("searchButton")
+        self.filter_search_btn.clicked.connect(self.search_tasks_by_filters)
+
+        combo_search_layout.addWidget(QLabel("日期："))
+        combo_search_layout.addWidget(self.date_field_combo)
+        combo_search_layout.addWidget(self.date_from_edit)
+        combo_search_layout.addWidget(QLabel("至"))
+        combo_search_layout.addWidget(self.date_to_edit)
         combo_search_layout.addWidget(QLabel("属性："))
         combo_search_layout.addWidget(self.prop_combo)
         combo_search_layout.addWidget(self.prop_only_search_btn)
         combo_search_layout.addWidget(self.prop_date_search_btn)
         combo_search_layout.addWidget(self.all_prop_date_search_btn)  # 新增按钮
+        combo_search_layout.addWidget(self.filter_search_btn)
         combo_search_layout.addStretch()
         search_layout.addLayout(combo_search_layout)
 
@@ -248,6 +418,14 @@ class TaskManager(QMainWindow):
         self.task_name_input = QLineEdit()
         self.task_name_input.setObjectName("nameSearchInput")
         self.task_name_input.setPlaceholderText("输入任务名称关键词检索...")
+        self.task_name_input.textChanged.connect(self.on_task_name_text_changed)
+        self.task_name_input.returnPressed.connect(self.search_tasks_by_name)
+
+        # 输入防抖：停止输入一段时间后才发起检索
+        self.name_search_timer = QTimer(self)
+        self.name_search_timer.setSingleShot(True)
+        self.name_search_timer.setInterval(250)
+        self.name_search_timer.timeout.connect(self.start_incremental_search)
 
         name_search_btn = QPushButton("名称检索")
         name_search_btn.setObjectName("searchButton")
@@ -266,67 +444,54 @@ class TaskManager(QMainWindow):
 
         layout.addLayout(search_layout)
 
-        # ------------------------------
-        # 4. 时间目录树（原有）
-        # ------------------------------
-        self.task_tree = QTreeWidget()
-        self.task_tree.setObjectName("taskTree")
-        self.task_tree.setHeaderLabel("时间目录")
-        self.task_tree.itemClicked.connect(self.on_tree_item_click)
-        layout.addWidget(self.task_tree)
-
-        # ------------------------------
-        # 5. 任务表格（含任务属性列，原有）
-        # ------------------------------
-        self.task_table = QTableWidget()
-        self.task_table.setObjectName("taskTable")
-        self.task_table.setColumnCount(12)  # 调整为12列
-        self.task_table.setHorizontalHeaderLabels([
-            "任务名称", "所属板块", "任务属性", "状态", "状态时间",
-            "预计启用时间", "任务目录", "设置目录", "跳转/复制", "操作按钮", "属性ID", "任务ID"
-        ])
-        # 行高/列宽设置
-        self.task_table.verticalHeader().setDefaultSectionSize(70)
-        self.task_table.verticalHeader().setMinimumSectionSize(50)
-        self.task_table.horizontalHeader().setSectionResizeMode(0, 1)
-        self.task_table.horizontalHeader().setSectionResizeMode(1, 1)
-        self.task_table.horizontalHeader().setSectionResizeMode(2, 1)
-        self.task_table.horizontalHeader().setSectionResizeMode(3, 1)
-        self.task_table.horizontalHeader().setSectionResizeMode(4, 1)
-        self.task_table.horizontalHeader().setSectionResizeMode(5, 1)
-        self.task_table.horizontalHeader().setSectionResizeMode(6, 1)
-        self.task_table.horizontalHeader().setSectionResizeMode(7, 0)
-        self.task_table.horizontalHeader().setSectionResizeMode(8, 0)
-        self.task_table.horizontalHeader().setSectionResizeMode(9, 0)
-        # 具体列宽
-        self.task_table.setColumnWidth(0, 100)
-        self.task_table.setColumnWidth(1, 100)
-        self.task_table.setColumnWidth(2, 120)  # 任务属性列
-        self.task_table.setColumnWidth(3, 120)
-        self.task_table.setColumnWidth(4, 200)
-        self.task_table.setColumnWidth(5, 200)
-        self.task_table.setColumnWidth(6, 200)
-        self.task_table.setColumnWidth(7, 150)
-        self.task_table.setColumnWidth(8, 150)
-        self.task_table.setColumnWidth(9, 150)  # 操作按钮列
-        self.task_table.hideColumn(10)  # 隐藏属性ID列
-        self.task_table.hideColumn(11)  # 隐藏任务ID列
-        self.task_table.setAlternatingRowColors(True)
-        # 任务表格右键菜单（新增更改属性）
-        self.task_table.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.task_table.customContextMenuRequested.connect(self.show_task_context_menu)
-        layout.addWidget(self.task_table)
-
-        # ------------------------------
-        # 6. 新建任务按钮（原有）
-        # ------------------------------
-        add_task_btn = QPushButton("+ 新建任务")
-        add_task_btn.setObjectName("addButton")
-        add_task_btn.clicked.connect(self.add_task)
-        layout.addWidget(add_task_btn)
+        # 边输入边检索的后台线程随查询面板一起创建：后台线程持有独立连接
+        self.name_search_worker = NameSearchWorker(self.db.db_name, self.db.profile, self, tracer=self.tracer)
+        self.name_search_worker.results_ready.connect(self.show_incremental_search_results)
+        self.name_search_worker.start()
 
         return panel
 
+    def toggle_property_panel(self, checked: bool) -> None:
+        if self.property_panel is None:
+            self.property_panel = self._create_property_panel()
+            self.lazy_panel_layout.insertWidget(0, self.property_panel)
+            self.load_property_combo_data()
+        self.property_panel.setVisible(checked)
+
+    def toggle_search_panel(self, checked: bool) -> None:
+        if self.search_panel is None:
+            self.search_panel = self._create_search_panel()
+            self.lazy_panel_layout.addWidget(self.search_panel)
+            self.load_property_combo_data()
+        self.search_panel.setVisible(checked)
+
+    @staticmethod
+    def _current_month_range() -> Tuple[QDate, QDate]:
+        """本月的第一天和最后一天：查询面板日期控件的默认值"""
+        today = QDate.currentDate()
+        return QDate(today.year(), today.month(), 1), QDate(today.year(), today.month(), today.daysInMonth())
+
+    def show_stats_dialog(self) -> None:
+        """统计面板：第一次打开时才创建，之后保留筛选条件"""
+        if self.stats_dialog is None:
+            self.stats_dialog = StatsDialog(self.db, self)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+        self.stats_dialog.refresh()
+
+    def show_diagnostics_dialog(self) -> None:
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self.tracer, self.db, self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+        self.diagnostics_dialog.refresh()
+
+    def trace_span(self, name: str) -> Callable[[], object]:
+        """开始计时一个界面操作，返回结束计时的函数（未开启性能追踪时什么也不做）"""
+        if self.tracer is None:
+            return lambda: None
+        return self.tracer.start_span(name)
+
     def set_style(self):
         """全局样式（不变）"""
         self.setStyleSheet("""
@@ -499,82 +664,82 @@ class TaskManager(QMainWindow):
     # ------------------------------
     # 新增功能：操作按钮右键切换功能
     # ------------------------------
-    def show_operation_menu(self, button):
+    def show_operation_menu(self, task_id: int, global_pos: QPoint) -> None:
         """显示操作按钮的右键菜单"""
         menu = QMenu(self)
 
-        update_status_action = QAction("修改状态", menu)
-        update_status_action.triggered.connect(
-            lambda: self.switch_operation_function(button, "update_status", "修改状态"))
-
-        rename_action = QAction("重命名", menu)
-        rename_action.triggered.connect(lambda: self.switch_operation_function(button, "rename", "重命名"))
-
-        delete_action = QAction("删除任务", menu)
-        delete_action.triggered.connect(lambda: self.switch_operation_function(button, "delete", "删除任务"))
-
-        menu.addAction(update_status_action)
-        menu.addAction(rename_action)
-        menu.addAction(delete_action)
+        for function, (display_text, _) in OPERATIONS.items():
+            action = QAction(display_text, menu)
+            action.triggered.connect(lambda checked, f=function: self.switch_operation_function(task_id, f))
+            menu.addAction(action)
 
         # 在按钮位置显示菜单
-        global_pos = button.mapToGlobal(QPoint(0, button.height()))
         menu.exec_(global_pos)
 
-    def switch_operation_function(self, button, function, display_text):
-        """切换操作按钮的功能"""
-        button.setText(display_text)
-        button.setProperty("current_function", function)
-
-        # 根据功能设置按钮颜色
-        if function == "update_status":
-            button.setStyleSheet("")  # 默认颜色
-        elif function == "rename":
-            button.setStyleSheet("background-color: #f39c12;")  # 橙色
-        elif function == "delete":
-            button.setStyleSheet("background-color: #e74c3c;")  # 红色
+    def switch_operation_function(self, task_id: int, function: str) -> None:
+        """切换操作按钮的功能（文本与颜色由按钮代理根据功能绘制）"""
+        self.task_model.set_operation(task_id, function)
 
-    def execute_current_operation(self, task_id, task_name):
+    def execute_current_operation(self, task_id: int) -> None:
         """执行当前选定的操作"""
-        # 获取当前按钮
-        button = self.sender()
-        if not button:
-            return
-
-        current_function = button.property("current_function")
+        current_function = self.task_model.operation(task_id)
 
         if current_function == "update_status":
             self.update_task_status(task_id)
         elif current_function == "rename":
-            self.rename_task(task_id, task_name)
+            self.rename_task(task_id)
         elif current_function == "delete":
             self.delete_task(task_id)
 
+    def on_task_button_clicked(self, row: int, column: int) -> None:
+        """任务表格按钮列的左键点击"""
+        task = self.task_model.task_at(row)
+        if not task:
+            return
+        task_id, link_mode = task.id, task.link_mode
+
+        if column == COL_SET:
+            if link_mode == 0:  # 目录模式
+                self.set_task_dir(task_id)
+            else:  # 链接模式
+                self.set_task_link(task_id)
+        elif column == COL_JUMP:
+            if link_mode == 0:  # 目录模式
+                self.jump_to_dir(task_id)
+            else:  # 链接模式
+                self.copy_task_link(task_id)
+        elif column == COL_OPERATION:
+            self.execute_current_operation(task_id)
+
     # ------------------------------
     # 核心功能1：属性管理（原有，不变）
     # ------------------------------
     def load_property_combo_data(self) -> None:
         """加载属性数据到下拉框和属性管理表格"""
-        # 1. 清空原有数据
-        self.prop_combo.clear()
+        self.db.call("get_all_properties", on_result=self._fill_property_combo_data)
+
+    def _fill_property_combo_data(self, properties: List[Tuple[int, str, int]]) -> None:
+        # 只填充已创建的面板
+        if self.prop_combo is not None:
+            self.prop_combo.clear()
+            # 属性筛选下拉框（格式：属性名（默认/自定义））
+            for prop_id, prop_name, is_default in properties:
+                suffix = "(默认)" if is_default == 1 else "(自定义)"
+                self.prop_combo.addItem(f"{prop_name} {suffix}", prop_id)
+
+        if self.prop_table is None:
+            return
         self.prop_table.setRowCount(0)
-
-        # 2. 获取所有属性
-        properties = self.db.get_all_properties()
         for prop_id, prop_name, is_default in properties:
-            # 2.1 填充属性筛选下拉框（格式：属性名（默认/自定义））
-            suffix = "(默认)" if is_default == 1 else "(自定义)"
-            self.prop_combo.addItem(f"{prop_name} {suffix}", prop_id)
-
-            # 2.2 填充属性管理表格
+            # 填充属性管理表格
             row = self.prop_table.rowCount()
             self.prop_table.insertRow(row)
-            # 2.2.1 属性名称列（默认属性标红）
+            # 属性名称列（默认属性标红）
             name_item = QTableWidgetItem(prop_name)
             if is_default == 1:
                 name_item.setForeground(QColor(231, 76, 60))  # 红色标注默认属性
             self.prop_table.setItem(row, 0, name_item)
-            # 2.2.2 操作列（默认属性无删除按钮）
+            # 操作列（默认属性无删除按钮）
             if is_default == 0:
                 delete_btn = QPushButton("删除")
                 delete_btn.setObjectName("propDeleteBtn")
@@ -590,17 +755,23 @@ class TaskManager(QMainWindow):
             QMessageBox.warning(self, "提示", "属性名称不能为空！")
             return
 
+        def on_added(success: bool) -> None:
+            if success:
+                QMessageBox.information(self, "成功", f"自定义属性「{prop_name}」已添加！")
+                self.custom_prop_input.clear()
+                self.load_property_combo_data()  # 刷新属性列表
+            else:
+                QMessageBox.warning(self, "失败", f"属性「{prop_name}」已存在！")
+
         # 调用数据库方法新增属性
-        if self.db.add_custom_property(prop_name):
-            QMessageBox.information(self, "成功", f"自定义属性「{prop_name}」已添加！")
-            self.custom_prop_input.clear()
-            self.load_property_combo_data()  # 刷新属性列表
-        else:
-            QMessageBox.warning(self, "失败", f"属性「{prop_name}」已存在！")
+        self.db.call("add_custom_property", prop_name, on_result=on_added)
 
     def delete_property(self, prop_id: int) -> None:
         """删除属性（触发数据库逻辑）"""
-        task_count, success = self.db.delete_property(prop_id)
+        self.db.call("delete_property", prop_id, on_result=self._on_property_deleted)
+
+    def _on_property_deleted(self, result: Tuple[int, bool]) -> None:
+        task_count, success = result
         if not success:
             QMessageBox.warning(self, "提示", "默认属性不可删除！")
             return
@@ -623,17 +794,36 @@ class TaskManager(QMainWindow):
     # ------------------------------
     def show_task_context_menu(self, position) -> None:
         """任务表格右键菜单（新增"更改属性"和"切换模式"）"""
-        # 获取当前选中行
-        selected_items = self.task_table.selectedItems()
-        if not selected_items:
+        # 获取右键所在行
+        index = self.task_table.indexAt(position)
+        task = self.task_model.task_at(index.row()) if index.isValid() else None
+        if not task:
             return
-        current_row = selected_items[0].row()
 
         # 获取当前任务的属性ID、任务ID和模式
-        prop_id = int(self.task_table.item(current_row, 10).text())
-        task_id = int(self.task_table.item(current_row, 11).text())
-        link_mode_item = self.task_table.item(current_row, 9)
-        link_mode = int(link_mode_item.text()) if link_mode_item and link_mode_item.text().isdigit() else 0
+        task_id, prop_id, link_mode = task.id, task.property_id, task.link_mode
+        global_pos = self.task_table.viewport().mapToGlobal(position)
+
+        # 按钮列的右键功能
+        if index.column() == COL_SET:
+            # 右键菜单用于切换模式
+            self.switch_task_mode(task_id, link_mode)
+            return
+        if index.column() == COL_JUMP:
+            # 右键菜单用于跳转链接（仅链接模式）
+            if link_mode == 1:
+                self.jump_to_link(task_id)
+            return
+        if index.column() == COL_OPERATION:
+            # 右键点击切换功能
+            self.show_operation_menu(task_id, global_pos)
+            return
+
+        # 右键位于多选范围内时显示批量操作菜单
+        task_ids = self.selected_task_ids()
+        if len(task_ids) > 1 and task_id in task_ids:
+            self.show_bulk_task_menu(task_ids, global_pos)
+            return
 
         # 创建右键菜单
         context_menu = QMenu(self.task_table)
@@ -648,13 +838,105 @@ class TaskManager(QMainWindow):
         context_menu.addAction(change_mode_action)
 
         # 显示菜单
-        global_pos = self.task_table.mapToGlobal(position)
         context_menu.exec_(global_pos)
 
+    # ------------------------------
+    # 批量操作（多选任务，一次事务提交，只刷新一次）
+    # ------------------------------
+    def selected_task_ids(self) -> List[int]:
+        """当前选中行的任务ID（按行顺序）"""
+        rows = sorted(index.row() for index in self.task_table.selectionModel().selectedRows())
+        return [self.task_model.task_at(row).id for row in rows]
+
+    def show_bulk_task_menu(self, task_ids: List[int], global_pos: QPoint) -> None:
+        """批量操作右键菜单"""
+        count = len(task_ids)
+        menu = QMenu(self.task_table)
+
+        status_action = QAction(f"批量修改状态（{count}个任务）", menu)
+        status_action.triggered.connect(lambda: self.bulk_update_status(task_ids))
+        menu.addAction(status_action)
+
+        prop_action = QAction(f"批量更改属性（{count}个任务）", menu)
+        prop_action.triggered.connect(lambda: self.bulk_change_property(task_ids))
+        menu.addAction(prop_action)
+
+        mode_action = QAction(f"批量切换模式（{count}个任务）", menu)
+        mode_action.triggered.connect(lambda: self.bulk_switch_mode(task_ids))
+        menu.addAction(mode_action)
+
+        delete_action = QAction(f"批量删除（{count}个任务）", menu)
+        delete_action.triggered.connect(lambda: self.bulk_delete_tasks(task_ids))
+        menu.addAction(delete_action)
+
+        menu.exec_(global_pos)
+
+    def bulk_update_status(self, task_ids: List[int]) -> None:
+        statuses = ["待启用", "初开启", "已完成"]
+        new_status, ok = QInputDialog.getItem(
+            self, "批量修改状态", f"将 {len(task_ids)} 个任务的状态改为：", statuses, 0, False)
+        if ok:
+            self.db.call("update_tasks_status", task_ids, new_status,
+                         on_result=lambda count: self._on_bulk_updated(f"已修改 {count} 个任务的状态"))
+
+    def bulk_change_property(self, task_ids: List[int]) -> None:
+        self.db.call("get_all_properties",
+                     on_result=lambda properties: self._choose_bulk_property(task_ids, properties))
+
+    def _choose_bulk_property(self, task_ids: List[int], properties: List[Tuple[int, str, int]]) -> None:
+        prop_options = [f"{p[1]} {'(默认)' if p[2] == 1 else '(自定义)'}" for p in properties]
+        prop_ids = [p[0] for p in properties]
+        prop_text, ok = QInputDialog.getItem(
+            self, "批量更改属性", f"将 {len(task_ids)} 个任务的属性改为：", prop_options, 0, False)
+        if ok:
+            new_prop_id = prop_ids[prop_options.index(prop_text)]
+            self.db.call("update_tasks_property", task_ids, new_prop_id,
+                         on_result=lambda count: self._on_bulk_updated(f"已更改 {count} 个任务的属性"))
+
+    def bulk_switch_mode(self, task_ids: List[int]) -> None:
+        modes = ["目录模式", "链接模式"]
+        mode_choice, ok = QInputDialog.getItem(
+            self, "批量切换模式", f"将 {len(task_ids)} 个任务切换到：", modes, 0, False)
+        if ok:
+            link_mode = modes.index(mode_choice)
+            self.db.call("update_tasks_link_mode", task_ids, link_mode,
+                         on_result=lambda count: self._on_bulk_updated(f"已将 {count} 个任务切换到{mode_choice}"))
+
+    def bulk_delete_tasks(self, task_ids: List[int]) -> None:
+        confirm = QMessageBox.question(
+            self,
+            "确认删除",
+            f"确定删除选中的 {len(task_ids)} 个任务吗？删除后不可恢复！",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if confirm == QMessageBox.Yes:
+            self.db.call("delete_tasks", task_ids, on_result=self._on_bulk_deleted)
+
+    def _on_bulk_updated(self, msg: str) -> None:
+        self.refresh_task_view()
+        QMessageBox.information(self, "成功", msg)
+
+    def _on_bulk_deleted(self, count: int) -> None:
+        QMessageBox.information(self, "成功", f"已删除 {count} 个任务！")
+        self.safe_refresh_after_delete()
+
+    def refresh_task_view(self) -> None:
+        """重新加载任务表格当前显示的内容（当前月份或按时间查询）"""
+        if self.current_board_id and self.task_tree.currentItem():
+            data = self.task_tree.currentItem().data(0, Qt.UserRole)
+            if data and data[0] == "month":
+                self.load_tasks_by_month(data[1], data[2])
+        else:
+            self.search_tasks_by_time_status()
+
     def change_task_property(self, task_id: int, current_prop_id: int) -> None:
         """更改任务属性（弹窗选择新属性）"""
-        # 1. 获取所有属性，生成选项列表
-        properties = self.db.get_all_properties()
+        self.db.call("get_all_properties",
+                     on_result=lambda properties: self._choose_task_property(task_id, current_prop_id, properties))
+
+    def _choose_task_property(self, task_id: int, current_prop_id: int,
+                              properties: List[Tuple[int, str, int]]) -> None:
+        # 1. 根据所有属性生成选项列表
         prop_options = []
         prop_ids = []
         current_index = 0
@@ -681,16 +963,12 @@ class TaskManager(QMainWindow):
         # 3. 获取新属性ID并更新
         new_prop_index = prop_options.index(new_prop_text)
         new_prop_id = prop_ids[new_prop_index]
-        self.db.update_task_property(task_id, new_prop_id)
+        self.db.call("update_task_property", task_id, new_prop_id, on_result=self._on_task_property_updated)
 
-        # 4. 刷新任务表格
+    def _on_task_property_updated(self, task) -> None:
+        # 4. 只刷新该任务所在行
+        self.task_model.update_task(task)
         QMessageBox.information(self, "成功", "任务属性已更新！")
-        if self.current_board_id and self.task_tree.currentItem():
-            data = self.task_tree.currentItem().data(0, Qt.UserRole)
-            if data and data[0] == "month":
-                self.load_tasks_by_month(data[1], data[2])
-        else:
-            self.search_tasks_by_time_status()
 
     # ------------------------------
     # 新增功能1：模式查询功能
@@ -704,14 +982,18 @@ class TaskManager(QMainWindow):
             mode = 1
             mode_name = "链接模式"
 
-        results = self.db.get_tasks_by_link_mode(mode)
-        if not results:
+        # 先统计数量，再分页加载结果
+        self.query_tasks("count_tasks_by_link_mode", mode,
+                         on_result=lambda count: self._show_mode_results(mode, mode_name, count))
+
+    def _show_mode_results(self, mode: int, mode_name: str, count: int) -> None:
+        if not count:
             QMessageBox.information(self, "结果", f"未找到{mode_name}任务")
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
             return
 
-        self.show_search_results(results)
-        QMessageBox.information(self, "查询结果", f"找到 {len(results)} 个{mode_name}任务")
+        self.show_paged_results("get_tasks_by_link_mode_page", mode)
+        QMessageBox.information(self, "查询结果", f"找到 {count} 个{mode_name}任务")
 
     def switch_query_mode(self) -> None:
         """切换查询模式"""
@@ -738,38 +1020,45 @@ class TaskManager(QMainWindow):
         )
 
         if confirm == QMessageBox.Yes:
-            self.db.update_task_link_mode(task_id, new_mode)
-            # 刷新显示
-            if self.current_board_id and self.task_tree.currentItem():
-                data = self.task_tree.currentItem().data(0, Qt.UserRole)
-                if data and data[0] == "month":
-                    self.load_tasks_by_month(data[1], data[2])
-            QMessageBox.information(self, "成功", f"任务已切换到{mode_name}")
+            self.db.call("update_task_link_mode", task_id, new_mode,
+                         on_result=lambda task: self._on_task_mode_switched(task, mode_name))
+
+    def _on_task_mode_switched(self, task, mode_name: str) -> None:
+        # 只刷新该任务所在行
+        self.task_model.update_task(task)
+        QMessageBox.information(self, "成功", f"任务已切换到{mode_name}")
 
     # ------------------------------
     # 新增功能3：链接相关操作
     # ------------------------------
     def set_task_link(self, task_id: int) -> None:
         """设置任务链接"""
-        current_link = self.db.get_task_link_url(task_id)
+        self.db.call("get_task", task_id, on_result=self._edit_task_link)
+
+    def _edit_task_link(self, task) -> None:
+        if not task:
+            QMessageBox.warning(self, "提示", "任务不存在！")
+            return
         new_link, ok = QInputDialog.getText(
             self,
             "设置链接",
             "请输入任务链接：",
-            text=current_link or ""
+            text=task.link_url or ""
         )
         if ok and new_link.strip():
-            self.db.update_task_link_url(task_id, new_link.strip())
-            # 刷新显示
-            if self.current_board_id and self.task_tree.currentItem():
-                data = self.task_tree.currentItem().data(0, Qt.UserRole)
-                if data and data[0] == "month":
-                    self.load_tasks_by_month(data[1], data[2])
-            QMessageBox.information(self, "成功", "链接已更新")
+            self.db.call("update_task_link_url", task.id, new_link.strip(), on_result=self._on_task_link_updated)
+
+    def _on_task_link_updated(self, task) -> None:
+        # 只刷新该任务所在行
+        self.task_model.update_task(task)
+        QMessageBox.information(self, "成功", "链接已更新")
 
     def copy_task_link(self, task_id: int) -> None:
         """复制任务链接到剪贴板"""
-        link = self.db.get_task_link_url(task_id)
+        self.db.call("get_task", task_id, on_result=self._copy_task_link)
+
+    def _copy_task_link(self, task) -> None:
+        link = task.link_url if task else None
         if link:
             QApplication.clipboard().setText(link)
             QMessageBox.information(self, "成功", "链接已复制到剪贴板")
@@ -778,7 +1067,10 @@ class TaskManager(QMainWindow):
 
     def jump_to_link(self, task_id: int) -> None:
         """跳转到任务链接"""
-        link = self.db.get_task_link_url(task_id)
+        self.db.call("get_task", task_id, on_result=self._open_task_link)
+
+    def _open_task_link(self, task) -> None:
+        link = task.link_url if task else None
         if link:
             try:
                 webbrowser.open(link)
@@ -798,90 +1090,178 @@ class TaskManager(QMainWindow):
 
         # 获取选中的属性ID
         prop_id = self.prop_combo.currentData()
-        prop_name = self.db.get_property_name_by_id(prop_id)
+        prop_name = self.prop_combo.currentText().rsplit(" ", 1)[0]
 
         # 查询任务
-        results = self.db.get_tasks_by_property(prop_id)
-        if not results:
+        self.query_tasks("count_tasks_by_property", prop_id,
+                         on_result=lambda count: self._show_property_results(prop_id, prop_name, count))
+
+    def _show_property_results(self, prop_id: int, prop_name: str, count: int) -> None:
+        if not count:
             QMessageBox.information(self, "结果", f"未找到属性为「{prop_name}」的任务")
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
             return
 
-        # 显示结果
-        self.show_search_results(results)
-        QMessageBox.information(self, "结果", f"找到 {len(results)} 个属性为「{prop_name}」的任务")
+        # 分页显示结果
+        self.show_paged_results("get_tasks_by_property_page", prop_id)
+        QMessageBox.information(self, "结果", f"找到 {count} 个属性为「{prop_name}」的任务")
+
+    def _date_range_query(self, **conditions) -> Optional[Tuple[TaskQuery, str]]:
+        """由日期区间控件生成查询条件，返回 (查询条件, 区间描述)；起始日期晚于结束日期时提示并返回None
+        conditions：日期以外的其他筛选条件
+        查询面板尚未打开时（批量操作后刷新等）按面板的默认值：本月、按所属年月筛选，不为此创建面板
+        """
+        if self.search_panel is None:
+            date_from, date_to = self._current_month_range()
+            field = "month"
+        else:
+            date_from, date_to = self.date_from_edit.date(), self.date_to_edit.date()
+            field = self.date_field_combo.currentData()
+        if date_from > date_to:
+            QMessageBox.warning(self, "提示", "起始日期不能晚于结束日期！")
+            return None
+
+        if field == "month":
+            ym_from = (date_from.year(), date_from.month())
+            ym_to = (date_to.year(), date_to.month())
+            conditions.update(year_month_from=ym_from, year_month_to=ym_to)
+            label = f"{ym_from[0]}年{ym_from[1]}月"
+            if ym_to != ym_from:
+                label += f"至{ym_to[0]}年{ym_to[1]}月"
+        else:
+            start, end = date_from.toString("yyyy-MM-dd"), date_to.toString("yyyy-MM-dd")
+            if field == "status_time":
+                conditions.update(status_time_from=start, status_time_to=end)
+            else:
+                conditions.update(expected_from=start, expected_to=end)
+            label = f"{self.date_field_combo.currentText()}{start}至{end}"
+        return TaskQuery(**conditions), label
 
     def search_tasks_by_date_and_property(self) -> None:
-        """按日期（年/月）+ 指定属性查询"""
+        """按日期区间 + 指定属性查询"""
         if self.prop_combo.currentIndex() == -1:
             QMessageBox.warning(self, "提示", "请先选择属性！")
             return
 
         # 获取筛选条件
-        year = int(self.year_combo.currentText())
-        month = int(self.month_combo.currentText())
         prop_id = self.prop_combo.currentData()
-        prop_name = self.db.get_property_name_by_id(prop_id)
+        prop_name = self.prop_combo.currentText().rsplit(" ", 1)[0]
+        range_query = self._date_range_query(property_ids=(prop_id,))
+        if range_query is None:
+            return
+        query, label = range_query
 
-        # 查询任务
-        results = self.db.get_tasks_by_date_and_property(year, month, prop_id)
+        # 查询任务（整个区间一次查询）
+        self.query_tasks("find_tasks", query,
+                         on_result=lambda results: self._show_date_property_results(label, prop_name, results))
+
+    def _show_date_property_results(self, label: str, prop_name: str, results: List[TaskRecord]) -> None:
         if not results:
-            msg = f"未找到 {year}年{month}月 属性为「{prop_name}」的任务"
+            msg = f"未找到 {label} 属性为「{prop_name}」的任务"
             QMessageBox.information(self, "结果", msg)
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
             return
 
         # 显示结果
         self.show_search_results(results)
-        msg = f"找到 {year}年{month}月 共 {len(results)} 个属性为「{prop_name}」的任务"
+        msg = f"找到 {label} 共 {len(results)} 个属性为「{prop_name}」的任务"
         QMessageBox.information(self, "结果", msg)
 
     def search_tasks_by_date_all_property(self) -> None:
-        """新增：按日期（年/月）+ 全属性查询（查询指定日期下所有属性的任务）"""
-        # 获取筛选条件（仅年份和月份，不限制属性）
-        year = int(self.year_combo.currentText())
-        month = int(self.month_combo.currentText())
+        """新增：按日期区间 + 全属性查询（查询指定日期区间内所有属性的任务）"""
+        # 获取筛选条件（仅日期区间，不限制属性）
+        range_query = self._date_range_query()
+        if range_query is None:
+            return
+        query, label = range_query
 
-        # 调用数据库方法查询（复用原有按时间查询逻辑，不传递属性ID即查所有属性）
-        results = self.db.get_tasks_by_time_status(year=year, month=month, status=None)
-        if not results:
-            msg = f"未找到 {year}年{month}月 的任何任务"
+        # 各属性的任务数由数据库分组统计，任务列表分页显示
+        self.db.call("task_statistics", query, ("property",),
+                     on_result=lambda stats: self._show_date_all_property_results(query, label, stats))
+
+    def _show_date_all_property_results(self, query: TaskQuery, label: str, stats: List[TaskStats]) -> None:
+        if not stats:
+            msg = f"未找到 {label} 的任何任务"
             QMessageBox.information(self, "结果", msg)
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
             return
 
-        # 统计各属性的任务数量（增强用户体验）
-        prop_count = {}
-        for task in results:
-            prop_name = task[11]  # 结果元组中第11位是属性名称
-            prop_count[prop_name] = prop_count.get(prop_name, 0) + 1
-
         # 生成统计信息
-        count_msg = f"{year}年{month}月 任务统计：\n"
-        for prop, count in prop_count.items():
-            count_msg += f"- {prop}：{count}个\n"
-        count_msg += f"总计：{len(results)}个任务"
+        count_msg = f"{label} 任务统计：\n"
+        for row in stats:
+            count_msg += f"- {row.labels[0]}：{row.total}个\n"
+        count_msg += f"总计：{sum(row.total for row in stats)}个任务"
 
         # 显示结果
-        self.show_search_results(results)
+        self.show_paged_results("find_tasks", query)
         QMessageBox.information(self, "结果", count_msg)
 
+    def search_tasks_by_filters(self) -> None:
+        """组合条件查询：日期区间必选，属性和名称关键词填写了才参与筛选"""
+        prop_ids = (self.prop_combo.currentData(),) if self.prop_combo.currentIndex() != -1 else ()
+        task_name = self.task_name_input.text().strip() or None
+        range_query = self._date_range_query(property_ids=prop_ids, name=task_name)
+        if range_query is None:
+            return
+        query = range_query[0]
+
+        self.query_tasks("count_tasks", query, on_result=lambda count: self._show_filter_results(query, count))
+
+    def _show_filter_results(self, query: TaskQuery, count: int) -> None:
+        if not count:
+            QMessageBox.information(self, "结果", "未找到符合条件的任务")
+            self.task_model.clear()
+            return
+
+        self.show_paged_results("find_tasks", query)
+        QMessageBox.information(self, "结果", f"找到 {count} 个符合条件的任务")
+
     def search_tasks_by_name(self) -> None:
         """按任务名称模糊检索（原有，不变）"""
+        # 完整检索取代尚未返回的边输入边检索结果
+        self.name_search_timer.stop()
+        self.name_search_worker.cancel()
         task_name = self.task_name_input.text().strip()
         if not task_name:
             QMessageBox.warning(self, "提示", "请输入任务名称关键词！")
             return
 
-        results = self.db.search_tasks_by_name(task_name)
+        self.query_tasks("search_tasks_by_name", task_name,
+                         on_result=lambda results: self._show_name_results(task_name, results))
+
+    def _show_name_results(self, task_name: str, results: List[TaskRecord]) -> None:
         if not results:
             QMessageBox.information(self, "结果", f"未找到包含「{task_name}」的任务")
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
             return
 
         self.show_search_results(results)
         QMessageBox.information(self, "结果", f"找到{len(results)}条包含「{task_name}」的任务")
 
+    def on_task_name_text_changed(self, text: str) -> None:
+        """名称输入变化时重新计时（防抖）"""
+        if text.strip():
+            self.name_search_timer.start()
+        else:
+            self.name_search_timer.stop()
+
+    def start_incremental_search(self) -> None:
+        """提交后台检索，旧的未完成查询会被中断"""
+        task_name = self.task_name_input.text().strip()
+        if task_name:
+            self.name_search_worker.search(task_name)
+
+    def show_incremental_search_results(self, seq: int, task_name: str, results: list) -> None:
+        """显示后台检索的首页结果（不弹窗，过期结果直接丢弃）"""
+        if task_name != self.task_name_input.text().strip():
+            return
+        self.show_search_results(results)
+        if len(results) >= NameSearchWorker.PAGE_SIZE:
+            msg = f"显示包含「{task_name}」的前 {len(results)} 条任务，按回车或点击\"名称检索\"查看全部"
+        else:
+            msg = f"找到{len(results)}条包含「{task_name}」的任务"
+        self.statusBar().showMessage(msg, 5000)
+
     # ------------------------------
     # 核心功能4：修复删除任务闪退（关键修改）
     # ------------------------------
@@ -889,7 +1269,7 @@ class TaskManager(QMainWindow):
         """安全刷新界面（删除任务后调用）"""
         try:
             # 清空表格避免数据不一致
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
 
             # 重新加载时间目录树
             if self.current_board_id:
@@ -907,7 +1287,7 @@ class TaskManager(QMainWindow):
         except Exception as e:
             print(f"刷新异常: {e}")
             # 异常时的降级处理
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
 
     def delete_task(self, task_id: int) -> None:
         """删除任务（修复空指针访问，避免闪退）"""
@@ -919,11 +1299,13 @@ class TaskManager(QMainWindow):
         )
 
         if confirm == QMessageBox.Yes:
-            self.db.delete_task(task_id)
-            QMessageBox.information(self, "成功", "任务已删除！")
+            self.db.call("delete_task", task_id, on_result=self._on_task_deleted)
 
-            # 使用安全刷新方法
-            self.safe_refresh_after_delete()
+    def _on_task_deleted(self, _) -> None:
+        QMessageBox.information(self, "成功", "任务已删除！")
+
+        # 使用安全刷新方法
+        self.safe_refresh_after_delete()
 
     # ------------------------------
     # 原有功能（适配修复与新增功能，不变）
@@ -963,7 +1345,11 @@ class TaskManager(QMainWindow):
             QMessageBox.warning(self, "提示", "板块名称不能为空！")
             return
 
-        if self.db.update_board_name(board_id, new_name):
+        self.db.call("update_board_name", board_id, new_name,
+                     on_result=lambda success: self._on_board_renamed(item, board_id, new_name, success))
+
+    def _on_board_renamed(self, item, board_id: int, new_name: str, success: bool) -> None:
+        if success:
             item.setText(new_name)
             self.current_board_name = new_name
             QMessageBox.information(self, "成功", f"板块已重命名为「{new_name}」")
@@ -985,27 +1371,40 @@ class TaskManager(QMainWindow):
         )
 
         if confirm == QMessageBox.Yes:
-            self.db.delete_board(board_id)
-            self.load_boards()
-            self.task_tree.clear()
-            self.task_table.setRowCount(0)
+            self.db.call("delete_board", board_id, on_result=lambda _: self._on_board_deleted(board_id))
+
+    def _on_board_deleted(self, board_id: int) -> None:
+        self.load_boards()
+        if self.current_board_id == board_id:
+            self.current_board_id = None
+            self.current_board_name = ""
+        self.task_tree.clear()
+        self.task_model.clear()
 
     def load_boards(self) -> None:
+        self.db.call("get_all_boards", on_result=self._fill_boards)
+
+    def _fill_boards(self, boards: List[Tuple[int, str]]) -> None:
         self.board_list.clear()
-        boards = self.db.get_all_boards()
         for board_id, name in boards:
             item = QListWidgetItem(name)
             item.setData(Qt.UserRole, board_id)
             self.board_list.addItem(item)
+        if self.startup_timer.get("boards_loaded") is None:
+            self.startup_timer.mark("boards_loaded")
+            self.startup_finished.emit()
 
     def add_board(self) -> None:
         name, ok = QInputDialog.getText(self, "新建板块", "请输入板块名称：")
         if ok and name.strip():
-            if self.db.add_board(name.strip()):
-                QMessageBox.information(self, "成功", f"板块「{name}」创建成功")
-                self.load_boards()
-            else:
-                QMessageBox.warning(self, "失败", "该板块名称已存在！")
+            self.db.call("add_board", name.strip(), on_result=lambda success: self._on_board_added(name, success))
+
+    def _on_board_added(self, name: str, success: bool) -> None:
+        if success:
+            QMessageBox.information(self, "成功", f"板块「{name}」创建成功")
+            self.load_boards()
+        else:
+            QMessageBox.warning(self, "失败", "该板块名称已存在！")
 
     def on_board_click(self, item) -> None:
         self.current_board_id = item.data(Qt.UserRole)
@@ -1013,19 +1412,27 @@ class TaskManager(QMainWindow):
         self.load_time_tree()
 
     def load_time_tree(self) -> None:
-        self.task_tree.clear()
         if not self.current_board_id:
+            self.task_tree.clear()
             return
+        board_id = self.current_board_id
+        self.db.call("get_board_year_months", board_id,
+                     on_result=lambda year_months: self._fill_time_tree(board_id, year_months))
+
+    def _fill_time_tree(self, board_id: int, year_months: List[Tuple[int, int, int]]) -> None:
+        if board_id != self.current_board_id:
+            return  # 结果返回前已切换到其他板块
+        self.task_tree.clear()
 
-        tasks = self.db.get_tasks_by_board(self.current_board_id)
-        existing_year_month = set((task[1], task[2]) for task in tasks)
+        # (年, 月) -> 任务数，由数据库分组统计
+        month_counts = {(year, month): count for year, month, count in year_months}
         current_date = datetime.now()
         current_year = current_date.year
         current_month = current_date.month
-        existing_year_month.add((current_year, current_month))
+        month_counts.setdefault((current_year, current_month), 0)
 
         year_items = {}
-        sorted_year_month = sorted(existing_year_month, key=lambda x: (-x[0], -x[1]))
+        sorted_year_month = sorted(month_counts, key=lambda x: (-x[0], -x[1]))
 
         for year, month in sorted_year_month:
             if year not in year_items:
@@ -1033,7 +1440,7 @@ class TaskManager(QMainWindow):
                 year_item.setData(0, Qt.UserRole, ("year", year))
                 self.task_tree.addTopLevelItem(year_item)
                 year_items[year] = year_item
-            month_item = QTreeWidgetItem([f"{month}月"])
+            month_item = QTreeWidgetItem([f"{month}月（{month_counts[(year, month)]}）"])
             month_item.setData(0, Qt.UserRole, ("month", year, month))
             year_items[year].addChild(month_item)
 
@@ -1052,80 +1459,16 @@ class TaskManager(QMainWindow):
         """加载指定月份任务（含属性列和模式列）"""
         if not self.current_board_id:
             return
-        tasks = self.db.get_tasks_by_board(self.current_board_id)
-        filtered = [t for t in tasks if t[1] == year and t[2] == month]
-
-        self.task_table.setRowCount(len(filtered))
-        for row, task in enumerate(filtered):
-            # 任务元组：(id, year, month, name, status, status_time, expected_time, task_dir, property_id, property_name, link_mode, link_url)
-            task_id, y, m, name, status, status_time, expected_time, task_dir, prop_id, prop_name, link_mode, link_url = task
-
-            # 0-6列：基础信息（新增任务属性列）
-            self.task_table.setItem(row, 0, QTableWidgetItem(name))
-            self.task_table.setItem(row, 1, QTableWidgetItem(self.current_board_name))
-            self.task_table.setItem(row, 2, QTableWidgetItem(prop_name))  # 任务属性列
-            self.task_table.setItem(row, 3, QTableWidgetItem(status))
-            self.task_table.setItem(row, 4, QTableWidgetItem(status_time.split('.')[0]))
-            self.task_table.setItem(row, 5, QTableWidgetItem(expected_time or "-"))
-
-            # 第6列：根据模式显示目录或链接
-            if link_mode == 0:  # 目录模式
-                self.task_table.setItem(row, 6, QTableWidgetItem(task_dir or "未设置"))
-            else:  # 链接模式
-                self.task_table.setItem(row, 6, QTableWidgetItem(link_url or "未设置"))
-
-            # 第7列：设置按钮（根据模式显示不同文本和功能）
-            if link_mode == 0:  # 目录模式
-                set_btn = QPushButton("设置目录")
-                set_btn.setObjectName("actionButton")
-                set_btn.clicked.connect(lambda checked, tid=task_id: self.set_task_dir(tid))
-                # 右键菜单用于切换模式
-                set_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                set_btn.customContextMenuRequested.connect(lambda pos, tid=task_id: self.switch_task_mode(tid, 0))
-            else:  # 链接模式
-                set_btn = QPushButton("设置链接")
-                set_btn.setObjectName("actionButton")
-                set_btn.clicked.connect(lambda checked, tid=task_id: self.set_task_link(tid))
-                # 右键菜单用于切换模式
-                set_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                set_btn.customContextMenuRequested.connect(lambda pos, tid=task_id: self.switch_task_mode(tid, 1))
-
-            self.task_table.setCellWidget(row, 7, set_btn)
-
-            # 第8列：操作按钮（根据模式显示不同文本和功能）
-            if link_mode == 0:  # 目录模式
-                action_btn = QPushButton("跳转目录")
-                action_btn.setObjectName("actionButton")
-                action_btn.clicked.connect(lambda checked, tid=task_id: self.jump_to_dir(tid))
-            else:  # 链接模式
-                action_btn = QPushButton("复制链接")
-                action_btn.setObjectName("actionButton")
-                action_btn.clicked.connect(lambda checked, tid=task_id: self.copy_task_link(tid))
-                # 右键菜单用于跳转链接
-                action_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                action_btn.customContextMenuRequested.connect(lambda pos, tid=task_id: self.jump_to_link(tid))
+        # 分别计时从发起查询到列表更新完毕的总耗时，以及其中构建列表模型的耗时
+        finish = self.trace_span("load_tasks_by_month")
 
-            self.task_table.setCellWidget(row, 8, action_btn)
+        def show(results: List[TaskRecord]) -> None:
+            finish_model = self.trace_span("load_tasks_by_month.set_tasks")
+            self.task_model.set_tasks(results)
+            finish_model()
+            finish()
 
-            # 第9列：操作按钮（通过右键切换功能）
-            op_btn = QPushButton("修改状态")
-            op_btn.setObjectName("actionButton")
-            op_btn.setProperty("current_function", "update_status")  # 存储当前功能
-            op_btn.setProperty("task_id", task_id)  # 存储任务ID
-            op_btn.setProperty("task_name", name)  # 存储任务名称
-
-            # 左键点击执行当前功能
-            op_btn.clicked.connect(lambda checked, tid=task_id, tname=name: self.execute_current_operation(tid, tname))
-
-            # 右键点击切换功能
-            op_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-            op_btn.customContextMenuRequested.connect(lambda pos, btn=op_btn: self.show_operation_menu(btn))
-
-            self.task_table.setCellWidget(row, 9, op_btn)
-
-            # 隐藏列：属性ID、任务ID
-            self.task_table.setItem(row, 10, QTableWidgetItem(str(prop_id)))
-            self.task_table.setItem(row, 11, QTableWidgetItem(str(task_id)))
+        self.query_tasks("get_tasks_by_board_month", self.current_board_id, year, month, on_result=show)
 
     def add_task(self) -> None:
         """新建任务（含属性选择和模式选择）"""
@@ -1145,8 +1488,11 @@ class TaskManager(QMainWindow):
         if not ok:
             return
 
+        self.db.call("get_all_properties",
+                     on_result=lambda properties: self._finish_add_task(name, status, properties))
+
+    def _finish_add_task(self, name: str, status: str, properties: List[Tuple[int, str, int]]) -> None:
         # 任务属性（原有）
-        properties = self.db.get_all_properties()
         prop_options = [f"{p[1]} {'(默认)' if p[2] == 1 else '(自定义)'}" for p in properties]
         prop_ids = [p[0] for p in properties]
         prop_text, ok = QInputDialog.getItem(
@@ -1223,7 +1569,8 @@ class TaskManager(QMainWindow):
                 expected_time = date_edit.date().toString("yyyy-MM-dd")
 
         # 保存任务（新增link_mode和link_url参数）
-        self.db.add_task(
+        self.db.call(
+            "add_task",
             board_id=self.current_board_id,
             name=name,
             status=status,
@@ -1231,12 +1578,22 @@ class TaskManager(QMainWindow):
             expected_time=expected_time,
             task_dir=task_dir,
             link_mode=link_mode,
-            link_url=link_url
+            link_url=link_url,
+            on_result=self._on_task_added
         )
+
+    def _on_task_added(self, _) -> None:
         self.load_time_tree()
         QMessageBox.information(self, "成功", "任务创建成功！")
 
-    def rename_task(self, task_id: int, old_name: str) -> None:
+    def rename_task(self, task_id: int) -> None:
+        self.db.call("get_task", task_id, on_result=self._rename_task)
+
+    def _rename_task(self, task) -> None:
+        if not task:
+            QMessageBox.warning(self, "提示", "任务不存在！")
+            return
+        old_name = task.name
         new_name, ok = QInputDialog.getText(
             self,
             "重命名任务",
@@ -1253,38 +1610,28 @@ class TaskManager(QMainWindow):
             QMessageBox.warning(self, "提示", "任务名称不能为空！")
             return
 
-        self.db.update_task_name(task_id, new_name)
-        QMessageBox.information(self, "成功", f"任务已重命名为「{new_name}」")
+        self.db.call("update_task_name", task.id, new_name, on_result=self._on_task_renamed)
 
-        if self.current_board_id and self.task_tree.currentItem():
-            data = self.task_tree.currentItem().data(0, Qt.UserRole)
-            if data and data[0] == "month":
-                self.load_tasks_by_month(data[1], data[2])
-        else:
-            self.search_tasks_by_time_status()
+    def _on_task_renamed(self, task) -> None:
+        self.task_model.update_task(task)
+        QMessageBox.information(self, "成功", f"任务已重命名为「{task.name}」")
 
     def set_task_dir(self, task_id: int) -> None:
         new_dir = QFileDialog.getExistingDirectory(self, "选择新的任务目录")
         if not new_dir:
             return
 
-        self.db.update_task_dir(task_id, new_dir)
-        QMessageBox.information(self, "成功", "任务目录已更新！")
+        self.db.call("update_task_dir", task_id, new_dir, on_result=self._on_task_dir_updated)
 
-        if self.current_board_id and self.task_tree.currentItem():
-            data = self.task_tree.currentItem().data(0, Qt.UserRole)
-            if data and data[0] == "month":
-                self.load_tasks_by_month(data[1], data[2])
-        else:
-            self.search_tasks_by_time_status()
+    def _on_task_dir_updated(self, task) -> None:
+        self.task_model.update_task(task)
+        QMessageBox.information(self, "成功", "任务目录已更新！")
 
     def jump_to_dir(self, task_id: int) -> None:
-        tasks = self.db.get_tasks_by_time_status()
-        task_dir = None
-        for task in tasks:
-            if task[0] == task_id:
-                task_dir = task[9]  # 第9位是task_dir
-                break
+        self.db.call("get_task", task_id, on_result=self._open_task_dir)
+
+    def _open_task_dir(self, task) -> None:
+        task_dir = task.task_dir if task else None
 
         if not task_dir:
             QMessageBox.warning(self, "提示", "该任务未设置目录！")
@@ -1300,118 +1647,127 @@ class TaskManager(QMainWindow):
         statuses = ["待启用", "初开启", "已完成"]
         new_status, ok = QInputDialog.getItem(self, "修改状态", "新状态：", statuses, 0, False)
         if ok:
-            self.db.update_task_status(task_id, new_status)
-            if self.current_board_id and self.task_tree.currentItem():
-                data = self.task_tree.currentItem().data(0, Qt.UserRole)
-                if data and data[0] == "month":
-                    self.load_tasks_by_month(data[1], data[2])
-            else:
-                self.search_tasks_by_time_status()
-            QMessageBox.information(self, "成功", "状态已更新！")
+            self.db.call("update_task_status", task_id, new_status, on_result=self._on_task_status_updated)
+
+    def _on_task_status_updated(self, task) -> None:
+        self.task_model.update_task(task)
+        QMessageBox.information(self, "成功", "状态已更新！")
 
     def load_all_tasks_order_by_name(self) -> None:
-        tasks = self.db.get_all_tasks_order_by_name()
-        if not tasks:
+        self.query_tasks("count_all_tasks", on_result=self._show_tasks_order_by_name)
+
+    def _show_tasks_order_by_name(self, count: int) -> None:
+        if not count:
             QMessageBox.information(self, "提示", "暂无任务数据！")
-            self.task_table.setRowCount(0)
+            self.task_model.clear()
             return
 
-        self.show_search_results(tasks)
-        QMessageBox.information(self, "完成", f"已按任务名称排序，共{len(tasks)}条任务")
+        self.show_paged_results("get_all_tasks_order_by_name_page")
+        QMessageBox.information(self, "完成", f"已按任务名称排序，共{count}条任务")
 
     def search_tasks_by_time_status(self) -> None:
-        year = int(self.year_combo.currentText())
-        month = int(self.month_combo.currentText())
         status = self.status_combo.currentText() if hasattr(self, 'status_combo') else None
         status = status if status != "全部" else None
+        range_query = self._date_range_query(statuses=(status,) if status else ())
+        if range_query is None:
+            return
 
-        results = self.db.get_tasks_by_time_status(year, month, status)
-        self.show_search_results(results)
+        self.query_tasks("find_tasks", range_query[0], on_result=self.show_search_results)
 
-    def show_search_results(self, results: List[Tuple]) -> None:
-        """显示检索/排序结果（含任务属性列和模式列）"""
-        self.task_table.setRowCount(len(results))
-        for row, res in enumerate(results):
-            # 结果元组：(id, name, board_name, year, month, status, status_time, expected_time, board_id, task_dir, property_id, property_name, link_mode, link_url)
-            (task_id, name, board_name, year, month, status, status_time,
-             expected_time, board_id, task_dir, prop_id, prop_name, link_mode, link_url) = res
-
-            # 0-6列：基础信息
-            self.task_table.setItem(row, 0, QTableWidgetItem(name))
-            self.task_table.setItem(row, 1, QTableWidgetItem(board_name))
-            self.task_table.setItem(row, 2, QTableWidgetItem(prop_name))  # 任务属性列
-            self.task_table.setItem(row, 3, QTableWidgetItem(status))
-            self.task_table.setItem(row, 4, QTableWidgetItem(status_time.split('.')[0]))
-            self.task_table.setItem(row, 5, QTableWidgetItem(expected_time or "-"))
-
-            # 第6列：根据模式显示目录或链接
-            if link_mode == 0:  # 目录模式
-                self.task_table.setItem(row, 6, QTableWidgetItem(task_dir or "未设置"))
-            else:  # 链接模式
-                self.task_table.setItem(row, 6, QTableWidgetItem(link_url or "未设置"))
+    # ------------------------------
+    # 启动
+    # ------------------------------
+    def on_first_paint(self) -> None:
+        """窗口第一次绘制后再加载初始数据，数据库初始化不推迟窗口出现"""
+        self.startup_timer.mark("first_paint")
+        QTimer.singleShot(0, self.load_boards)
 
-            # 第7列：设置按钮（根据模式显示不同文本和功能）
-            if link_mode == 0:  # 目录模式
-                set_btn = QPushButton("设置目录")
-                set_btn.setObjectName("actionButton")
-                set_btn.clicked.connect(lambda checked, tid=task_id: self.set_task_dir(tid))
-                # 右键菜单用于切换模式
-                set_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                set_btn.customContextMenuRequested.connect(lambda pos, tid=task_id: self.switch_task_mode(tid, 0))
-            else:  # 链接模式
-                set_btn = QPushButton("设置链接")
-                set_btn.setObjectName("actionButton")
-                set_btn.clicked.connect(lambda checked, tid=task_id: self.set_task_link(tid))
-                # 右键菜单用于切换模式
-                set_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                set_btn.customContextMenuRequested.connect(lambda pos, tid=task_id: self.switch_task_mode(tid, 1))
+    # ------------------------------
+    # 异步数据访问
+    # ------------------------------
+    def query_tasks(self, method: str, *args, on_result, **kwargs) -> None:
+        """提交任务列表查询；连续多次查询时只显示最后一次的结果"""
+        request_id = None
 
-            self.task_table.setCellWidget(row, 7, set_btn)
+        def deliver(results: List[TaskRecord]) -> None:
+            if request_id == self._latest_task_query:
+                on_result(results)
 
-            # 第8列：操作按钮（根据模式显示不同文本和功能）
-            if link_mode == 0:  # 目录模式
-                action_btn = QPushButton("跳转目录")
-                action_btn.setObjectName("actionButton")
-                action_btn.clicked.connect(lambda checked, tid=task_id: self.jump_to_dir(tid))
-            else:  # 链接模式
-                action_btn = QPushButton("复制链接")
-                action_btn.setObjectName("actionButton")
-                action_btn.clicked.connect(lambda checked, tid=task_id: self.copy_task_link(tid))
-                # 右键菜单用于跳转链接
-                action_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-                action_btn.customContextMenuRequested.connect(lambda pos, tid=task_id: self.jump_to_link(tid))
+        request_id = self.db.call(method, *args, on_result=deliver, **kwargs)
+        self._latest_task_query = request_id
 
-            self.task_table.setCellWidget(row, 8, action_btn)
+    def show_paged_results(self, method: str, *args) -> None:
+        """以分页方式显示结果：滚动到底部时才读取下一页"""
+        self._latest_task_query = None  # 作废尚未返回的整表查询
 
-            # 第9列：操作按钮（通过右键切换功能）
-            op_btn = QPushButton("修改状态")
-            op_btn.setObjectName("actionButton")
-            op_btn.setProperty("current_function", "update_status")  # 存储当前功能
-            op_btn.setProperty("task_id", task_id)  # 存储任务ID
-            op_btn.setProperty("task_name", name)  # 存储任务名称
+        def fetch_page(after, deliver) -> None:
+            self.db.call(method, *args, after=after, limit=TaskTableModel.FETCH_BATCH, on_result=deliver)
 
-            # 左键点击执行当前功能
-            op_btn.clicked.connect(lambda checked, tid=task_id, tname=name: self.execute_current_operation(tid, tname))
+        self.task_model.set_page_source(fetch_page)
 
-            # 右键点击切换功能
-            op_btn.setContextMenuPolicy(Qt.CustomContextMenu)
-            op_btn.customContextMenuRequested.connect(lambda pos, btn=op_btn: self.show_operation_menu(btn))
+    def on_db_busy_changed(self, busy: bool) -> None:
+        """数据库忙碌时显示等待光标和状态栏提示，界面保持可响应"""
+        self.busy_label.setVisible(busy)
+        if busy:
+            QApplication.setOverrideCursor(Qt.BusyCursor)
+        else:
+            QApplication.restoreOverrideCursor()
 
-            self.task_table.setCellWidget(row, 9, op_btn)
+    def on_db_error(self, method: str, error: Exception) -> None:
+        QMessageBox.warning(self, "数据库错误", f"{method} 执行失败：{error}")
 
-            # 隐藏列：属性ID、任务ID
-            self.task_table.setItem(row, 10, QTableWidgetItem(str(prop_id)))
-            self.task_table.setItem(row, 11, QTableWidgetItem(str(task_id)))
+    def show_search_results(self, results: List[TaskRecord]) -> None:
+        """显示检索/排序结果（含任务属性列和模式列）"""
+        finish = self.trace_span("show_search_results")
+        self.task_model.set_tasks(results)
+        finish()
 
     def closeEvent(self, event) -> None:
+        if self.name_search_worker is not None:
+            self.name_search_timer.stop()
+            self.name_search_worker.stop()
         self.db.close()
         event.accept()
 
 
+def parse_args(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """解析本程序的参数，其余参数（如 Qt 的 -platform）原样交给 QApplication"""
+    parser = argparse.ArgumentParser(description="任务状态管理器")
+    parser.add_argument("--db", default="task_manager.db", help="数据库文件")
+    parser.add_argument("--startup-report", metavar="FILE",
+                        help="启动完成后把各阶段耗时写入JSON文件并退出（启动基准测试用）")
+    parser.add_argument("--trace", action="store_true",
+                        help="开启性能追踪：记录数据库方法和界面操作的耗时及慢语句，可在\"诊断\"面板查看")
+    parser.add_argument("--trace-file", metavar="FILE", help="退出时把性能追踪记录写入JSON文件（同时开启 --trace）")
+    parser.add_argument("--slow-ms", type=float, default=SLOW_STATEMENT_MS,
+                        help=f"慢语句阈值（毫秒，默认 {SLOW_STATEMENT_MS:g}）")
+    args, qt_args = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + qt_args
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    startup_timer = StartupTimer(STARTUP_ORIGIN)
+    startup_timer.mark("imports")
+    args, qt_argv = parse_args(sys.argv)
+    app = QApplication(qt_argv)
     font = QFont("SimHei")
     app.setFont(font)
-    window = TaskManager()
+    tracer = Tracer(args.slow_ms) if args.trace or args.trace_file else None
+    window = TaskManager(args.db, startup_timer, tracer)
+
+    def on_startup_finished() -> None:
+        # 设置环境变量 TASK_MANAGER_STARTUP_LOG 时在终端输出启动耗时
+        if os.environ.get("TASK_MANAGER_STARTUP_LOG"):
+            print(startup_timer.format(), file=sys.stderr)
+        if args.startup_report:
+            with open(args.startup_report, "w", encoding="utf-8") as f:
+                json.dump(startup_timer.as_dict(), f)
+            window.close()
+
+    window.startup_finished.connect(on_startup_finished)
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    startup_timer.mark("shown")
+    exit_code = app.exec_()
+    if args.trace_file:
+        tracer.dump(args.trace_file, {"startup": startup_timer.as_dict()})
+    sys.exit(exit_code)
\ No newline at end of file
@@ -16,19 +16,18 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# 目录模式（onedir）：单文件模式每次启动都要先把依赖解压到临时目录，目录模式直接加载
+# 不使用UPX：压缩过的DLL每次加载都要先解压
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
-    name='main',
+    exclude_binaries=True,
+    name='任务状态管理器',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -37,3 +36,12 @@ exe = EXE(
     entitlements_file=None,
     icon=['icon.ico'],
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='任务状态管理器',
+)
@@ -0,0 +1,147 @@
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# 耗时直方图各桶的上界（毫秒），超过最后一个上界的计入溢出桶
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SLOW_STATEMENT_MS = 50.0      # 单条SQL语句耗时达到此值时记录语句和查询计划
+SLOW_STATEMENT_LIMIT = 200    # 最多保留的慢语句条数（只保留最近的）
+
+
+class LatencyHistogram:
+    """耗时分布：固定分桶计数，另记次数、总耗时和最大值；百分位数取所在桶的上界"""
+    __slots__ = ("count", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """如 percentile(0.95)；不超过实际最大值"""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict:
+        bounds = [f"≤{bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count, "total_ms": round(self.total_ms, 3), "mean_ms": round(self.mean_ms, 3),
+            "p50_ms": round(self.percentile(0.5), 3), "p95_ms": round(self.percentile(0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {bound: count for bound, count in zip(bounds, self.buckets) if count},
+        }
+
+
+class SlowStatement(NamedTuple):
+    """耗时超过阈值的一条SQL语句"""
+    time: str                # 记录时间
+    method: str              # 执行它的 DBHelper 方法
+    elapsed_ms: float        # 从语句开始到下一条语句开始（或方法返回），含读取结果行的Python处理
+    sql: str                 # 已代入参数的语句文本
+    plan: Tuple[str, ...]    # EXPLAIN QUERY PLAN 的各行（按层级缩进）
+
+
+class Tracer:
+    """性能追踪记录（默认不开启）：
+    - DBHelper 每个公开方法的耗时直方图（由 DBHelper 记录，嵌套调用各自计入）
+    - 超过阈值的SQL语句及其查询计划
+    - 界面操作的耗时（从发起查询到结果显示，或界面模型的构建）
+    数据库线程与GUI线程都会写入，各方法均加锁
+    """
+
+    def __init__(self, slow_ms: float = SLOW_STATEMENT_MS, slow_limit: int = SLOW_STATEMENT_LIMIT):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._started = datetime.now()
+        self._methods: Dict[str, LatencyHistogram] = {}
+        self._spans: Dict[str, LatencyHistogram] = {}
+        self._slow: Deque[SlowStatement] = deque(maxlen=slow_limit)
+
+    def record_call(self, method: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._histogram(self._methods, method).add(elapsed_ms)
+
+    def record_span(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._histogram(self._spans, name).add(elapsed_ms)
+
+    def record_slow(self, statement: SlowStatement) -> None:
+        with self._lock:
+            self._slow.append(statement)
+
+    def start_span(self, name: str) -> Callable[[], float]:
+        """开始计时，返回结束计时的函数（调用时记录并返回耗时毫秒数）；用于跨越异步回调的界面操作"""
+        start = time.perf_counter()
+
+        def finish() -> float:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.record_span(name, elapsed)
+            return elapsed
+        return finish
+
+    @staticmethod
+    def _histogram(histograms: Dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        if name not in histograms:
+            histograms[name] = LatencyHistogram()
+        return histograms[name]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started = datetime.now()
+            self._methods.clear()
+            self._spans.clear()
+            self._slow.clear()
+
+    def snapshot(self) -> Dict:
+        """当前记录的副本（可直接序列化为JSON），方法与界面操作按总耗时倒序"""
+        with self._lock:
+            def ordered(histograms: Dict[str, LatencyHistogram]) -> Dict[str, Dict]:
+                items = sorted(histograms.items(), key=lambda item: item[1].total_ms, reverse=True)
+                return {name: histogram.as_dict() for name, histogram in items}
+
+            return {
+                "started": self._started.isoformat(timespec="seconds"),
+                "dumped": datetime.now().isoformat(timespec="seconds"),
+                "slow_ms": self.slow_ms,
+                "methods": ordered(self._methods),
+                "spans": ordered(self._spans),
+                "slow_statements": [statement._asdict() for statement in self._slow],
+            }
+
+    def dump(self, path: str, extra: Optional[Dict] = None) -> None:
+        """写入JSON文件；extra 为附加的内容（如查询结果缓存的命中统计）"""
+        report = self.snapshot()
+        report.update(extra or {})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def format_plan(rows: List[Tuple]) -> Tuple[str, ...]:
+    """EXPLAIN QUERY PLAN 的 (id, parent, notused, detail) 行按父子关系缩进"""
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return tuple(lines)
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+YearMonth = Tuple[int, int]
+
+
+class CacheScope(NamedTuple):
+    """缓存结果覆盖的数据范围，None/空元组表示该维度不限"""
+    board_id: Optional[int] = None
+    ym_from: Optional[YearMonth] = None       # (年, 月)，含
+    ym_to: Optional[YearMonth] = None         # (年, 月)，含
+    property_ids: Tuple[int, ...] = ()
+
+
+class ChangedKey(NamedTuple):
+    """一次修改涉及的数据位置，None 表示该维度的任意取值"""
+    board_id: Optional[int] = None
+    year_month: Optional[YearMonth] = None
+    property_id: Optional[int] = None
+
+
+def scope_affected(scope: CacheScope, key: ChangedKey) -> bool:
+    """修改的位置是否可能落在缓存结果的范围内"""
+    if scope.board_id is not None and key.board_id is not None and scope.board_id != key.board_id:
+        return False
+    if key.year_month is not None:
+        if scope.ym_from is not None and key.year_month < scope.ym_from:
+            return False
+        if scope.ym_to is not None and key.year_month > scope.ym_to:
+            return False
+    if scope.property_ids and key.property_id is not None and key.property_id not in scope.property_ids:
+        return False
+    return True
+
+
+class _Entry(NamedTuple):
+    value: object
+    rows: int
+    scope: CacheScope
+
+
+class ResultCache:
+    """查询结果的LRU缓存：按条目数和结果总行数限制容量，按修改涉及的板块/年月/属性精确作废"""
+
+    # 单次修改涉及的位置超过此数时（如大批量导入）直接清空，不逐条比对
+    MAX_CHANGED_KEYS = 256
+
+    def __init__(self, max_entries: int = 128, max_rows: int = 50000):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._rows = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0      # 因容量被淘汰的条目数
+        self.invalidations = 0  # 因数据修改被作废的条目数
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_rows > 0
+
+    def get(self, key: Hashable):
+        """返回缓存的结果，未命中时返回 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: Hashable, value, rows: int, scope: CacheScope) -> None:
+        """缓存一个结果；行数超过总容量四分之一的结果不缓存，以免挤掉其余条目"""
+        if not self.enabled or rows > self.max_rows // 4:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._rows -= old.rows
+        self._entries[key] = _Entry(value, rows, scope)
+        self._rows += rows
+        while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+            _, evicted = self._entries.popitem(last=False)
+            self._rows -= evicted.rows
+            self.evictions += 1
+
+    def invalidate(self, changed: Iterable[ChangedKey]) -> None:
+        """作废范围内可能包含这些修改的结果"""
+        if not self._entries:
+            return
+        changed = set(changed)
+        if len(changed) > self.MAX_CHANGED_KEYS:
+            self.clear()
+            return
+        stale = [key for key, entry in self._entries.items()
+                 if any(scope_affected(entry.scope, change) for change in changed)]
+        for key in stale:
+            self._rows -= self._entries.pop(key).rows
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._rows = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries), "rows": self._rows,
+            "max_entries": self.max_entries, "max_rows": self.max_rows,
+            "hits": self.hits, "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions, "invalidations": self.invalidations,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+
+def changed_keys(rows: Iterable[Tuple[int, int, int, int]]) -> List[ChangedKey]:
+    """由 (board_id, year, month, property_id) 行得到修改位置"""
+    return [ChangedKey(board_id, (year, month), property_id) for board_id, year, month, property_id in rows]
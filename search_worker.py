@@ -0,0 +1,73 @@
+import queue
+import sqlite3
+from typing import Optional
+from PyQt5.QtCore import QThread, pyqtSignal
+from db_helper import DBHelper, ConnectionProfile, DEFAULT_PROFILE
+from query_trace import Tracer
+
+
+class NameSearchWorker(QThread):
+    """边输入边检索的后台线程：独立数据库连接，新请求会中断仍在执行的旧查询"""
+
+    # (请求序号, 关键词, 首页结果)
+    results_ready = pyqtSignal(int, str, list)
+
+    PAGE_SIZE = 200  # 首页结果条数
+
+    def __init__(self, db_name: str, profile: ConnectionProfile = DEFAULT_PROFILE, parent=None,
+                 tracer: Optional[Tracer] = None):
+        super().__init__(parent)
+        self._db_name = db_name
+        self._profile = profile
+        self._tracer = tracer
+        self._requests = queue.Queue()
+        self._latest_seq = 0
+        self._db: Optional[DBHelper] = None
+
+    def search(self, keyword: str) -> int:
+        """提交检索请求（GUI线程调用），返回请求序号"""
+        self._latest_seq += 1
+        self._requests.put((self._latest_seq, keyword))
+        self._interrupt()
+        return self._latest_seq
+
+    def cancel(self) -> None:
+        """作废所有已提交的请求（其结果不再发出）"""
+        self._latest_seq += 1
+        self._interrupt()
+
+    def stop(self) -> None:
+        """结束线程并关闭连接"""
+        self._requests.put(None)
+        self._interrupt()
+        self.wait()
+
+    def _interrupt(self) -> None:
+        # sqlite3.Connection.interrupt 可以跨线程调用，用于取消被新请求取代的查询
+        if self._db is not None:
+            self._db.conn.interrupt()
+
+    def run(self) -> None:
+        # 连接必须在本线程内创建和使用
+        self._db = DBHelper(self._db_name, self._profile, self._tracer)
+        try:
+            while True:
+                request = self._requests.get()
+                # 只处理队列中最新的请求，中间的请求已被取代
+                while request is not None and not self._requests.empty():
+                    request = self._requests.get_nowait()
+                if request is None:
+                    break
+
+                seq, keyword = request
+                if seq != self._latest_seq:
+                    continue
+                try:
+                    rows = self._db.search_tasks_by_name(keyword, limit=self.PAGE_SIZE)
+                except sqlite3.OperationalError:
+                    continue  # 查询被中断
+                if seq == self._latest_seq:
+                    self.results_ready.emit(seq, keyword, rows)
+        finally:
+            db, self._db = self._db, None
+            db.close()
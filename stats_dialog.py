@@ -0,0 +1,155 @@
+from typing import List, Optional, Tuple
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QComboBox, QDateEdit, QLabel,
+                             QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QMessageBox)
+from PyQt5.QtCore import Qt, QDate
+from db_helper import TaskQuery, TaskStats
+from db_worker import AsyncDB
+
+# (统计维度, 显示名称)，与 DBHelper.STAT_GROUPS 对应
+STAT_DIMENSIONS = [("board", "板块"), ("month", "月份"), ("property", "属性"), ("status", "状态"), ("link_mode", "模式")]
+VALUE_HEADERS = ["任务数", "已完成", "完成率", "逾期"]
+
+
+class StatsDialog(QDialog):
+    """统计面板：按板块/月份/属性/状态/模式任意组合分组，显示任务数、完成率和逾期数
+    统计在数据库端分组完成（计数表），不读取任务明细
+    """
+
+    def __init__(self, db: AsyncDB, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self._latest_request = None
+        self.setWindowTitle("任务统计")
+        self.resize(1100, 700)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        # 筛选条件：板块、年月区间
+        filter_layout = QHBoxLayout()
+        self.board_combo = QComboBox()
+        self.board_combo.addItem("全部板块", None)
+        self.board_combo.currentIndexChanged.connect(self.refresh)
+        self.month_check = QCheckBox("限定月份")
+        self.month_check.toggled.connect(self._on_month_toggled)
+        today = QDate.currentDate()
+        self.month_from_edit = self._month_edit(QDate(today.year(), 1, 1))
+        self.month_to_edit = self._month_edit(today)
+        filter_layout.addWidget(QLabel("板块："))
+        filter_layout.addWidget(self.board_combo)
+        filter_layout.addWidget(self.month_check)
+        filter_layout.addWidget(self.month_from_edit)
+        filter_layout.addWidget(QLabel("至"))
+        filter_layout.addWidget(self.month_to_edit)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+
+        # 分组维度
+        group_layout = QHBoxLayout()
+        group_layout.addWidget(QLabel("分组："))
+        self.dimension_checks: List[Tuple[str, QCheckBox]] = []
+        for dimension, title in STAT_DIMENSIONS:
+            check = QCheckBox(title)
+            check.setChecked(dimension in ("board", "status"))
+            check.toggled.connect(self.refresh)
+            self.dimension_checks.append((dimension, check))
+            group_layout.addWidget(check)
+        group_layout.addStretch()
+        refresh_btn = QPushButton("刷新")
+        refresh_btn.clicked.connect(self.refresh)
+        group_layout.addWidget(refresh_btn)
+        layout.addLayout(group_layout)
+
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.db.call("get_all_boards", on_result=self._fill_boards)
+
+    def _month_edit(self, value: QDate) -> QDateEdit:
+        edit = QDateEdit(value)
+        edit.setDisplayFormat("yyyy-MM")
+        edit.setCalendarPopup(True)
+        edit.setEnabled(False)
+        edit.dateChanged.connect(self.refresh)
+        return edit
+
+    def _fill_boards(self, boards: List[Tuple[int, str]]) -> None:
+        current = self.board_combo.currentData()
+        self.board_combo.blockSignals(True)
+        self.board_combo.clear()
+        self.board_combo.addItem("全部板块", None)
+        for board_id, name in boards:
+            self.board_combo.addItem(name, board_id)
+        index = self.board_combo.findData(current)
+        self.board_combo.setCurrentIndex(max(index, 0))
+        self.board_combo.blockSignals(False)
+
+    def _on_month_toggled(self, checked: bool) -> None:
+        self.month_from_edit.setEnabled(checked)
+        self.month_to_edit.setEnabled(checked)
+        self.refresh()
+
+    def current_query(self) -> Optional[TaskQuery]:
+        """由筛选控件生成查询条件；起始月份晚于结束月份时提示并返回None"""
+        conditions = {"board_id": self.board_combo.currentData()}
+        if self.month_check.isChecked():
+            date_from, date_to = self.month_from_edit.date(), self.month_to_edit.date()
+            year_month_from = (date_from.year(), date_from.month())
+            year_month_to = (date_to.year(), date_to.month())
+            if year_month_from > year_month_to:
+                QMessageBox.warning(self, "提示", "起始月份不能晚于结束月份！")
+                return None
+            conditions.update(year_month_from=year_month_from, year_month_to=year_month_to)
+        return TaskQuery(**conditions)
+
+    def current_group_by(self) -> Tuple[str, ...]:
+        return tuple(dimension for dimension, check in self.dimension_checks if check.isChecked())
+
+    def refresh(self) -> None:
+        """重新统计；连续修改条件时只显示最后一次的结果"""
+        query = self.current_query()
+        if query is None:
+            return
+        group_by = self.current_group_by()
+        request_id = None
+
+        def deliver(stats: List[TaskStats]) -> None:
+            if request_id == self._latest_request:
+                self._show_stats(group_by, stats)
+
+        request_id = self.db.call("task_statistics", query, group_by, on_result=deliver)
+        self._latest_request = request_id
+
+    def _show_stats(self, group_by: Tuple[str, ...], stats: List[TaskStats]) -> None:
+        titles = dict(STAT_DIMENSIONS)
+        headers = [titles[dimension] for dimension in group_by] + VALUE_HEADERS
+        self.table.setSortingEnabled(False)
+        self.table.clear()
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(stats))
+        for row, item in enumerate(stats):
+            values = [*item.labels, item.total, item.completed, f"{item.completion_rate:.1%}", item.overdue]
+            for column, value in enumerate(values):
+                cell = QTableWidgetItem()
+                # 任务数等列按数值排序
+                cell.setData(Qt.DisplayRole, value)
+                if column >= len(group_by):
+                    cell.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, cell)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setSortingEnabled(True)
+
+        total = sum(item.total for item in stats)
+        completed = sum(item.completed for item in stats)
+        overdue = sum(item.overdue for item in stats)
+        rate = completed / total if total else 0.0
+        self.summary_label.setText(f"共 {total} 个任务，已完成 {completed} 个（{rate:.1%}），逾期 {overdue} 个")
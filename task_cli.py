@@ -0,0 +1,332 @@
+import argparse
+import json
+import sqlite3
+import sys
+from typing import Iterable, Optional
+
+from db_helper import DBHelper, TaskRecord, TASK_STATUSES
+from query_trace import SLOW_STATEMENT_MS, Tracer
+import task_export
+import task_import
+
+
+class CommandError(Exception):
+    """命令执行失败（参数合法但无法完成，如名称重复、对象不存在）"""
+
+
+def emit(obj) -> None:
+    print(json.dumps(obj, ensure_ascii=False))
+
+
+def emit_tasks(tasks: Iterable[TaskRecord]) -> None:
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    write = sys.stdout.write
+    for task in tasks:
+        write(encode(task._asdict()))
+        write("\n")
+
+
+def emit_task(task: Optional[TaskRecord], task_id: int) -> None:
+    if task is None:
+        raise CommandError(f"任务不存在：{task_id}")
+    emit(task._asdict())
+
+
+# ------------------------------
+# 板块
+# ------------------------------
+def board_list(db: DBHelper, args) -> None:
+    for board_id, name in db.get_all_boards():
+        emit({"id": board_id, "name": name})
+
+
+def board_add(db: DBHelper, args) -> None:
+    if not db.add_board(args.name):
+        raise CommandError(f"板块已存在：{args.name}")
+    emit({"id": db.get_board_id_by_name(args.name), "name": args.name})
+
+
+def _check_board(db: DBHelper, board_id: int) -> None:
+    if board_id not in dict(db.get_all_boards()):
+        raise CommandError(f"板块不存在：{board_id}")
+
+
+def board_rename(db: DBHelper, args) -> None:
+    _check_board(db, args.id)
+    if not db.update_board_name(args.id, args.name):
+        raise CommandError(f"板块名称已存在：{args.name}")
+    emit({"id": args.id, "name": args.name})
+
+
+def board_delete(db: DBHelper, args) -> None:
+    _check_board(db, args.id)
+    db.delete_board(args.id)
+    emit({"id": args.id, "deleted": True})
+
+
+def board_months(db: DBHelper, args) -> None:
+    for year, month, count in db.get_board_year_months(args.id):
+        emit({"year": year, "month": month, "count": count})
+
+
+# ------------------------------
+# 属性
+# ------------------------------
+def property_list(db: DBHelper, args) -> None:
+    for prop_id, name, is_default in db.get_all_properties():
+        emit({"id": prop_id, "name": name, "is_default": bool(is_default)})
+
+
+def property_add(db: DBHelper, args) -> None:
+    if not db.add_custom_property(args.name):
+        raise CommandError(f"属性已存在：{args.name}")
+    emit({"id": db.get_property_id_by_name(args.name.strip()), "name": args.name.strip()})
+
+
+def property_delete(db: DBHelper, args) -> None:
+    task_count, success = db.delete_property(args.id)
+    if not success:
+        raise CommandError(f"属性不存在或为默认属性，不可删除：{args.id}")
+    emit({"id": args.id, "deleted": True, "tasks_reset": task_count})
+
+
+# ------------------------------
+# 任务
+# ------------------------------
+def task_list(db: DBHelper, args) -> None:
+    query = task_export.query_from_args(args)
+    if args.count:
+        emit({"count": db.count_tasks(query)})
+    elif args.limit is None:
+        emit_tasks(db.iter_tasks(query))
+    else:
+        emit_tasks(db.find_tasks(query, limit=args.limit))
+
+
+def _group_by(args) -> list:
+    return [dimension for dimension in (args.by or "").split(",") if dimension]
+
+
+def task_stats(db: DBHelper, args) -> None:
+    group_by = _group_by(args)
+    try:
+        stats = db.task_statistics(task_export.query_from_args(args), group_by)
+    except ValueError as e:
+        raise CommandError(str(e))
+    for row in stats:
+        emit({"group": dict(zip(group_by, row.labels)), "total": row.total, "completed": row.completed,
+              "completion_rate": round(row.completion_rate, 4), "overdue": row.overdue})
+
+
+def task_lead_time(db: DBHelper, args) -> None:
+    group_by = _group_by(args)
+    try:
+        stats = db.lead_time_statistics(task_export.query_from_args(args), group_by, args.since, args.until)
+    except ValueError as e:
+        raise CommandError(str(e))
+    for row in stats:
+        emit({"group": dict(zip(group_by, row.labels)), "completed": row.completed,
+              "avg_seconds": round(row.avg_seconds), "max_seconds": row.max_seconds})
+
+
+def task_status_time(db: DBHelper, args) -> None:
+    group_by = _group_by(args)
+    try:
+        stats = db.status_duration_statistics(task_export.query_from_args(args), group_by, args.since, args.until)
+    except ValueError as e:
+        raise CommandError(str(e))
+    for row in stats:
+        emit({"group": dict(zip(group_by, row.labels)), "status": row.status, "intervals": row.intervals,
+              "ongoing": row.ongoing, "avg_seconds": round(row.avg_seconds), "total_seconds": row.total_seconds})
+
+
+def task_history(db: DBHelper, args) -> None:
+    for status, event_time in db.get_task_status_history(args.id):
+        emit({"status": status, "time": event_time})
+
+
+def task_get(db: DBHelper, args) -> None:
+    emit_task(db.get_task(args.id), args.id)
+
+
+def _resolve_board(db: DBHelper, args) -> int:
+    if args.board_id is not None:
+        return args.board_id
+    board_id = db.get_board_id_by_name(args.board)
+    if board_id is None:
+        raise CommandError(f"板块不存在：{args.board}")
+    return board_id
+
+
+def task_add(db: DBHelper, args) -> None:
+    task_id = db.add_task(
+        _resolve_board(db, args), args.name, args.status,
+        property_id=args.property_id, expected_time=args.expected_time, task_dir=args.dir,
+        link_mode=args.link_mode, link_url=args.url, year=args.year, month=args.month)
+    emit_task(db.get_task(task_id), task_id)
+
+
+def task_update(db: DBHelper, args) -> None:
+    single_fields = [flag for flag, value in (("--name", args.name), ("--dir", args.dir), ("--url", args.url))
+                     if value is not None]
+    if single_fields and len(args.ids) > 1:
+        raise CommandError(f"{'/'.join(single_fields)} 只能用于单个任务")
+
+    with db.transaction():
+        if args.status is not None:
+            db.update_tasks_status(args.ids, args.status)
+        if args.property_id is not None:
+            db.update_tasks_property(args.ids, args.property_id)
+        if args.link_mode is not None:
+            db.update_tasks_link_mode(args.ids, args.link_mode)
+        if args.name is not None:
+            db.update_task_name(args.ids[0], args.name)
+        if args.dir is not None:
+            db.update_task_dir(args.ids[0], args.dir)
+        if args.url is not None:
+            db.update_task_link_url(args.ids[0], args.url)
+
+    for task_id in args.ids:
+        emit_task(db.get_task(task_id), task_id)
+
+
+def task_delete(db: DBHelper, args) -> None:
+    emit({"deleted": db.delete_tasks(args.ids)})
+
+
+# ------------------------------
+# 参数解析
+# ------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    # 不依赖图形界面（不导入 PyQt5），供脚本/定时任务调用
+    parser = argparse.ArgumentParser(
+        prog="python -m task_cli", description="任务状态管理器命令行",
+        epilog="输出为JSON：单个对象一行，任务列表逐行输出（JSON Lines）；失败时错误信息写到标准错误，退出码为1")
+    parser.add_argument("--db", default="task_manager.db", help="数据库文件")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="把本次命令的数据库方法耗时和慢语句（含查询计划）写入JSON文件（导出/导入命令不支持）")
+    parser.add_argument("--slow-ms", type=float, default=SLOW_STATEMENT_MS, help="慢语句阈值（毫秒）")
+    commands = parser.add_subparsers(dest="group", metavar="命令")
+    commands.required = True
+
+    board = commands.add_parser("board", help="板块").add_subparsers(dest="action", metavar="操作")
+    board.required = True
+    board.add_parser("list", help="列出板块").set_defaults(handler=board_list)
+    cmd = board.add_parser("add", help="新建板块")
+    cmd.add_argument("name")
+    cmd.set_defaults(handler=board_add)
+    cmd = board.add_parser("rename", help="重命名板块")
+    cmd.add_argument("id", type=int)
+    cmd.add_argument("name")
+    cmd.set_defaults(handler=board_rename)
+    cmd = board.add_parser("delete", help="删除板块（连同其任务）")
+    cmd.add_argument("id", type=int)
+    cmd.set_defaults(handler=board_delete)
+    cmd = board.add_parser("months", help="板块各年月的任务数")
+    cmd.add_argument("id", type=int)
+    cmd.set_defaults(handler=board_months)
+
+    prop = commands.add_parser("property", help="属性").add_subparsers(dest="action", metavar="操作")
+    prop.required = True
+    prop.add_parser("list", help="列出属性").set_defaults(handler=property_list)
+    cmd = prop.add_parser("add", help="新增自定义属性")
+    cmd.add_argument("name")
+    cmd.set_defaults(handler=property_add)
+    cmd = prop.add_parser("delete", help="删除自定义属性（其任务改为\"未知\"）")
+    cmd.add_argument("id", type=int)
+    cmd.set_defaults(handler=property_delete)
+
+    task = commands.add_parser("task", help="任务").add_subparsers(dest="action", metavar="操作")
+    task.required = True
+    cmd = task.add_parser("list", help="按条件列出任务（JSON Lines）")
+    task_export.add_query_arguments(cmd)
+    cmd.add_argument("--limit", type=int, help="最多输出条数")
+    cmd.add_argument("--count", action="store_true", help="只输出符合条件的任务数")
+    cmd.set_defaults(handler=task_list)
+    cmd = task.add_parser("stats", help="分组统计任务数、完成率和逾期数（JSON Lines）")
+    task_export.add_query_arguments(cmd)
+    cmd.add_argument("--by", metavar="维度", help=f"分组维度，逗号分隔：{','.join(DBHelper.STAT_GROUPS)}")
+    cmd.set_defaults(handler=task_stats)
+    for name, handler, help_text in (
+            ("lead-time", task_lead_time, "期间内完成的任务从新建到完成的时长（秒）"),
+            ("status-time", task_status_time, "期间内进入待启用/初开启后停留的时长（秒）")):
+        cmd = task.add_parser(name, help=help_text)
+        task_export.add_query_arguments(cmd)
+        cmd.add_argument("--by", metavar="维度", default="board",
+                         help=f"分组维度，逗号分隔（默认 board）：{','.join(DBHelper.STAT_GROUPS)}")
+        cmd.add_argument("--since", metavar="YYYY-MM-DD", help="统计区间起始日期（含）")
+        cmd.add_argument("--until", metavar="YYYY-MM-DD", help="统计区间结束日期（含）")
+        cmd.set_defaults(handler=handler)
+    cmd = task.add_parser("get", help="查看单个任务")
+    cmd.add_argument("id", type=int)
+    cmd.set_defaults(handler=task_get)
+    cmd = task.add_parser("history", help="任务的状态变化记录（UTC时间）")
+    cmd.add_argument("id", type=int)
+    cmd.set_defaults(handler=task_history)
+    cmd = task.add_parser("add", help="新建任务")
+    target = cmd.add_mutually_exclusive_group(required=True)
+    target.add_argument("--board", help="板块名称")
+    target.add_argument("--board-id", type=int)
+    cmd.add_argument("--name", required=True)
+    cmd.add_argument("--status", required=True, choices=TASK_STATUSES)
+    cmd.add_argument("--property-id", type=int, default=3)
+    cmd.add_argument("--expected-time", metavar="YYYY-MM-DD")
+    cmd.add_argument("--dir")
+    cmd.add_argument("--link-mode", type=int, choices=(0, 1), default=0)
+    cmd.add_argument("--url")
+    cmd.add_argument("--year", type=int)
+    cmd.add_argument("--month", type=int, choices=range(1, 13), metavar="1-12")
+    cmd.set_defaults(handler=task_add)
+    cmd = task.add_parser("update", help="修改任务（状态/属性/模式可批量）")
+    cmd.add_argument("ids", type=int, nargs="+", metavar="id")
+    cmd.add_argument("--status", choices=TASK_STATUSES)
+    cmd.add_argument("--property-id", type=int)
+    cmd.add_argument("--link-mode", type=int, choices=(0, 1))
+    cmd.add_argument("--name")
+    cmd.add_argument("--dir")
+    cmd.add_argument("--url")
+    cmd.set_defaults(handler=task_update)
+    cmd = task.add_parser("delete", help="删除任务")
+    cmd.add_argument("ids", type=int, nargs="+", metavar="id")
+    cmd.set_defaults(handler=task_delete)
+
+    # 导出/导入沿用各自模块的参数，其余参数原样转交
+    commands.add_parser("export", help="导出任务（参数同 python -m task_export）",
+                        add_help=False).set_defaults(delegate=task_export.main)
+    commands.add_parser("import", help="导入任务（参数同 python -m task_import）",
+                        add_help=False).set_defaults(delegate=task_import.main)
+    return parser
+
+
+def run_command(db: DBHelper, args) -> None:
+    """执行子命令；数据库错误（如外键约束失败：板块/属性ID不存在）转为 CommandError"""
+    try:
+        args.handler(db, args)
+    except sqlite3.Error as e:
+        raise CommandError(f"数据库错误：{e}") from e
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if hasattr(args, "delegate"):
+        return args.delegate(["--db", args.db] + rest)
+    if rest:
+        parser.error(f"无法识别的参数：{' '.join(rest)}")
+
+    tracer = Tracer(args.slow_ms) if args.trace else None
+    db = DBHelper(args.db, tracer=tracer)
+    try:
+        run_command(db, args)
+    except CommandError as e:
+        print(f"错误：{e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+        if tracer is not None:
+            tracer.dump(args.trace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
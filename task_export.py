@@ -0,0 +1,153 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from typing import Iterable, Optional, TextIO, Tuple
+
+from db_helper import DBHelper, TaskQuery, TaskRecord
+
+# 导出列与14列结果元组一一对应
+EXPORT_COLUMNS = TaskRecord._fields
+EXPORT_FORMATS = ("csv", "jsonl")
+GZIP_LEVEL = 6  # 压缩级别：6 与 9 的压缩率相近，速度快得多
+
+
+def detect_format(path: str) -> Tuple[str, bool]:
+    """由文件名推断 (导出格式, 是否gzip压缩)，如 tasks.csv / tasks.jsonl.gz"""
+    name = path.lower()
+    compress = name.endswith(".gz")
+    if compress:
+        name = name[:-3]
+    fmt = "jsonl" if name.endswith((".jsonl", ".json")) else "csv"
+    return fmt, compress
+
+
+def open_output(path: str, compress: bool, encoding: str) -> TextIO:
+    """打开导出目标；path 为 "-" 时写到标准输出"""
+    if path == "-":
+        raw = sys.stdout.buffer
+        if compress:
+            raw = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL)
+        # 标准输出本身不随导出关闭
+        return io.TextIOWrapper(raw, encoding=encoding, newline="", write_through=False)
+    if compress:
+        return gzip.open(path, "wt", compresslevel=GZIP_LEVEL, encoding=encoding, newline="")
+    return open(path, "w", encoding=encoding, newline="")
+
+
+def write_csv(rows: Iterable[TaskRecord], out: TextIO) -> int:
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[TaskRecord], out: TextIO) -> int:
+    # 复用同一个编码器：json.dumps 带非默认参数时每次调用都会新建编码器
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    for row in rows:
+        out.write(encode(dict(zip(EXPORT_COLUMNS, row))))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def export_tasks(db: DBHelper, path: str, query: TaskQuery = TaskQuery(),
+                 fmt: Optional[str] = None, compress: Optional[bool] = None) -> int:
+    """把组合查询的结果流式写出为 CSV / JSONL（可gzip压缩），返回导出条数
+    fmt / compress 为 None 时按文件扩展名推断
+    """
+    detected_fmt, detected_compress = detect_format(path)
+    fmt = fmt or detected_fmt
+    compress = detected_compress if compress is None else compress
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式：{fmt}")
+
+    # CSV 带BOM，Excel 直接打开不会乱码
+    out = open_output(path, compress, "utf-8-sig" if fmt == "csv" else "utf-8")
+    try:
+        rows = db.iter_tasks(query)
+        return write_csv(rows, out) if fmt == "csv" else write_jsonl(rows, out)
+    finally:
+        if path == "-":
+            raw = out.detach()  # 不关闭标准输出本身
+            if compress:
+                raw.close()  # 写出gzip尾部
+            sys.stdout.flush()
+        else:
+            out.close()
+
+
+# ------------------------------
+# 命令行：python -m task_export 输出文件 [筛选条件]
+# ------------------------------
+def parse_year_month(text: str) -> Tuple[int, int]:
+    """'2025-03' -> (2025, 3)"""
+    try:
+        year, month = (int(part) for part in text.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"年月格式应为 YYYY-MM：{text}")
+    if not 1 <= month <= 12:
+        raise argparse.ArgumentTypeError(f"月份无效：{text}")
+    return year, month
+
+
+def add_query_arguments(parser: argparse.ArgumentParser) -> None:
+    """添加与 TaskQuery 字段对应的筛选参数"""
+    parser.add_argument("--board-id", type=int)
+    parser.add_argument("--from", dest="year_month_from", type=parse_year_month, metavar="YYYY-MM",
+                        help="所属年月起（含）")
+    parser.add_argument("--to", dest="year_month_to", type=parse_year_month, metavar="YYYY-MM",
+                        help="所属年月止（含）")
+    parser.add_argument("--status", dest="statuses", action="append", default=[],
+                        help="任务状态，可重复指定")
+    parser.add_argument("--property-id", dest="property_ids", type=int, action="append", default=[],
+                        help="属性ID，可重复指定")
+    parser.add_argument("--link-mode", type=int, choices=(0, 1), help="0=目录模式，1=链接模式")
+    parser.add_argument("--name", help="名称关键词")
+    parser.add_argument("--status-time-from", metavar="YYYY-MM-DD")
+    parser.add_argument("--status-time-to", metavar="YYYY-MM-DD")
+    parser.add_argument("--expected-from", metavar="YYYY-MM-DD")
+    parser.add_argument("--expected-to", metavar="YYYY-MM-DD")
+    parser.add_argument("--order", choices=("status_time", "name", "relevance", "id"), default="status_time")
+
+
+def query_from_args(args: argparse.Namespace) -> TaskQuery:
+    return TaskQuery(**{
+        field: tuple(value) if isinstance(value, list) else value
+        for field, value in vars(args).items() if field in TaskQuery._fields
+    })
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m task_export", description="导出任务为 CSV / JSONL")
+    parser.add_argument("output", help="输出文件（.csv / .jsonl，可加 .gz 压缩），- 表示标准输出")
+    parser.add_argument("--db", default="task_manager.db", help="数据库文件")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="默认按扩展名推断")
+    parser.add_argument("--gzip", action="store_true", default=None, help="gzip压缩（默认按扩展名推断）")
+    add_query_arguments(parser)
+    parser.set_defaults(order="id")  # 导出默认按创建顺序，顺序扫描最快
+    args = parser.parse_args(argv)
+
+    db = DBHelper(args.db)
+    try:
+        start = time.perf_counter()
+        count = export_tasks(db, args.output, query_from_args(args), args.format, args.gzip)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+    # 统计信息写到标准错误，不混入标准输出的导出数据
+    print(f"导出 {count} 条任务，用时 {elapsed:.2f} 秒（{count / max(elapsed, 1e-9):.0f} 条/秒）",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from db_helper import DBHelper, TASK_STATUSES
+from task_export import detect_format
+
+IMPORT_CHUNK_SIZE = 5000  # 每个事务插入的条数
+# 时间字段接受的格式（与程序写入的格式一致）
+TIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+
+class ImportResult(NamedTuple):
+    """导入结果：成功条数、被拒绝的记录 [(记录序号, 原因)]、新建的板块/属性数、耗时（秒）"""
+    imported: int
+    rejected: List[Tuple[int, str]]
+    boards_created: int
+    properties_created: int
+    elapsed: float
+
+
+def open_input(path: str, compress: bool) -> TextIO:
+    """打开导入文件；path 为 "-" 时读标准输入。utf-8-sig 兼容带BOM的CSV"""
+    if path == "-":
+        raw = sys.stdin.buffer
+        if compress:
+            raw = gzip.GzipFile(fileobj=raw, mode="rb")
+        return io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    if compress:
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def read_records(source: TextIO, fmt: str) -> Iterator[Dict]:
+    """逐条读取记录（CSV 首行为列名，JSONL 每行一个对象），不整体读入内存"""
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+        return
+    for line in source:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield {"__error__": f"JSON格式错误：{e}"}
+            continue
+        yield record if isinstance(record, dict) else {"__error__": "每行应为一个JSON对象"}
+
+
+def _text(record: Dict, field: str) -> Optional[str]:
+    """取文本字段，空字符串视为未填写"""
+    value = record.get(field)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _int(record: Dict, field: str) -> Optional[int]:
+    value = _text(record, field)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{field} 应为整数：{value}")
+
+
+def _time(record: Dict, field: str, output_format: str) -> Optional[str]:
+    """取时间字段，按 output_format 规范化；不是 TIME_FORMATS 中的格式时抛出 ValueError"""
+    value = _text(record, field)
+    if value is None:
+        return None
+    for input_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, input_format).strftime(output_format)
+        except ValueError:
+            continue
+    raise ValueError(f"{field} 应为 YYYY-MM-DD 或 YYYY-MM-DD HH:MM:SS：{value}")
+
+
+class TaskImporter:
+    """把记录转换为 add_tasks 的参数并分批写入
+    板块/属性按名称解析，名称→ID 缓存在内存中，不存在时按需新建
+    记录字段与导出列一致：name、status 必填；板块用 board_name（优先）或 board_id；
+    属性用 property_name（优先）或 property_id，缺省为"未知"；
+    status_time / expected_time 为 YYYY-MM-DD 或 YYYY-MM-DD HH:MM:SS
+    """
+
+    def __init__(self, db: DBHelper, create_missing: bool = True, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.create_missing = create_missing
+        self.chunk_size = chunk_size
+        self._boards: Dict[str, int] = {name: board_id for board_id, name in db.get_all_boards()}
+        self._properties: Dict[str, int] = {name: prop_id for prop_id, name, _ in db.get_all_properties()}
+        self._board_ids = set(self._boards.values())
+        self._property_ids = set(self._properties.values())
+        self.boards_created = 0
+        self.properties_created = 0
+
+    def _board_id(self, record: Dict) -> int:
+        name = _text(record, "board_name")
+        if name is None:
+            board_id = _int(record, "board_id")
+            if board_id is None:
+                raise ValueError("缺少 board_name / board_id")
+            if board_id not in self._board_ids:
+                raise ValueError(f"板块ID不存在：{board_id}")
+            return board_id
+        board_id = self._boards.get(name)
+        if board_id is None:
+            if not self.create_missing:
+                raise ValueError(f"板块不存在：{name}")
+            self.db.add_board(name)
+            board_id = self.db.get_board_id_by_name(name)
+            self._boards[name] = board_id
+            self._board_ids.add(board_id)
+            self.boards_created += 1
+        return board_id
+
+    def _property_id(self, record: Dict) -> int:
+        name = _text(record, "property_name")
+        if name is None:
+            prop_id = _int(record, "property_id")
+            if prop_id is None:
+                return 3  # 未知
+            if prop_id not in self._property_ids:
+                raise ValueError(f"属性ID不存在：{prop_id}")
+            return prop_id
+        prop_id = self._properties.get(name)
+        if prop_id is None:
+            if not self.create_missing:
+                raise ValueError(f"属性不存在：{name}")
+            self.db.add_custom_property(name)
+            prop_id = self.db.get_property_id_by_name(name)
+            self._properties[name] = prop_id
+            self._property_ids.add(prop_id)
+            self.properties_created += 1
+        return prop_id
+
+    def convert(self, record: Dict) -> Dict:
+        """校验并转换一条记录，不合法时抛出 ValueError（附原因）"""
+        if "__error__" in record:
+            raise ValueError(record["__error__"])
+        name = _text(record, "name")
+        if name is None:
+            raise ValueError("缺少任务名称")
+        status = _text(record, "status")
+        if status not in TASK_STATUSES:
+            raise ValueError(f"状态无效：{status}（应为 {'/'.join(TASK_STATUSES)}）")
+        month = _int(record, "month")
+        if month is not None and not 1 <= month <= 12:
+            raise ValueError(f"月份无效：{month}")
+        link_mode = _int(record, "link_mode") or 0
+        if link_mode not in (0, 1):
+            raise ValueError(f"link_mode 应为 0 或 1：{link_mode}")
+        year = _int(record, "year")
+        status_time = _time(record, "status_time", "%Y-%m-%d %H:%M:%S")
+        expected_time = _time(record, "expected_time", "%Y-%m-%d")  # 预计启用时间只到日期
+        # 其余字段都合法后再解析板块/属性（可能新建）
+        return {
+            "board_id": self._board_id(record),
+            "name": name,
+            "status": status,
+            "property_id": self._property_id(record),
+            "year": year,
+            "month": month,
+            "status_time": status_time,
+            "expected_time": expected_time,
+            "task_dir": _text(record, "task_dir"),
+            "link_mode": link_mode,
+            "link_url": _text(record, "link_url"),
+        }
+
+    def _flush(self, chunk: List[Tuple[int, Dict]], rejected: List[Tuple[int, str]]) -> int:
+        """写入一批记录（单事务 executemany）；整批失败时逐条重试，找出出错的记录"""
+        if not chunk:
+            return 0
+        try:
+            return self.db.add_tasks(task for _, task in chunk)
+        except sqlite3.IntegrityError:
+            pass
+        imported = 0
+        with self.db.transaction():
+            for number, task in chunk:
+                try:
+                    imported += self.db.add_tasks([task])
+                except sqlite3.IntegrityError as e:
+                    rejected.append((number, f"写入失败：{e}"))
+        return imported
+
+    def run(self, records: Iterator[Dict]) -> ImportResult:
+        start = time.perf_counter()
+        imported = 0
+        rejected: List[Tuple[int, str]] = []
+        chunk: List[Tuple[int, Dict]] = []
+        for number, record in enumerate(records, 1):
+            try:
+                chunk.append((number, self.convert(record)))
+            except ValueError as e:
+                rejected.append((number, str(e)))
+                continue
+            if len(chunk) >= self.chunk_size:
+                imported += self._flush(chunk, rejected)
+                chunk = []
+        imported += self._flush(chunk, rejected)
+        return ImportResult(imported, rejected, self.boards_created, self.properties_created,
+                            time.perf_counter() - start)
+
+
+def import_tasks(db: DBHelper, path: str, fmt: Optional[str] = None, compress: Optional[bool] = None,
+                 create_missing: bool = True, chunk_size: int = IMPORT_CHUNK_SIZE) -> ImportResult:
+    """从 CSV / JSONL（可gzip压缩）流式导入任务；fmt / compress 为 None 时按文件扩展名推断"""
+    detected_fmt, detected_compress = detect_format(path)
+    fmt = fmt or detected_fmt
+    compress = detected_compress if compress is None else compress
+    source = open_input(path, compress)
+    try:
+        return TaskImporter(db, create_missing, chunk_size).run(read_records(source, fmt))
+    finally:
+        if path == "-":
+            source.detach()  # 不关闭标准输入本身
+        else:
+            source.close()
+
+
+# ------------------------------
+# 命令行：python -m task_import 输入文件
+# ------------------------------
+MAX_REPORTED_REJECTS = 20
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m task_import", description="从 CSV / JSONL 批量导入任务")
+    parser.add_argument("input", help="输入文件（.csv / .jsonl，可加 .gz 压缩），- 表示标准输入")
+    parser.add_argument("--db", default="task_manager.db", help="数据库文件")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="默认按扩展名推断")
+    parser.add_argument("--gzip", action="store_true", default=None, help="gzip压缩（默认按扩展名推断）")
+    parser.add_argument("--no-create", action="store_true", help="板块/属性不存在时拒绝该记录，而不是新建")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="每个事务插入的条数")
+    args = parser.parse_args(argv)
+
+    db = DBHelper(args.db)
+    try:
+        result = import_tasks(db, args.input, args.format, args.gzip, not args.no_create, args.chunk_size)
+    finally:
+        db.close()
+
+    rate = result.imported / max(result.elapsed, 1e-9)
+    print(f"导入 {result.imported} 条任务，拒绝 {len(result.rejected)} 条，"
+          f"新建板块 {result.boards_created} 个、属性 {result.properties_created} 个，"
+          f"用时 {result.elapsed:.2f} 秒（{rate:.0f} 条/秒）", file=sys.stderr)
+    for number, reason in result.rejected[:MAX_REPORTED_REJECTS]:
+        print(f"  第{number}条：{reason}", file=sys.stderr)
+    if len(result.rejected) > MAX_REPORTED_REJECTS:
+        print(f"  ……其余 {len(result.rejected) - MAX_REPORTED_REJECTS} 条略", file=sys.stderr)
+    return 1 if result.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+from typing import Callable, Dict, List, Optional
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QRectF, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPainterPath
+from db_helper import TaskRecord
+
+# 列定义（与原QTableWidget的12列布局一致）
+(COL_NAME, COL_BOARD, COL_PROP, COL_STATUS, COL_STATUS_TIME, COL_EXPECTED_TIME,
+ COL_TARGET, COL_SET, COL_JUMP, COL_OPERATION, COL_PROP_ID, COL_TASK_ID) = range(12)
+
+HEADERS = [
+    "任务名称", "所属板块", "任务属性", "状态", "状态时间",
+    "预计启用时间", "任务目录", "设置目录", "跳转/复制", "操作按钮", "属性ID", "任务ID"
+]
+
+BUTTON_COLUMNS = (COL_SET, COL_JUMP, COL_OPERATION)
+
+# 操作列的功能 -> (显示文本, 按钮颜色)
+OPERATIONS = {
+    "update_status": ("修改状态", "#3498db"),
+    "rename": ("重命名", "#f39c12"),
+    "delete": ("删除任务", "#e74c3c"),
+}
+
+
+class TaskTableModel(QAbstractTableModel):
+    """任务表格模型：行按批次懒加载给视图
+    数据来源二选一：一次性给出的结果集（set_tasks），或按需逐页读取的分页数据源（set_page_source）
+    """
+
+    FETCH_BATCH = 200  # 每次向视图追加的行数
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks: List[TaskRecord] = []
+        self._loaded = 0
+        self._rows: Dict[int, int] = {}  # 任务ID -> 行号
+        self._operations: Dict[int, str] = {}  # 任务ID -> 操作列当前功能
+        # 分页数据源：fetch_page(上一页最后一行或None, 回调)，异步读取下一页后调用回调
+        self._page_source: Optional[Callable] = None
+        self._page_pending = False
+        # 下一页的定位行：上一页返回时的最后一行（update_task 会替换行对象，其排序键可能已改变）
+        self._page_anchor: Optional[TaskRecord] = None
+        self._generation = 0  # 每次重置数据后递增，用于丢弃过期的分页结果
+
+    # ------------------------------
+    # 数据装载
+    # ------------------------------
+    def set_tasks(self, tasks: List[TaskRecord]) -> None:
+        """替换全部结果"""
+        self.beginResetModel()
+        self._generation += 1
+        self._page_source = None
+        self._page_pending = False
+        self._page_anchor = None
+        self._tasks = list(tasks)
+        self._rows = {task.id: row for row, task in enumerate(self._tasks)}
+        self._loaded = min(self.FETCH_BATCH, len(self._tasks))
+        self._operations.clear()
+        self.endResetModel()
+
+    def set_page_source(self, fetch_page: Callable) -> None:
+        """改为从分页数据源逐页读取，立即请求第一页"""
+        self.set_tasks([])
+        self._page_source = fetch_page
+        self.fetchMore()
+
+    def _append_page(self, generation: int, rows: List[TaskRecord]) -> None:
+        if generation != self._generation:
+            return  # 数据已被重置，丢弃过期的页
+        self._page_pending = False
+        if len(rows) < self.FETCH_BATCH:
+            self._page_source = None  # 最后一页
+        if not rows:
+            return
+        self._page_anchor = rows[-1]
+        start = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._tasks.extend(rows)
+        for row, task in enumerate(rows, start):
+            self._rows[task.id] = row
+        self._loaded = len(self._tasks)
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.set_tasks([])
+
+    def task_at(self, row: int) -> Optional[TaskRecord]:
+        if 0 <= row < self._loaded:
+            return self._tasks[row]
+        return None
+
+    def total_count(self) -> int:
+        """结果总数（含尚未加载到视图的行）"""
+        return len(self._tasks)
+
+    def update_task(self, task: Optional[TaskRecord]) -> bool:
+        """用更新后的任务记录原地替换对应行，只刷新该行（滚动位置和选中状态不变）
+        返回该任务是否在当前结果中
+        """
+        if task is None:
+            return False  # 任务已被删除
+        row = self._rows.get(task.id)
+        if row is None:
+            return False
+        self._tasks[row] = task
+        if row < self._loaded:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+        return True
+
+    def operation(self, task_id: int) -> str:
+        return self._operations.get(task_id, "update_status")
+
+    def set_operation(self, task_id: int, function: str) -> None:
+        """切换某行操作按钮的功能，并只刷新该单元格"""
+        self._operations[task_id] = function
+        row = self._rows.get(task_id)
+        if row is not None and row < self._loaded:
+            index = self.index(row, COL_OPERATION)
+            self.dataChanged.emit(index, index)
+
+    # ------------------------------
+    # 懒加载
+    # ------------------------------
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        if self._loaded < len(self._tasks):
+            return True
+        return self._page_source is not None and not self._page_pending
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        if self._loaded >= len(self._tasks) and self._page_source is not None:
+            if not self._page_pending:
+                self._page_pending = True
+                generation = self._generation
+                self._page_source(self._page_anchor, lambda rows: self._append_page(generation, rows))
+            return
+        count = min(self.FETCH_BATCH, len(self._tasks) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    # ------------------------------
+    # QAbstractTableModel 接口
+    # ------------------------------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        task = self._tasks[index.row()]
+        if role == Qt.UserRole:
+            return task
+        if role != Qt.DisplayRole:
+            return None
+
+        column = index.column()
+        if column == COL_NAME:
+            return task.name
+        if column == COL_BOARD:
+            return task.board_name
+        if column == COL_PROP:
+            return task.property_name
+        if column == COL_STATUS:
+            return task.status
+        if column == COL_STATUS_TIME:
+            return str(task.status_time).split('.')[0]
+        if column == COL_EXPECTED_TIME:
+            return task.expected_time or "-"
+        if column == COL_TARGET:
+            # 根据模式显示目录或链接
+            return (task.task_dir if task.link_mode == 0 else task.link_url) or "未设置"
+        if column == COL_SET:
+            return "设置目录" if task.link_mode == 0 else "设置链接"
+        if column == COL_JUMP:
+            return "跳转目录" if task.link_mode == 0 else "复制链接"
+        if column == COL_OPERATION:
+            return OPERATIONS[self.operation(task.id)][0]
+        if column == COL_PROP_ID:
+            return str(task.property_id)
+        if column == COL_TASK_ID:
+            return str(task.id)
+        return None
+
+
+class TaskButtonDelegate(QStyledItemDelegate):
+    """按钮列的绘制代理：只绘制可见单元格，不创建真实的QPushButton"""
+
+    # (行号, 列号)
+    clicked = pyqtSignal(int, int)
+
+    MARGIN = 6
+
+    def _button_rect(self, option) -> QRect:
+        return option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def paint(self, painter, option, index) -> None:
+        if index.column() not in BUTTON_COLUMNS:
+            super().paint(painter, option, index)
+            return
+
+        color = QColor("#3498db")
+        if index.column() == COL_OPERATION:
+            task = index.data(Qt.UserRole)
+            model = index.model()
+            color = QColor(OPERATIONS[model.operation(task.id)][1])
+        if option.state & QStyle.State_MouseOver:
+            color = color.darker(115)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(self._button_rect(option)), 6, 6)
+        painter.fillPath(path, color)
+        painter.setPen(QColor("white"))
+        painter.setFont(option.font)
+        painter.drawText(self._button_rect(option), Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if index.column() not in BUTTON_COLUMNS:
+            return super().editorEvent(event, model, option, index)
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and self._button_rect(option).contains(event.pos())):
+            self.clicked.emit(index.row(), index.column())
+            return True
+        return False
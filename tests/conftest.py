@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+import pytest
+
+# 仓库中的模块都在根目录下，直接导入；界面测试使用 offscreen 平台，不需要显示器
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from db_helper import DBHelper  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "task_manager.db")
+
+
+@pytest.fixture
+def db(db_path):
+    helper = DBHelper(db_path)
+    yield helper
+    helper.close()
+
+
+@pytest.fixture
+def qapp():
+    widgets = pytest.importorskip("PyQt5.QtWidgets")
+    return widgets.QApplication.instance() or widgets.QApplication([])
+
+
+@pytest.fixture
+def wait_db(qapp):
+    """返回等待函数：处理事件直到 AsyncDB 的请求全部返回"""
+    from PyQt5.QtCore import QEventLoop
+
+    def wait(async_db, timeout_s: float = 10) -> None:
+        deadline = time.monotonic() + timeout_s
+        while async_db.is_busy():
+            assert time.monotonic() < deadline, "等待数据库请求超时"
+            qapp.processEvents(QEventLoop.AllEvents | QEventLoop.WaitForMoreEvents, 50)
+        qapp.processEvents()
+    return wait
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from db_helper import DBHelper, TaskQuery
+from task_export import export_tasks
+from task_import import import_tasks
+
+# 导入后ID可能不同，按名称比较板块和属性
+COMPARED_FIELDS = ("name", "board_name", "year", "month", "status", "status_time", "expected_time",
+                   "task_dir", "property_name", "link_mode", "link_url")
+
+
+@pytest.fixture
+def source_db(db):
+    db.add_board("研发")
+    db.add_board("运营, \"活动\"")
+    db.add_custom_property("客户项目")
+    db.add_tasks([
+        {"board_id": 1, "name": "接口文档", "status": "待启用", "year": 2024, "month": 1,
+         "status_time": "2024-01-05 09:30:00", "expected_time": "2024-02-01", "task_dir": "D:/工作/接口"},
+        {"board_id": 1, "name": "含逗号, \"引号\"\n和换行", "status": "初开启", "year": 2024, "month": 2,
+         "status_time": "2024-02-10 18:00:00", "property_id": 4},
+        {"board_id": 2, "name": "活动页", "status": "已完成", "year": 2023, "month": 12,
+         "status_time": "2023-12-31 23:59:59", "link_mode": 1, "link_url": "https://example.com/活动?a=1&b=2"},
+    ])
+    return db
+
+
+def snapshot(db: DBHelper, query: TaskQuery = TaskQuery(order="id")) -> list:
+    return [tuple(getattr(task, field) for field in COMPARED_FIELDS) for task in db.find_tasks(query)]
+
+
+@pytest.mark.parametrize("file_name", ["tasks.csv", "tasks.jsonl", "tasks.csv.gz", "tasks.jsonl.gz"])
+def test_export_then_import_round_trip(source_db, tmp_path, file_name):
+    path = str(tmp_path / file_name)
+    assert export_tasks(source_db, path, TaskQuery(order="id")) == 3
+
+    target = DBHelper(str(tmp_path / "target.db"))
+    try:
+        result = import_tasks(target, path)
+        assert (result.imported, result.rejected, result.boards_created, result.properties_created) == (3, [], 2, 1)
+        assert snapshot(target) == snapshot(source_db)
+        # 再导入一次：板块和属性按名称复用
+        result = import_tasks(target, path)
+        assert (result.imported, result.boards_created, result.properties_created) == (3, 0, 0)
+        assert target.count_all_tasks() == 6
+    finally:
+        target.close()
+
+
+def test_export_applies_query(source_db, tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    assert export_tasks(source_db, str(path), TaskQuery(board_id=1, statuses=("初开启",))) == 1
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["name"] == "含逗号, \"引号\"\n和换行" and record["property_name"] == "客户项目"
+
+
+def test_export_to_stdout(source_db, capfdbinary):
+    assert export_tasks(source_db, "-", TaskQuery(order="id"), fmt="jsonl") == 3
+    lines = capfdbinary.readouterr().out.decode("utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [row[0] for row in snapshot(source_db)]
+
+
+def test_invalid_records_are_rejected_with_their_numbers(db, tmp_path):
+    db.add_board("研发")
+    path = tmp_path / "tasks.jsonl"
+    records = [
+        {"board_name": "研发", "name": "正常", "status": "待启用"},
+        {"board_name": "研发", "name": "", "status": "待启用"},
+        {"board_name": "研发", "name": "状态错误", "status": "进行中"},
+        {"board_name": "研发", "name": "月份错误", "status": "待启用", "month": 13},
+        {"board_id": 99, "name": "板块ID不存在", "status": "待启用"},
+        {"board_name": "新板块", "name": "状态时间错误", "status": "待启用", "status_time": "not-a-date"},
+        {"board_name": "新板块", "name": "预计时间错误", "status": "待启用", "expected_time": "soon"},
+        {"board_name": "研发", "name": "日期不存在", "status": "待启用", "expected_time": "2024-02-30"},
+        {"board_name": "新板块", "name": "新板块的任务", "status": "已完成", "property_name": "新属性"},
+    ]
+    path.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n{坏行\n",
+                    encoding="utf-8")
+
+    result = import_tasks(db, str(path), create_missing=False)
+    assert result.imported == 1
+    assert [number for number, _ in result.rejected] == [2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+    result = import_tasks(db, str(path))
+    assert result.imported == 2 and (result.boards_created, result.properties_created) == (1, 1)
+    assert [number for number, _ in result.rejected] == [2, 3, 4, 5, 6, 7, 8, 10]
+    assert "status_time" in dict(result.rejected)[6] and "expected_time" in dict(result.rejected)[7]
+    assert [task.property_name for task in db.search_tasks_by_name("新板块的任务")] == ["新属性"]
+
+
+def test_times_are_normalized(db, tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("board_name,name,status,status_time,expected_time\n"
+                    "研发,只有日期,待启用,2024-03-01,2024-04-01 12:00:00\n", encoding="utf-8")
+    assert import_tasks(db, str(path)).imported == 1
+    task = db.search_tasks_by_name("只有日期")[0]
+    assert (task.status_time, task.expected_time) == ("2024-03-01 00:00:00", "2024-04-01")
@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+
+@pytest.fixture
+def window(qapp, db_path):
+    import main
+    window = main.TaskManager(db_path)
+    yield window
+    window.close()
+
+
+def test_refresh_without_search_panel(window, wait_db, db_path):
+    # 批量操作后刷新：未选中月份且从未打开查询面板时按面板默认值（本月）查询，不为此创建面板和检索线程
+    from datetime import date
+    from db_helper import DBHelper
+
+    today = date.today()
+    db = DBHelper(db_path)
+    try:
+        db.add_board("研发")
+        board_id = db.get_board_id_by_name("研发")
+        db.add_task(board_id, "本月任务", "待启用", year=today.year, month=today.month)
+        db.add_task(board_id, "去年任务", "待启用", year=today.year - 1, month=today.month)
+    finally:
+        db.close()
+
+    wait_db(window.db)
+    window.refresh_task_view()
+    wait_db(window.db)
+    assert [window.task_model.task_at(row).name for row in range(window.task_model.total_count())] == ["本月任务"]
+    assert window.search_panel is None and window.name_search_worker is None
+
+    window.search_panel_btn.setChecked(True)
+    assert not window.search_panel.isHidden()
+    assert window.name_search_worker.isRunning()
+
+
+def test_button_clicks_dispatch_by_column_and_mode(window, qapp, wait_db, db_path, monkeypatch):
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtTest import QTest
+    from db_helper import DBHelper, TaskQuery
+    from task_model import COL_SET, COL_JUMP, COL_OPERATION
+
+    db = DBHelper(db_path)
+    try:
+        db.add_board("研发")
+        board_id = db.get_board_id_by_name("研发")
+        db.add_task(board_id, "目录任务", "待启用", task_dir="D:/work", link_mode=0)
+        db.add_task(board_id, "链接任务", "待启用", link_url="https://example.com", link_mode=1)
+        tasks = db.find_tasks(TaskQuery(order="id"))
+    finally:
+        db.close()
+
+    calls = []
+    for name in ("set_task_dir", "set_task_link", "jump_to_dir", "copy_task_link",
+                 "update_task_status", "rename_task", "delete_task"):
+        monkeypatch.setattr(window, name, lambda task_id, name=name: calls.append((name, task_id)))
+
+    window.resize(2400, 1400)
+    window.show()
+    wait_db(window.db)
+    window.task_model.set_tasks(tasks)
+    qapp.processEvents()
+    dir_task, link_task = tasks
+
+    def click(row: int, column: int) -> None:
+        index = window.task_model.index(row, column)
+        window.task_table.scrollTo(index)
+        rect = window.task_table.visualRect(index)
+        QTest.mouseClick(window.task_table.viewport(), Qt.LeftButton, Qt.NoModifier, rect.center())
+
+    click(0, COL_SET)
+    click(1, COL_SET)
+    click(0, COL_JUMP)
+    click(1, COL_JUMP)
+    click(0, COL_OPERATION)
+    window.switch_operation_function(link_task.id, "rename")
+    click(1, COL_OPERATION)
+    window.switch_operation_function(link_task.id, "delete")
+    click(1, COL_OPERATION)
+    assert calls == [
+        ("set_task_dir", dir_task.id), ("set_task_link", link_task.id),
+        ("jump_to_dir", dir_task.id), ("copy_task_link", link_task.id),
+        ("update_task_status", dir_task.id), ("rename_task", link_task.id), ("delete_task", link_task.id),
+    ]
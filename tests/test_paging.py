@@ -0,0 +1,77 @@
+from typing import List
+
+import pytest
+
+from db_helper import DBHelper, TaskQuery, TaskRecord
+
+
+@pytest.fixture
+def tied_db(db):
+    """47 条任务：状态时间只有 3 个不同取值，名称只有 5 个不同取值，翻页边界必然落在取值相同的记录中间"""
+    db.add_board("板块")
+    db.add_tasks({"board_id": 1, "name": f"任务{i % 5}", "status": "待启用", "year": 2024, "month": 1 + i % 2,
+                  "status_time": f"2024-0{1 + i % 3}-01 08:00:00"} for i in range(47))
+    return db
+
+
+def fetch_all_pages(db: DBHelper, query: TaskQuery, limit: int) -> List[List[TaskRecord]]:
+    pages, after = [], None
+    while True:
+        page = db.find_tasks(query, after, limit)
+        if not page:
+            return pages
+        pages.append(page)
+        after = page[-1]
+
+
+@pytest.mark.parametrize("order", ["status_time", "name", "id"])
+@pytest.mark.parametrize("limit", [1, 4, 10, 47, 100])
+def test_pages_cover_every_task_once_in_order(tied_db, order, limit):
+    query = TaskQuery(order=order)
+    pages = fetch_all_pages(tied_db, query, limit)
+    assert [task.id for page in pages for task in page] == [task.id for task in tied_db.find_tasks(query)]
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_status_time_order_breaks_ties_by_id(tied_db):
+    tasks = tied_db.find_tasks(TaskQuery())
+    assert [(task.status_time, task.id) for task in tasks] == sorted(
+        ((task.status_time, task.id) for task in tasks), reverse=True)
+
+
+def test_pages_apply_filters(tied_db):
+    query = TaskQuery(month=2, name="任务3")
+    pages = fetch_all_pages(tied_db, query, 2)
+    ids = [task.id for page in pages for task in page]
+    assert ids == [task.id for task in tied_db.find_tasks(query)]
+    assert len(ids) == tied_db.count_tasks(query) > 2
+
+
+def test_page_methods_continue_after_last_row(tied_db):
+    first = tied_db.get_tasks_by_time_status_page(2024, limit=20)
+    second = tied_db.get_tasks_by_time_status_page(2024, after=first[-1], limit=20)
+    rest = tied_db.get_tasks_by_time_status_page(2024, after=second[-1], limit=20)
+    assert len(first) == len(second) == 20 and len(rest) == 7
+    assert [task.id for task in first + second + rest] == [task.id for task in tied_db.get_tasks_by_time_status(2024)]
+    assert tied_db.count_tasks_by_time_status(2024) == 47
+
+
+def test_relevance_order_rejects_after(tied_db):
+    first = tied_db.find_tasks(TaskQuery(name="任务3", order="relevance"), limit=2)
+    with pytest.raises(ValueError):
+        tied_db.find_tasks(TaskQuery(name="任务3", order="relevance"), first[-1], 2)
+
+
+@pytest.mark.parametrize("order", ["status_time", "name", "id"])
+def test_iter_tasks_matches_find_tasks(tied_db, order):
+    query = TaskQuery(order=order)
+    assert [task.id for task in tied_db.iter_tasks(query, batch_size=4)] == [
+        task.id for task in tied_db.find_tasks(query)]
+
+
+def test_iter_tasks_does_not_disturb_other_queries(tied_db):
+    seen = []
+    for task in tied_db.iter_tasks(TaskQuery(order="id"), batch_size=5):
+        # 迭代期间在同一连接上执行其他查询
+        seen.append(tied_db.get_task(task.id).id)
+    assert seen == list(range(1, 48))
@@ -0,0 +1,139 @@
+import pytest
+
+from db_helper import DBHelper, TaskQuery
+from result_cache import CacheScope, ChangedKey, ResultCache
+
+
+# ------------------------------
+# ResultCache
+# ------------------------------
+def test_lru_eviction_by_entries_and_rows():
+    cache = ResultCache(max_entries=2, max_rows=100)
+    cache.put("a", ["a"], 1, CacheScope())
+    cache.put("b", ["b"], 1, CacheScope())
+    cache.get("a")
+    cache.put("c", ["c"], 1, CacheScope())
+    assert cache.get("b") is None and cache.get("a") == ["a"] and cache.get("c") == ["c"]
+
+    cache = ResultCache(max_entries=10, max_rows=100)
+    for key in "abcd":
+        cache.put(key, [key], 25, CacheScope())
+    cache.put("e", ["e"], 25, CacheScope())
+    assert cache.get("a") is None and len(cache) == 4
+    assert cache.stats()["evictions"] == 1
+
+
+def test_large_results_are_not_cached():
+    cache = ResultCache(max_entries=10, max_rows=100)
+    cache.put("big", ["big"], 26, CacheScope())
+    assert cache.get("big") is None and len(cache) == 0
+
+
+def test_invalidate_only_affected_scopes():
+    cache = ResultCache()
+    cache.put("board1", [], 1, CacheScope(board_id=1))
+    cache.put("board2_2024", [], 1, CacheScope(board_id=2, ym_from=(2024, 1), ym_to=(2024, 12)))
+    cache.put("property5", [], 1, CacheScope(property_ids=(5,)))
+    cache.put("all", [], 1, CacheScope())
+
+    cache.invalidate([ChangedKey(2, (2023, 6), 3)])
+    assert set(cache._entries) == {"board1", "board2_2024", "property5"}
+    cache.invalidate([ChangedKey(board_id=2, property_id=3)])  # 板块的任意年月
+    assert set(cache._entries) == {"board1", "property5"}
+    cache.invalidate([ChangedKey(property_id=5)])  # 任意板块
+    assert len(cache) == 0
+    assert cache.stats()["invalidations"] == 4
+
+
+def test_too_many_changed_keys_clear_everything():
+    cache = ResultCache()
+    cache.put("board1", [], 1, CacheScope(board_id=1))
+    cache.invalidate([ChangedKey(board_id) for board_id in range(2, ResultCache.MAX_CHANGED_KEYS + 3)])
+    assert len(cache) == 0
+
+
+# ------------------------------
+# DBHelper：修改后作废受影响的缓存结果
+# ------------------------------
+@pytest.fixture
+def cached_db(db):
+    for name in ("板块一", "板块二"):
+        db.add_board(name)
+    db.add_tasks({"board_id": 1 + i % 2, "name": f"任务{i}", "status": "待启用", "year": 2024, "month": 3}
+                 for i in range(10))
+    return db
+
+
+def names(tasks) -> set:
+    return {task.name for task in tasks}
+
+
+def test_repeated_query_is_served_from_cache(cached_db):
+    first = cached_db.get_tasks_by_board_month(1, 2024, 3)
+    hits = cached_db.cache_stats()["hits"]
+    first.clear()  # 调用方修改返回的列表不影响缓存
+    assert len(cached_db.get_tasks_by_board_month(1, 2024, 3)) == 5
+    assert cached_db.cache_stats()["hits"] == hits + 1
+
+
+def test_switching_search_mode_is_not_served_from_cache(cached_db):
+    assert cached_db.fts_enabled
+    full_text = names(cached_db.search_tasks_by_name("任务1"))
+    hits = cached_db.cache_stats()["hits"]
+    cached_db.fts_enabled = False  # 回退 LIKE
+    assert names(cached_db.search_tasks_by_name("任务1")) == full_text
+    assert cached_db.count_tasks_by_name("任务1") == len(full_text)
+    assert cached_db.cache_stats()["hits"] == hits
+
+
+def test_write_to_other_board_keeps_cached_result(cached_db):
+    cached_db.get_tasks_by_board_month(1, 2024, 3)
+    cached_db.add_task(2, "板块二的新任务", "待启用", year=2024, month=3)
+    hits = cached_db.cache_stats()["hits"]
+    assert len(cached_db.get_tasks_by_board_month(1, 2024, 3)) == 5
+    assert cached_db.cache_stats()["hits"] == hits + 1
+
+
+@pytest.mark.parametrize("write, expected", [
+    (lambda db: db.add_task(1, "新任务", "待启用", year=2024, month=3), 6),
+    (lambda db: db.add_tasks([{"board_id": 1, "name": "批量新任务", "status": "待启用", "year": 2024, "month": 3}]), 6),
+    (lambda db: db.delete_task(1), 4),
+    (lambda db: db.delete_tasks([1, 3, 5]), 2),
+    (lambda db: db.update_tasks_status([1, 3], "已完成"), 3),
+    (lambda db: db.update_task_property(1, 1), 4),
+    (lambda db: db.update_tasks_property([1, 3], 1), 3),
+    (lambda db: db.delete_board(1), 0),
+])
+def test_writes_invalidate_cached_results(cached_db, write, expected):
+    query = TaskQuery(board_id=1, year=2024, month=3, statuses=("待启用",), property_ids=(3,))
+    assert len(cached_db.find_tasks(query)) == cached_db.count_tasks(query) == 5
+    write(cached_db)
+    assert len(cached_db.find_tasks(query)) == cached_db.count_tasks(query) == expected
+
+
+def test_rename_refreshes_cached_rows(cached_db):
+    cached_db.search_tasks_by_name("任务")
+    cached_db.update_task_name(1, "改名后的任务")
+    assert "改名后的任务" in names(cached_db.search_tasks_by_name("任务"))
+    cached_db.get_tasks_by_board(1)
+    cached_db.update_board_name(1, "新板块名")
+    assert {task.board_name for task in cached_db.get_tasks_by_board(1)} == {"新板块名"}
+
+
+def test_commit_from_other_connection_clears_cache(cached_db, db_path):
+    cached_db.get_tasks_by_board(1)
+    other = DBHelper(db_path)
+    try:
+        other.add_task(1, "其他连接新建的任务", "待启用", year=2024, month=3)
+    finally:
+        other.close()
+    assert "其他连接新建的任务" in names(cached_db.get_tasks_by_board(1))
+
+
+def test_rolled_back_transaction_does_not_leave_stale_results(cached_db):
+    with pytest.raises(RuntimeError):
+        with cached_db.transaction():
+            cached_db.add_task(1, "回滚的任务", "待启用", year=2024, month=3)
+            assert "回滚的任务" in names(cached_db.get_tasks_by_board(1))
+            raise RuntimeError
+    assert "回滚的任务" not in names(cached_db.get_tasks_by_board(1))
@@ -0,0 +1,100 @@
+import sqlite3
+
+import pytest
+
+from db_helper import DBHelper, DEFAULT_PROFILE, TaskQuery
+
+
+@pytest.fixture
+def filled_db(db_path):
+    db = DBHelper(db_path, DEFAULT_PROFILE._replace(result_cache_entries=0))
+    db.add_board("板块")
+    db.add_tasks({"board_id": 1, "name": f"任务{i}", "status": "待启用", "year": 2024, "month": 1 + i % 12,
+                  "expected_time": f"2024-{1 + i % 12:02d}-15"} for i in range(2000))
+    yield db
+    db.close()
+
+
+def task_query_plan(db: DBHelper, call) -> list:
+    """执行 call，返回其中读取 tasks 表的那条查询的 EXPLAIN QUERY PLAN 各行"""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    queries = [sql for sql in statements if "FROM tasks t" in sql]
+    assert len(queries) == 1
+    return [row[3] for row in db.conn.execute("EXPLAIN QUERY PLAN " + queries[0])]
+
+
+@pytest.mark.parametrize("call, index", [
+    (lambda db: db.get_tasks_by_board(1), "idx_tasks_board_ym_time (board_id=?)"),
+    (lambda db: db.get_tasks_by_board_month(1, 2024, 3), "idx_tasks_board_ym_time (board_id=? AND year=? AND month=?)"),
+    (lambda db: db.get_tasks_by_time_status(2024, 3, "待启用"), "idx_tasks_ym_status_time (year=? AND month=? AND status=?)"),
+    (lambda db: db.get_tasks_by_time_status(2024, 3), "idx_tasks_ym_time (year=? AND month=?)"),
+    (lambda db: db.get_tasks_by_time_status(), "idx_tasks_status_time"),
+    (lambda db: db.get_tasks_by_property(2), "idx_tasks_property_time (property_id=?)"),
+    (lambda db: db.get_tasks_by_link_mode(1), "idx_tasks_link_mode_time (link_mode=?)"),
+    (lambda db: db.get_all_tasks_order_by_name(), "idx_tasks_name"),
+    (lambda db: db.find_tasks(TaskQuery(expected_from="2024-01-01", expected_to="2024-03-31")),
+     "idx_tasks_expected_time (expected_time>? AND expected_time<?)"),
+])
+def test_queries_use_composite_indexes(filled_db, call, index):
+    plan = task_query_plan(filled_db, lambda: call(filled_db))
+    assert plan[0].endswith(f"USING INDEX {index}")
+    # 列表顺序由索引给出，不另行排序（预计启用时间区间按状态时间排序，需要排序）
+    if "expected_time" not in index:
+        assert plan == plan[:1]
+
+
+def test_new_database_is_at_latest_version(db):
+    assert db.conn.execute("PRAGMA user_version").fetchone()[0] == len(DBHelper.SCHEMA_MIGRATIONS)
+
+
+def test_failed_migration_step_is_rolled_back(db_path):
+    DBHelper(db_path).close()
+
+    class BrokenMigration(DBHelper):
+        # 新增一步：建表成功后，下一条语句失败
+        SCHEMA_MIGRATIONS = DBHelper.SCHEMA_MIGRATIONS + [[
+            "CREATE TABLE migration_probe (value INTEGER)",
+            "INSERT INTO migration_probe SELECT missing_column FROM tasks",
+        ]]
+
+    with pytest.raises(sqlite3.OperationalError):
+        BrokenMigration(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(DBHelper.SCHEMA_MIGRATIONS)
+        tables = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert "migration_probe" not in tables
+    finally:
+        conn.close()
+
+
+def test_migrates_old_database_in_steps(db_path):
+    db = DBHelper(db_path)
+    db.add_board("板块")
+    db.add_task(1, "旧任务", "待启用")
+    db.close()
+    # 退回版本0：删掉迁移建立的索引、计数表、状态记录及其触发器
+    conn = sqlite3.connect(db_path)
+    objects = conn.execute("SELECT type, name FROM sqlite_master WHERE sql IS NOT NULL AND "
+                           "(name LIKE 'idx_tasks_%' OR name LIKE 'idx_status_events_%' OR "
+                           "name LIKE 'task_counts%' OR name LIKE 'task_status_events%')").fetchall()
+    for kind, name in objects:
+        conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    db = DBHelper(db_path)
+    try:
+        assert db.conn.execute("PRAGMA user_version").fetchone()[0] == len(DBHelper.SCHEMA_MIGRATIONS)
+        assert db.count_all_tasks() == 1
+        assert [item.total for item in db.task_statistics()] == [1]
+        assert [status for status, _ in db.get_task_status_history(1)] == ["待启用"]
+    finally:
+        db.close()
@@ -0,0 +1,118 @@
+import random
+import sqlite3
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+from db_helper import DBHelper, TaskQuery, TASK_STATUSES
+
+COUNT_COLUMNS = "board_id, year, month, property_id, status, IFNULL(link_mode, 0)"
+
+
+def random_tasks(count: int, board_ids, seed: int = 1):
+    rng = random.Random(seed)
+    today = date.today()
+    for i in range(count):
+        yield {"board_id": rng.choice(board_ids), "name": f"任务{i}", "status": rng.choice(TASK_STATUSES),
+               "year": rng.choice((2023, 2024)), "month": rng.randint(1, 12), "property_id": rng.randint(1, 4),
+               "link_mode": rng.randint(0, 1),
+               "expected_time": (today + timedelta(days=rng.randint(-20, 20))).isoformat()}
+
+
+def assert_counts_consistent(db: DBHelper) -> None:
+    """计数表（去掉计数为0的行）与按 tasks 表现算的分组计数一致"""
+    counted = db.conn.execute(
+        f"SELECT {COUNT_COLUMNS}, task_count FROM task_counts WHERE task_count != 0 ORDER BY 1, 2, 3, 4, 5, 6"
+    ).fetchall()
+    actual = db.conn.execute(
+        f"SELECT {COUNT_COLUMNS}, COUNT(*) FROM tasks GROUP BY {COUNT_COLUMNS} ORDER BY 1, 2, 3, 4, 5, 6"
+    ).fetchall()
+    assert counted == actual
+
+
+def trigger_names(db: DBHelper) -> set:
+    return {name for name, in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+@pytest.fixture
+def stats_db(db):
+    for name in ("板块一", "板块二", "板块三"):
+        db.add_board(name)
+    db.add_custom_property("自定义")
+    return db
+
+
+def test_counts_follow_every_kind_of_write(stats_db):
+    db = stats_db
+    triggers = trigger_names(db)
+    db.add_tasks(random_tasks(50, [1, 2, 3]))  # 少量：逐行触发器
+    assert_counts_consistent(db)
+    db.add_tasks(random_tasks(DBHelper.BULK_TRIGGER_THRESHOLD + 200, [1, 2, 3], seed=2))  # 批量：暂停触发器后一次性写入
+    assert_counts_consistent(db)
+    assert trigger_names(db) == triggers
+
+    db.add_task(1, "单条", "初开启", property_id=4, year=2024, month=5, link_mode=1)
+    db.update_task_status(1, "已完成")
+    db.update_task_property(2, 4)
+    db.update_task_link_mode(3, 1)
+    db.update_tasks_status(range(10, 400), "初开启")
+    db.update_tasks_property(range(300, 700), 2)
+    db.update_tasks_link_mode(range(600, 900), 0)
+    assert_counts_consistent(db)
+
+    db.delete_task(5)
+    db.delete_tasks(range(900, 1000))
+    db.delete_property(4)   # 任务属性改为默认的"未知"
+    db.delete_board(3)      # 级联删除板块的任务
+    assert_counts_consistent(db)
+    assert db.count_all_tasks() == db.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+
+def test_failed_bulk_insert_leaves_counts_and_triggers_intact(stats_db):
+    db = stats_db
+    db.add_tasks(random_tasks(20, [1, 2]))
+    triggers = trigger_names(db)
+    tasks = list(random_tasks(DBHelper.BULK_TRIGGER_THRESHOLD + 10, [1, 2], seed=3))
+    tasks[-1]["status"] = "无效状态"
+    with pytest.raises(sqlite3.IntegrityError):
+        db.add_tasks(tasks)
+    assert trigger_names(db) == triggers
+    assert db.count_all_tasks() == 20
+    assert_counts_consistent(db)
+
+
+def test_statistics_match_counts_from_rows(stats_db):
+    db = stats_db
+    tasks = list(random_tasks(300, [1, 2, 3]))
+    db.add_tasks(tasks)
+    today = date.today().isoformat()
+    expected = Counter()
+    for task in tasks:
+        key = (task["board_id"], task["status"])
+        expected[key + ("total",)] += 1
+        expected[key + ("completed",)] += task["status"] == "已完成"
+        expected[key + ("overdue",)] += task["status"] != "已完成" and task["expected_time"] < today
+
+    boards = dict(db.get_all_boards())
+    stats = db.task_statistics(group_by=("board", "status"))
+    assert sum(row.total for row in stats) == 300
+    for row in stats:
+        assert (row.total, row.completed, row.overdue) == tuple(
+            expected[row.group + (field,)] for field in ("total", "completed", "overdue"))
+        assert row.labels == (boards[row.group[0]], row.group[1])
+
+
+def test_statistics_with_row_filter_match_counter_table_path(stats_db):
+    db = stats_db
+    db.add_tasks(random_tasks(200, [1, 2, 3]))
+    # 名称条件不在计数表中，改为读 tasks 表；两条路径按相同条件得到相同结果
+    by_counts = db.task_statistics(TaskQuery(year=2024), group_by=("month", "property"))
+    by_rows = db.task_statistics(TaskQuery(year=2024, name="任务"), group_by=("month", "property"))
+    assert by_counts == by_rows
+    assert [row.group[0] for row in by_counts] == sorted(row.group[0] for row in by_counts)
+
+
+def test_unknown_group_by_is_rejected(stats_db):
+    with pytest.raises(ValueError):
+        stats_db.task_statistics(group_by=("weekday",))
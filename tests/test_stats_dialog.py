@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import QDate  # noqa: E402
+import stats_dialog  # noqa: E402
+
+
+class RecordingDB:
+    """只记录调用的数据库替身（统计面板只通过 call 访问数据库）"""
+
+    def __init__(self):
+        self.calls = []
+
+    def call(self, method, *args, on_result=None, on_error=None):
+        self.calls.append((method, args))
+        return len(self.calls)
+
+
+def test_month_range_is_validated_before_querying(qapp, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(stats_dialog.QMessageBox, "warning", lambda *args: warnings.append(args[2]))
+    db = RecordingDB()
+    dialog = stats_dialog.StatsDialog(db)
+    dialog.month_from_edit.setDate(QDate(2024, 5, 1))
+    dialog.month_to_edit.setDate(QDate(2024, 3, 1))
+    db.calls.clear()
+
+    dialog.month_check.setChecked(True)
+    assert warnings == ["起始月份不能晚于结束月份！"]
+    assert db.calls == []
+
+    dialog.month_to_edit.setDate(QDate(2024, 5, 20))  # 同一月份
+    method, (query, group_by) = db.calls[-1]
+    assert method == "task_statistics"
+    assert (query.year_month_from, query.year_month_to) == ((2024, 5), (2024, 5))
+    assert len(warnings) == 1
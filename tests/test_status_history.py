@@ -0,0 +1,149 @@
+import sqlite3
+
+import pytest
+
+from db_helper import DBHelper
+
+
+@pytest.fixture
+def history_db(db):
+    db.add_board("板块一")
+    db.add_board("板块二")
+    return db
+
+
+def set_status_at(db: DBHelper, task_id: int, status: str, status_time: str) -> None:
+    """以指定的状态时间修改状态（update_task_status 总是取当前时间）"""
+    with db.transaction():
+        db.cursor.execute("UPDATE tasks SET status = ?, status_time = ? WHERE id = ?", (status, status_time, task_id))
+
+
+def drop_status_events(db_path: str, *statements: str) -> None:
+    """删掉状态记录表及其触发器、索引并退回版本0（再执行 statements），重新打开时由迁移补记已有任务"""
+    conn = sqlite3.connect(db_path)
+    try:
+        for kind, name in conn.execute("SELECT type, name FROM sqlite_master WHERE sql IS NOT NULL AND "
+                                       "(name LIKE 'task_status_events%' OR name LIKE 'idx_status_events_%')"
+                                       ).fetchall():
+            conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+        for sql in statements:
+            conn.execute(sql)
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_new_task_and_each_status_change_are_recorded(history_db):
+    db = history_db
+    task_id = db.add_task(1, "任务", "待启用")
+    assert [status for status, _ in db.get_task_status_history(task_id)] == ["待启用"]
+    db.update_task_status(task_id, "初开启")
+    db.update_task_status(task_id, "初开启")  # 状态未变，不记录
+    db.update_task_name(task_id, "改名")
+    db.update_task_status(task_id, "已完成")
+    history = db.get_task_status_history(task_id)
+    assert [status for status, _ in history] == ["待启用", "初开启", "已完成"]
+    assert history[-1][1] == db.conn.execute("SELECT status_time FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+
+def test_bulk_status_update_is_recorded(history_db):
+    db = history_db
+    db.add_tasks({"board_id": 1, "name": f"任务{i}", "status": "待启用"} for i in range(5))
+    db.update_tasks_status([1, 2, 3], "已完成")
+    assert [len(db.get_task_status_history(task_id)) for task_id in range(1, 6)] == [2, 2, 2, 1, 1]
+
+
+@pytest.mark.parametrize("count", [10, DBHelper.BULK_TRIGGER_THRESHOLD + 5])
+def test_added_tasks_get_one_event_at_their_status_time(history_db, count):
+    db = history_db
+    db.add_task(1, "已有任务", "初开启")
+    db.add_tasks({"board_id": 1, "name": f"任务{i}", "status": "已完成",
+                  "status_time": f"2024-03-{1 + i % 28:02d} 10:00:00"} for i in range(count))
+    assert db.conn.execute("SELECT COUNT(*) FROM task_status_events").fetchone()[0] == count + 1
+    assert db.get_task_status_history(1) == [("初开启", db.get_task(1).status_time)]
+    assert db.get_task_status_history(count + 1) == [("已完成", f"2024-03-{1 + (count - 1) % 28:02d} 10:00:00")]
+
+
+def test_deleting_tasks_removes_their_events(history_db):
+    db = history_db
+    for board_id in (1, 1, 2):
+        db.add_task(board_id, "任务", "待启用")
+    db.update_task_status(1, "已完成")
+    db.delete_task(1)
+    db.delete_board(2)
+    assert db.conn.execute("SELECT DISTINCT task_id FROM task_status_events").fetchall() == [(2,)]
+
+
+def test_lead_time_and_status_duration(history_db):
+    db = history_db
+    db.add_tasks([
+        {"board_id": 1, "name": "一", "status": "待启用", "status_time": "2024-01-01 00:00:00"},
+        {"board_id": 1, "name": "二", "status": "待启用", "status_time": "2024-01-01 00:00:00"},
+        {"board_id": 2, "name": "三", "status": "待启用", "status_time": "2024-01-01 00:00:00"},
+    ])
+    set_status_at(db, 1, "初开启", "2024-01-02 00:00:00")
+    set_status_at(db, 1, "已完成", "2024-01-04 00:00:00")   # 3天完成
+    set_status_at(db, 2, "已完成", "2024-01-02 00:00:00")   # 1天完成
+    set_status_at(db, 3, "初开启", "2024-01-03 00:00:00")   # 未完成
+    day = 24 * 3600
+
+    lead_times = db.lead_time_statistics()
+    assert [(row.group, row.completed, row.avg_seconds, row.max_seconds) for row in lead_times] == [
+        ((1,), 2, 2 * day, 3 * day)]
+    assert db.lead_time_statistics(since="2024-01-03") == [lead_times[0]._replace(
+        completed=1, avg_seconds=3 * day)]
+
+    durations = {(row.group, row.status): row for row in db.status_duration_statistics()}
+    waiting = durations[((1,), "待启用")]
+    assert (waiting.intervals, waiting.ongoing, waiting.total_seconds) == (2, 0, 2 * day)
+    started = durations[((1,), "初开启")]
+    assert (started.intervals, started.ongoing, started.avg_seconds) == (1, 0, 2 * day)
+    assert durations[((2,), "初开启")].ongoing == 1
+
+
+def test_tasks_first_recorded_as_done_have_no_lead_time(history_db, db_path):
+    db = history_db
+    # 导入的已完成任务：唯一的记录就是已完成
+    db.add_tasks([{"board_id": 1, "name": "导入", "status": "已完成", "status_time": "2024-01-05 00:00:00"}])
+    # 迁移前已完成的任务：由迁移补记当前状态
+    db.add_task(1, "旧任务", "待启用")
+    db.update_task_status(2, "已完成")
+    db.close()
+    drop_status_events(db_path)
+
+    db = DBHelper(db_path)
+    try:
+        assert [len(db.get_task_status_history(task_id)) for task_id in (1, 2)] == [1, 1]
+        assert db.lead_time_statistics() == []
+        # 重新打开后再次完成的，从第一条记录起计
+        set_status_at(db, 1, "初开启", "2024-01-06 00:00:00")
+        set_status_at(db, 1, "已完成", "2024-01-08 00:00:00")
+        assert [(row.completed, row.avg_seconds) for row in db.lead_time_statistics()] == [(1, 3 * 24 * 3600)]
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("count", [1, DBHelper.BULK_TRIGGER_THRESHOLD])
+def test_unparseable_status_time_is_rejected(history_db, count):
+    db = history_db
+    tasks = [{"board_id": 1, "name": f"任务{i}", "status": "待启用"} for i in range(count)]
+    tasks[-1]["status_time"] = "not-a-date"
+    with pytest.raises(sqlite3.IntegrityError):
+        db.add_tasks(tasks)
+    assert db.count_all_tasks() == 0
+
+
+def test_migration_records_legacy_unparseable_status_time_at_migration_time(history_db, db_path):
+    db = history_db
+    db.add_task(1, "旧任务", "待启用")
+    db.close()
+    drop_status_events(db_path, "UPDATE tasks SET status_time = '不规范的时间'")
+
+    db = DBHelper(db_path)
+    try:
+        (status, event_time), = db.get_task_status_history(1)
+        assert status == "待启用"
+        assert event_time[:10] == db.conn.execute("SELECT date('now')").fetchone()[0]
+    finally:
+        db.close()
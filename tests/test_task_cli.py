@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+import task_cli
+
+
+@pytest.fixture
+def cli(db_path, capsys):
+    """执行命令行，返回 (退出码, 输出的JSON对象列表, 标准错误)"""
+    def run(*argv):
+        code = task_cli.main(["--db", db_path, *argv])
+        out, err = capsys.readouterr()
+        return code, [json.loads(line) for line in out.splitlines()], err
+    return run
+
+
+def test_board_commands(cli):
+    assert cli("board", "add", "研发") == (0, [{"id": 1, "name": "研发"}], "")
+    assert cli("board", "add", "研发")[0] == 1
+    assert cli("board", "rename", "1", "开发")[1] == [{"id": 1, "name": "开发"}]
+    assert cli("board", "list")[1] == [{"id": 1, "name": "开发"}]
+    assert cli("board", "delete", "1")[1] == [{"id": 1, "deleted": True}]
+    assert cli("board", "list")[1] == []
+
+
+@pytest.mark.parametrize("argv", [("board", "rename", "9", "新名称"), ("board", "delete", "9")])
+def test_missing_board_is_an_error(cli, argv):
+    code, out, err = cli(*argv)
+    assert (code, out) == (1, [])
+    assert "板块不存在：9" in err
+
+
+def test_task_add_update_and_list(cli):
+    cli("board", "add", "研发")
+    code, [task], _ = cli("task", "add", "--board", "研发", "--name", "接口文档", "--status", "待启用",
+                          "--year", "2024", "--month", "3")
+    assert code == 0
+    assert (task["name"], task["board_name"], task["year"], task["month"]) == ("接口文档", "研发", 2024, 3)
+
+    code, [updated], _ = cli("task", "update", str(task["id"]), "--status", "已完成", "--property-id", "1")
+    assert (code, updated["status"], updated["property_id"]) == (0, "已完成", 1)
+    assert cli("task", "list", "--status", "已完成", "--count")[1] == [{"count": 1}]
+    assert [event["status"] for event in cli("task", "history", str(task["id"]))[1]] == ["待启用", "已完成"]
+    assert cli("task", "delete", str(task["id"]))[1] == [{"deleted": 1}]
+    assert cli("task", "get", str(task["id"]))[0] == 1
+
+
+def test_task_add_with_unknown_board_id(cli):
+    code, out, err = cli("task", "add", "--board-id", "42", "--name", "孤儿任务", "--status", "待启用")
+    assert (code, out) == (1, [])
+    assert err.startswith("错误：数据库错误")
+
+
+def test_task_update_with_unknown_property_rolls_back(cli):
+    cli("board", "add", "研发")
+    _, [task], _ = cli("task", "add", "--board", "研发", "--name", "任务", "--status", "待启用")
+    code, out, err = cli("task", "update", str(task["id"]), "--status", "已完成", "--property-id", "99")
+    assert (code, out) == (1, [])
+    assert err.startswith("错误：数据库错误")
+    # 同一命令中的修改在一个事务中，状态修改一并回滚
+    assert cli("task", "get", str(task["id"]))[1][0]["status"] == "待启用"
+
+
+def test_stats_rejects_unknown_dimension(cli):
+    code, _, err = cli("task", "stats", "--by", "colour")
+    assert code == 1 and "colour" in err
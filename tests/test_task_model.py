@@ -0,0 +1,174 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import Qt, QPoint  # noqa: E402
+from db_helper import TaskQuery  # noqa: E402
+from task_model import (TaskTableModel, TaskButtonDelegate, BUTTON_COLUMNS, OPERATIONS,  # noqa: E402
+                        COL_NAME, COL_OPERATION, COL_STATUS)
+
+
+def add_tasks(db, count: int) -> int:
+    """新建一个板块和 count 个状态时间各不相同的任务，返回板块ID"""
+    db.add_board("测试板块")
+    board_id = db.get_board_id_by_name("测试板块")
+    db.add_tasks({"board_id": board_id, "name": f"任务{i:04d}", "status": "待启用", "year": 2024, "month": 1,
+                  "status_time": f"2024-01-01 {i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}"}
+                 for i in range(count))
+    return board_id
+
+
+def page_source(db, query: TaskQuery):
+    """同步的分页数据源，记录每次请求的定位行"""
+    anchors = []
+
+    def fetch_page(after, deliver) -> None:
+        anchors.append(after)
+        deliver(db.find_tasks(query, after, TaskTableModel.FETCH_BATCH))
+    return fetch_page, anchors
+
+
+def loaded_ids(model: TaskTableModel):
+    return [model.task_at(row).id for row in range(model.rowCount())]
+
+
+def test_paging_anchor_survives_update_of_last_row(qapp, db):
+    add_tasks(db, TaskTableModel.FETCH_BATCH * 2 + 50)
+    model = TaskTableModel()
+    fetch_page, anchors = page_source(db, TaskQuery())
+    model.set_page_source(fetch_page)
+    assert model.rowCount() == TaskTableModel.FETCH_BATCH
+
+    # 修改第一页最后一行的状态：状态时间变为当前时间，排序键移到最前
+    last = model.task_at(model.rowCount() - 1)
+    assert model.update_task(db.update_task_status(last.id, "已完成"))
+    model.fetchMore()
+
+    assert anchors[1].id == last.id
+    assert anchors[1].status_time == last.status_time  # 仍按原来的排序键定位
+    while model.canFetchMore():
+        model.fetchMore()
+    ids = loaded_ids(model)
+    assert len(ids) == len(set(ids)) == db.count_tasks(TaskQuery())
+
+
+def test_set_tasks_loads_rows_in_batches(qapp, db):
+    add_tasks(db, TaskTableModel.FETCH_BATCH * 2 + 50)
+    model = TaskTableModel()
+    model.set_tasks(db.find_tasks(TaskQuery()))
+    batch = TaskTableModel.FETCH_BATCH
+    assert (model.rowCount(), model.total_count()) == (batch, batch * 2 + 50)
+    assert model.task_at(batch) is None  # 尚未交给视图的行
+    model.fetchMore()
+    assert model.rowCount() == batch * 2
+    model.fetchMore()
+    assert model.rowCount() == batch * 2 + 50
+    assert not model.canFetchMore()
+    assert model.data(model.index(0, COL_NAME)) == model.task_at(0).name
+
+    model.set_tasks([])
+    assert (model.rowCount(), model.total_count(), model.canFetchMore()) == (0, 0, False)
+
+
+def test_page_source_requests_one_page_at_a_time(qapp, db):
+    add_tasks(db, TaskTableModel.FETCH_BATCH + 10)
+    pending = []
+    model = TaskTableModel()
+    model.set_page_source(lambda after, deliver: pending.append((after, deliver)))
+    assert len(pending) == 1 and pending[0][0] is None
+    assert not model.canFetchMore()  # 第一页尚未返回
+    model.fetchMore()
+    assert len(pending) == 1
+
+    _, deliver = pending.pop()
+    deliver(db.find_tasks(TaskQuery(), limit=TaskTableModel.FETCH_BATCH))
+    assert model.rowCount() == TaskTableModel.FETCH_BATCH and model.canFetchMore()
+    model.fetchMore()
+    after, deliver = pending.pop()
+    assert after.id == model.task_at(model.rowCount() - 1).id
+
+    # 结果被替换后，过期的页直接丢弃
+    model.set_tasks([])
+    deliver(db.find_tasks(TaskQuery(), after, TaskTableModel.FETCH_BATCH))
+    assert model.rowCount() == 0
+
+
+def test_operation_state_is_per_task(qapp, db):
+    add_tasks(db, 3)
+    model = TaskTableModel()
+    model.set_tasks(db.find_tasks(TaskQuery()))
+    first, second = model.task_at(0).id, model.task_at(1).id
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right: changed.append(
+        (top_left.row(), top_left.column(), bottom_right.row(), bottom_right.column())))
+
+    model.set_operation(second, "delete")
+    assert changed == [(1, COL_OPERATION, 1, COL_OPERATION)]  # 只刷新该单元格
+    assert model.operation(first) == "update_status"
+    assert model.data(model.index(1, COL_OPERATION)) == OPERATIONS["delete"][0]
+
+    # 原地更新的行保留操作功能；替换结果后恢复默认
+    assert model.update_task(db.update_task_status(second, "已完成"))
+    assert model.data(model.index(1, COL_STATUS)) == "已完成"
+    assert model.operation(second) == "delete"
+    model.set_tasks(db.find_tasks(TaskQuery()))
+    assert model.operation(second) == "update_status"
+
+
+def test_delegate_emits_clicks_on_button_columns_only(qapp, db):
+    from PyQt5.QtTest import QTest
+    from PyQt5.QtWidgets import QTableView
+
+    add_tasks(db, 3)
+    model = TaskTableModel()
+    model.set_tasks(db.find_tasks(TaskQuery()))
+    view = QTableView()
+    view.setModel(model)
+    delegate = TaskButtonDelegate(view)
+    for column in BUTTON_COLUMNS:
+        view.setItemDelegateForColumn(column, delegate)
+    view.verticalHeader().setDefaultSectionSize(60)
+    view.resize(2000, 400)
+    view.show()
+    qapp.processEvents()
+    clicks = []
+    delegate.clicked.connect(lambda row, column: clicks.append((row, column)))
+
+    def click(row: int, column: int, margin_only: bool = False) -> None:
+        rect = view.visualRect(model.index(row, column))
+        # 按钮四周留有边距，点在边距内不算点击按钮
+        pos = QPoint(rect.left() + 1, rect.top() + 1) if margin_only else rect.center()
+        QTest.mouseClick(view.viewport(), Qt.LeftButton, Qt.NoModifier, pos)
+
+    for column in BUTTON_COLUMNS:
+        click(1, column)
+    click(2, COL_NAME)
+    click(0, COL_OPERATION, margin_only=True)
+    view.close()
+    assert clicks == [(1, column) for column in BUTTON_COLUMNS]
+
+
+def test_update_task_patches_only_its_row(qapp, db):
+    add_tasks(db, TaskTableModel.FETCH_BATCH + 10)
+    model = TaskTableModel()
+    model.set_tasks(db.find_tasks(TaskQuery()))
+    model.set_operation(model.task_at(3).id, "rename")
+    before = loaded_ids(model)
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, *_: changed.append((top.row(), bottom.row())))
+    model.modelReset.connect(lambda: changed.append("reset"))
+
+    task = model.task_at(3)
+    assert model.update_task(db.update_task_name(task.id, "改名后的任务"))
+    assert changed == [(3, 3)]
+    assert loaded_ids(model) == before  # 行位置不因排序键变化而移动
+    assert model.index(3, COL_NAME).data() == "改名后的任务"
+    assert model.operation(task.id) == "rename"
+
+    # 尚未加载的行只替换数据，不发出信号；不在结果中或已删除的任务返回 False
+    unloaded = model.total_count() - 1
+    assert model.update_task(db.update_task_status(db.find_tasks(TaskQuery())[unloaded].id, "已完成"))
+    assert changed == [(3, 3)]
+    other = db.add_task(db.get_board_id_by_name("测试板块"), "新任务", "待启用")
+    assert not model.update_task(db.get_task(other))
+    assert not model.update_task(None)
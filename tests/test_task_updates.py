@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture
+def task(db):
+    db.add_board("研发")
+    db.add_custom_property("客户项目")
+    return db.get_task(db.add_task(1, "任务", "待启用", task_dir="D:/work"))
+
+
+@pytest.mark.parametrize("update, field, value", [
+    (lambda db, task_id: db.update_task_status(task_id, "初开启"), "status", "初开启"),
+    (lambda db, task_id: db.update_task_name(task_id, "改名"), "name", "改名"),
+    (lambda db, task_id: db.update_task_dir(task_id, "E:/新目录"), "task_dir", "E:/新目录"),
+    (lambda db, task_id: db.update_task_link_url(task_id, "https://example.com"), "link_url", "https://example.com"),
+    (lambda db, task_id: db.update_task_link_mode(task_id, 1), "link_mode", 1),
+    (lambda db, task_id: db.update_task_property(task_id, 4), "property_name", "客户项目"),
+])
+def test_single_task_updates_return_the_updated_record(db, task, update, field, value):
+    updated = update(db, task.id)
+    assert getattr(updated, field) == value
+    assert updated == db.get_task(task.id)
+    unchanged = [name for name in type(task)._fields if name not in (field, "property_id", "status_time")]
+    assert [getattr(updated, name) for name in unchanged] == [getattr(task, name) for name in unchanged]
+
+
+def test_updates_of_missing_task_return_none(db, task):
+    db.delete_task(task.id)
+    assert db.update_task_status(task.id, "已完成") is None
+    assert db.update_task_name(task.id, "改名") is None